@@ -0,0 +1,127 @@
+"""
+Задержка отчётов по снимку в памяти (src/services/columnar.py).
+
+БД не нужна: вместо репозиториев — синтетические сущности в памяти.
+Отчёты замеряются с NumPy (если установлен) и без него.
+
+    python -m bench.columnar_bench --tasks 200000
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterator
+import argparse
+import time
+
+from src.core.entities import Client, Employee, Project, ProjectMember, Task
+from src.db.repositories.base import ChangeSet
+from src.services import columnar
+from src.services.columnar import ColumnarSnapshot
+
+
+_STATUSES = ("New", "InProgress", "Done", "Canceled")
+
+
+class _Repo:
+    """Вместо репозиториев MySQL: ColumnarSnapshot зовёт только эти методы."""
+
+    NOW = datetime(2025, 1, 1, 12, 0)
+
+    def __init__(self, rows: list, members: list[ProjectMember] | None = None):
+        self._rows = rows
+        self._members = members or []
+
+    def server_now(self) -> datetime:
+        return self.NOW
+
+    def list_all(self) -> list:
+        return self._rows
+
+    def iter_all(self) -> Iterator:
+        return iter(self._rows)
+
+    def list_changed_since(self, since: datetime) -> ChangeSet:
+        return ChangeSet([], [], self.NOW)
+
+    def list_all_members(self) -> list[ProjectMember]:
+        return self._members
+
+
+def _snapshot(tasks: int, projects: int, employees: int, clients: int) -> ColumnarSnapshot:
+    start = date(2024, 1, 1)
+    return ColumnarSnapshot(
+        tasks=_Repo(
+            [
+                Task(
+                    i, i % projects + 1, i % (employees + 1) or None, f"Задача {i}", None, None,
+                    start + timedelta(days=i % 730), None, _STATUSES[i % 4],
+                )
+                for i in range(1, tasks + 1)
+            ]
+        ),
+        projects=_Repo(
+            [
+                Project(i, i % clients + 1, f"Проект {i}", None, start + timedelta(days=i % 300), None)
+                for i in range(1, projects + 1)
+            ]
+        ),
+        members=_Repo(
+            [],
+            [
+                ProjectMember(p, (p * 7 + k) % employees + 1, "Member", start)
+                for p in range(1, projects + 1)
+                for k in range(5)
+            ],
+        ),
+        employees=_Repo([Employee(i, f"Фамилия{i}", "Имя", None, "Инженер") for i in range(1, employees + 1)]),
+        clients=_Repo([Client(i, f"Клиент {i}") for i in range(1, clients + 1)]),
+    )
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--projects", type=int, default=2_000)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    snapshot = _snapshot(args.tasks, args.projects, args.employees, clients=100)
+    start = time.perf_counter()
+    snapshot.refresh()
+    print(f"загрузка снимка: {(time.perf_counter() - start) * 1000:.0f} мс, {snapshot.stats()}")
+
+    reports = [
+        ("projects_by_client", lambda: snapshot.projects_by_client(1)),
+        ("overdue_projects", snapshot.overdue_projects),
+        ("employees_by_project", lambda: snapshot.employees_by_project(1)),
+        ("employee_workload", lambda: snapshot.employee_workload(1)),
+        # 16 недель вокруг «сегодня» (_Repo.NOW)
+        ("workload_heatmap", lambda: snapshot.workload_heatmap(date(2024, 11, 18), date(2025, 3, 10))),
+    ]
+    numpy = columnar.np
+    variants = [("NumPy", numpy), ("без NumPy", None)] if numpy is not None else [("без NumPy", None)]
+    print(f"лучшее из {args.repeat}, мс:")
+    try:
+        for label, module in variants:
+            columnar.np = module
+            print(f"  {label}:")
+            for name, fn in reports:
+                print(f"    {name:22} {_best_ms(fn, args.repeat):8.3f}")
+    finally:
+        columnar.np = numpy
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
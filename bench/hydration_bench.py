@@ -0,0 +1,97 @@
+"""
+Микробенчмарк сборки сущностей: dict-строки + Task(**row) против строк-кортежей + Hydrator.
+
+БД не нужна: строки генерируются в памяти в том виде, в каком их отдаёт курсор.
+Для dict-варианта в замер входит и создание dict на строку: dictionary-курсор
+отдаёт fetchall() списком dict, которые живут одновременно с собранными сущностями.
+
+    python -m bench.hydration_bench --rows 100000
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any, Callable
+import argparse
+import gc
+import time
+import tracemalloc
+
+from src.core.entities import Employee, Task
+from src.db.hydration import Hydrator
+
+
+_TASK_COLUMNS = (
+    "id", "project_id", "employee_id", "title", "description", "created_at", "due_date", "completed_at", "status"
+)
+_EMPLOYEE_COLUMNS = ("id", "last_name", "first_name", "middle_name", "position", "phone", "email", "is_active")
+
+
+def _task_rows(n: int) -> list[tuple]:
+    created = datetime(2024, 1, 1, 9, 0)
+    return [
+        (i, i % 500 + 1, i % 50 or None, f"Задача {i}", None, created, date(2024, 1, 1) + timedelta(days=i % 365),
+         None, "New")
+        for i in range(1, n + 1)
+    ]
+
+
+def _employee_rows(n: int) -> list[tuple]:
+    return [(i, "Иванов", "Иван", None, "Инженер", None, None, i % 3) for i in range(1, n + 1)]
+
+
+def _dict_tasks(rows: list[tuple]) -> list[Task]:
+    fetched = [dict(zip(_TASK_COLUMNS, r)) for r in rows]
+    return [Task(**row) for row in fetched]
+
+
+def _dict_employees(rows: list[tuple]) -> list[Employee]:
+    fetched = [dict(zip(_EMPLOYEE_COLUMNS, r)) for r in rows]
+    result = []
+    for row in fetched:
+        row["is_active"] = bool(row["is_active"])
+        result.append(Employee(**row))
+    return result
+
+
+def _measure(fn: Callable[[list[tuple]], list[Any]], rows: list[tuple], repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = Hydrator(Task)
+    employees = Hydrator(Employee, converters={"is_active": bool})
+    cases = [
+        ("Task", _task_rows(args.rows), _dict_tasks, tasks.all),
+        ("Employee (is_active -> bool)", _employee_rows(args.rows), _dict_employees, employees.all),
+    ]
+
+    print(f"строк: {args.rows}, лучшее из {args.repeat}")
+    for name, rows, via_dict, via_tuple in cases:
+        t_dict, m_dict = _measure(via_dict, rows, args.repeat)
+        t_tuple, m_tuple = _measure(via_tuple, rows, args.repeat)
+        print(f"{name}:")
+        print(f"  dict + **row : {t_dict:8.1f} мс, пик памяти {m_dict / 2**20:6.1f} МиБ")
+        print(f"  Hydrator     : {t_tuple:8.1f} мс, пик памяти {m_tuple / 2**20:6.1f} МиБ  ({t_dict / t_tuple:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,125 @@
+"""
+Задержка запросов репозиториев на локальной БД SQLite ([database] backend = sqlite).
+
+Сервер MySQL не нужен: БД создаётся во временном каталоге (или в файле --path)
+и заполняется синтетическими данными через create/create_many репозиториев.
+
+    python -m bench.sqlite_bench --tasks 100000 --repeat 500
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from src.config import SqliteConfig
+from src.core.entities import Client, Employee, Project, Task
+from src.db.repositories.base import TaskFilter
+from src.db.repositories.sqlite.client_repo import ClientRepositorySqlite
+from src.db.repositories.sqlite.employee_repo import EmployeeRepositorySqlite
+from src.db.repositories.sqlite.project_repo import ProjectRepositorySqlite
+from src.db.repositories.sqlite.report_repo import ReportRepositorySqlite
+from src.db.repositories.sqlite.search_repo import SearchRepositorySqlite
+from src.db.repositories.sqlite.task_repo import TaskRepositorySqlite
+from src.db.sqlite_connection import SqliteConnection
+from src.services.search_service import build_query
+
+
+_STATUSES = ("New", "InProgress", "Done", "Canceled")
+_WORDS = ("отчёт", "договор", "макет", "интеграция", "тестирование", "релиз", "согласование", "миграция")
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> tuple[float, float]:
+    fn()  # прогрев: страницы БД в кэше, выражение подготовлено
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def _fill(db: SqliteConnection, tasks: int) -> None:
+    rnd = random.Random(1)
+    today = date.today()
+    clients, employees, projects = ClientRepositorySqlite(db), EmployeeRepositorySqlite(db), ProjectRepositorySqlite(db)
+    n_clients, n_employees, n_projects = max(tasks // 500, 1), max(tasks // 200, 1), max(tasks // 100, 1)
+    for i in range(n_clients):
+        clients.create(Client(name=f"Клиент {i}", note=f"{rnd.choice(_WORDS)} {i}"))
+    employees.create_many(
+        [Employee(last_name=f"Фамилия{i}", first_name="Имя", position="Инженер") for i in range(n_employees)]
+    )
+    projects.create_many(
+        [
+            Project(client_id=rnd.randint(1, n_clients), name=f"Проект {rnd.choice(_WORDS)} {i}", start_date=today)
+            for i in range(n_projects)
+        ]
+    )
+    TaskRepositorySqlite(db).create_many(
+        [
+            Task(
+                project_id=rnd.randint(1, n_projects),
+                employee_id=rnd.randint(1, n_employees) if rnd.random() < 0.9 else None,
+                title=f"{rnd.choice(_WORDS)} {rnd.choice(_WORDS)} {i}",
+                due_date=today + timedelta(days=rnd.randint(-90, 180)),
+                status=rnd.choice(_STATUSES),
+            )
+            for i in range(tasks)
+        ]
+    )
+
+
+def _cases(db: SqliteConnection) -> dict[str, Callable[[], object]]:
+    tasks = TaskRepositorySqlite(db)
+    clients = ClientRepositorySqlite(db)
+    reports = ReportRepositorySqlite(db)
+    search = SearchRepositorySqlite(db)
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    by_employee = TaskFilter(employee_id=1, statuses=("New", "InProgress"))
+    query = build_query("интеграции")
+
+    return {
+        "tasks.get_by_id": lambda: tasks.get_by_id(1),
+        "clients.get_by_id": lambda: clients.get_by_id(1),
+        "tasks.list_page(100)": lambda: tasks.list_page(limit=100),
+        "tasks.list_page_with_names(100)": lambda: tasks.list_page_with_names(limit=100),
+        "tasks.query(employee, open)": lambda: tasks.query(by_employee, limit=100),
+        "reports.projects_by_client": lambda: reports.projects_by_client(1),
+        "reports.employee_workload": lambda: reports.employee_workload(1),
+        "reports.overdue_projects": reports.overdue_projects,
+        "reports.workload_heatmap(8w)": lambda: reports.workload_heatmap(monday, monday + timedelta(weeks=8)),
+        "search(50)": lambda: search.search(query, limit=50),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--path", type=Path, help="файл БД (по умолчанию — временный, удаляется после замера)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path or Path(tmp) / "bench.db"
+        with SqliteConnection(SqliteConfig(path=str(path))) as db:
+            if TaskRepositorySqlite(db).list_page(limit=1).items == []:
+                start = time.perf_counter()
+                _fill(db, args.tasks)
+                print(f"Заполнение {args.tasks} задач: {time.perf_counter() - start:.1f} с")
+            print(f"{'запрос':34} {'p50, мкс':>10} {'p95, мкс':>10}")
+            for name, fn in _cases(db).items():
+                p50, p95 = _measure(fn, args.repeat)
+                print(f"{name:34} {p50:>10.0f} {p95:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""
+Сравнение задержки запросов репозиториев без подготовленных выражений и с ними.
+
+Запуск (нужны config.ini и заполненная БД, например после sql/seed.sql):
+
+    python -m bench.statements_bench --repeat 500
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Callable
+import argparse
+import statistics
+import time
+
+from src.config import load_mysql_config
+from src.db.connection import DbConnection
+from src.db.repositories.mysql.client_repo import ClientRepositoryMySql
+from src.db.repositories.mysql.report_repo import ReportRepositoryMySql
+from src.db.repositories.mysql.task_repo import TaskRepositoryMySql
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> tuple[float, float]:
+    fn()  # прогрев: подключение, подготовка выражения
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def _cases(db: DbConnection) -> dict[str, Callable[[], object]]:
+    tasks = TaskRepositoryMySql(db)
+    clients = ClientRepositoryMySql(db)
+    reports = ReportRepositoryMySql(db)
+
+    first_task = tasks.list_page(limit=1).items
+    first_client = clients.list_page(limit=1).items
+    if not first_task or not first_client:
+        raise SystemExit("В БД нет задач или клиентов — выполните sql/seed.sql.")
+    task_id = first_task[0].id
+    client_id = first_client[0].id
+
+    return {
+        "tasks.get_by_id": lambda: tasks.get_by_id(task_id),
+        "clients.get_by_id": lambda: clients.get_by_id(client_id),
+        "clients.list_all": clients.list_all,
+        "tasks.list_page_with_names(100)": lambda: tasks.list_page_with_names(limit=100),
+        "reports.projects_by_client": lambda: reports.projects_by_client(client_id),
+        "reports.overdue_projects": reports.overdue_projects,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    cfg = load_mysql_config(args.config)
+    results: dict[str, dict[str, tuple[float, float]]] = {}
+    for label, size in (("plain", 0), ("prepared", max(cfg.statement_cache_size, 64))):
+        with DbConnection(replace(cfg, statement_cache_size=size)) as db:
+            for name, fn in _cases(db).items():
+                results.setdefault(name, {})[label] = _measure(fn, args.repeat)
+
+    print(f"{'запрос':34} {'plain p50/p95, мкс':>22} {'prepared p50/p95, мкс':>24} {'p50':>7}")
+    for name, r in results.items():
+        (p50a, p95a), (p50b, p95b) = r["plain"], r["prepared"]
+        print(f"{name:34} {p50a:>10.0f} / {p95a:<9.0f} {p50b:>12.0f} / {p95b:<9.0f} {p50b / p50a:>6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+"""
+Стоимость фиксации при записи нескольких строк: каждая строка своим COMMIT (autocommit),
+все строки в одном transaction() и одним пакетом executemany (create_many).
+
+По умолчанию — временная БД SQLite (сервер не нужен). С --mysql — БД из config.ini:
+строки пишутся в employees с должностью «bench-tx» и удаляются после замера.
+
+    python -m bench.transaction_bench --rows 100 --repeat 20
+    python -m bench.transaction_bench --mysql --rows 100 --repeat 20
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable
+import argparse
+import statistics
+import tempfile
+import time
+
+from src.config import SqliteConfig, load_mysql_config
+from src.core.entities import Employee
+from src.db.connection import DbConnection
+from src.db.repositories.mysql.employee_repo import EmployeeRepositoryMySql
+from src.db.repositories.sqlite.employee_repo import EmployeeRepositorySqlite
+from src.db.sqlite_connection import SqliteConnection
+
+
+_POSITION = "bench-tx"
+
+
+def _rows(n: int) -> list[Employee]:
+    return [Employee(last_name=f"Фамилия{i}", first_name="Имя", position=_POSITION) for i in range(n)]
+
+
+def _cases(repo: EmployeeRepositoryMySql, n: int) -> dict[str, Callable[[], object]]:
+    def autocommit() -> None:
+        for e in _rows(n):
+            repo.create(e)
+
+    def one_transaction() -> None:
+        with repo.transaction():
+            for e in _rows(n):
+                repo.create(e)
+
+    return {
+        "autocommit: create × N": autocommit,
+        "transaction(): create × N": one_transaction,
+        "create_many (executemany)": lambda: repo.create_many(_rows(n)),
+    }
+
+
+def _measure(fn: Callable[[], object], repeat: int, cleanup: Callable[[], None]) -> float:
+    fn()  # прогрев
+    cleanup()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        cleanup()
+    return statistics.median(samples)
+
+
+def _run(db: Any, repo: EmployeeRepositoryMySql, rows: int, repeat: int) -> None:
+    def cleanup() -> None:
+        with db.checkout() as conn:
+            cur = conn.cursor()
+            cur.execute(f"DELETE FROM employees WHERE position='{_POSITION}'")
+            cur.close()
+
+    results = {name: _measure(fn, repeat, cleanup) for name, fn in _cases(repo, rows).items()}
+    base = results["autocommit: create × N"]
+    print(f"{'запись ' + str(rows) + ' строк':30} {'p50, мс':>9} {'на строку, мкс':>15} {'быстрее':>8}")
+    for name, ms in results.items():
+        print(f"{name:30} {ms:>9.2f} {ms * 1000 / rows:>15.0f} {base / ms:>7.1f}×")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mysql", action="store_true", help="замер на сервере MySQL из config.ini")
+    parser.add_argument("--config", default="config.ini")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.mysql:
+        with DbConnection(load_mysql_config(args.config)) as db:
+            _run(db, EmployeeRepositoryMySql(db), args.rows, args.repeat)
+        return 0
+    with tempfile.TemporaryDirectory() as tmp:
+        with SqliteConnection(SqliteConfig(path=str(Path(tmp) / "bench.db"))) as db:
+            _run(db, EmployeeRepositorySqlite(db), args.rows, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+-- Отслеживание изменений для инкрементального обновления таблиц (дельты вместо полной перезагрузки).
+-- Выполняется один раз поверх sql/schema.sql.
+-- Столбцы и индексы добавляются без блокировки записи (ALGORITHM=INPLACE, LOCK=NONE):
+-- если сервер так не может, ALTER завершится ошибкой, а не заблокирует таблицу.
+
+USE project_manager;
+
+ALTER TABLE clients
+  ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_clients_updated (updated_at),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE employees
+  ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_employees_updated (updated_at),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE projects
+  ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_projects_updated (updated_at),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE tasks
+  ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_tasks_updated (updated_at),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- ===== Tombstones: id удалённых строк =====
+CREATE TABLE IF NOT EXISTS deleted_rows (
+  id BIGINT AUTO_INCREMENT PRIMARY KEY,
+  table_name VARCHAR(64) NOT NULL,
+  row_id INT NOT NULL,
+  deleted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_deleted_rows_table_time (table_name, deleted_at)
+);
+
+CREATE TRIGGER trg_clients_deleted AFTER DELETE ON clients
+  FOR EACH ROW INSERT INTO deleted_rows (table_name, row_id) VALUES ('clients', OLD.id);
+
+CREATE TRIGGER trg_employees_deleted AFTER DELETE ON employees
+  FOR EACH ROW INSERT INTO deleted_rows (table_name, row_id) VALUES ('employees', OLD.id);
+
+CREATE TRIGGER trg_projects_deleted AFTER DELETE ON projects
+  FOR EACH ROW INSERT INTO deleted_rows (table_name, row_id) VALUES ('projects', OLD.id);
+
+CREATE TRIGGER trg_tasks_deleted AFTER DELETE ON tasks
+  FOR EACH ROW INSERT INTO deleted_rows (table_name, row_id) VALUES ('tasks', OLD.id);
+
+-- Каскадные действия внешних ключей не вызывают триггеры дочерних таблиц,
+-- поэтому изменения задач при удалении проекта/сотрудника фиксируем на стороне родителя.
+CREATE TRIGGER trg_projects_deleted_tasks BEFORE DELETE ON projects
+  FOR EACH ROW INSERT INTO deleted_rows (table_name, row_id)
+    SELECT 'tasks', t.id FROM tasks t WHERE t.project_id = OLD.id;
+
+CREATE TRIGGER trg_employees_deleted_tasks BEFORE DELETE ON employees
+  FOR EACH ROW UPDATE tasks SET updated_at = CURRENT_TIMESTAMP WHERE employee_id = OLD.id;
@@ -0,0 +1,22 @@
+-- Сводка по просроченным задачам проектов для быстрого отчёта «Проекты с просроченными задачами».
+-- Строки пересчитываются по затронутым проектам при изменении задач (TaskService),
+-- целиком — раз в сутки, при первом чтении отчёта после смены даты.
+
+USE project_manager;
+
+CREATE TABLE IF NOT EXISTS project_overdue_summary (
+  project_id INT PRIMARY KEY,
+  overdue_tasks INT NOT NULL,
+  first_overdue_due_date DATE NOT NULL,
+  CONSTRAINT fk_overdue_summary_project
+    FOREIGN KEY (project_id) REFERENCES projects(id)
+    ON DELETE CASCADE
+    ON UPDATE CASCADE,
+  INDEX idx_overdue_summary_order (first_overdue_due_date, overdue_tasks)
+);
+
+-- Дата (CURRENT_DATE), на которую сводка пересчитана целиком
+CREATE TABLE IF NOT EXISTS summary_state (
+  name VARCHAR(64) PRIMARY KEY,
+  as_of DATE NOT NULL
+);
@@ -0,0 +1,12 @@
+-- Полнотекстовые индексы для поиска (SearchService): задачи, проекты, клиенты.
+-- Первый FULLTEXT-индекс таблицы InnoDB перестраивает её (добавляется FTS_DOC_ID) —
+-- на больших таблицах выполняйте вне рабочего времени.
+-- FULLTEXT строится без копирования таблицы (INPLACE), но запись на время построения
+-- заблокирована (LOCK=SHARED): MySQL не поддерживает для него LOCK=NONE.
+-- Слова короче innodb_ft_min_token_size (по умолчанию 3) не индексируются.
+
+USE project_manager;
+
+ALTER TABLE tasks ADD FULLTEXT INDEX ft_tasks_text (title, description), ALGORITHM=INPLACE, LOCK=SHARED;
+ALTER TABLE projects ADD FULLTEXT INDEX ft_projects_text (name, description), ALGORITHM=INPLACE, LOCK=SHARED;
+ALTER TABLE clients ADD FULLTEXT INDEX ft_clients_text (name, note), ALGORITHM=INPLACE, LOCK=SHARED;
@@ -0,0 +1,43 @@
+-- Составные индексы под запросы репозиториев (src/db/repositories/mysql/).
+-- Одностолбцовые индексы, которые стали левой частью составных, удаляются: внешние ключи
+-- опираются на новые индексы. Проверка планов: python -m src.index_advisor
+-- Индексы строятся без блокировки записи (ALGORITHM=INPLACE, LOCK=NONE): если сервер
+-- так не может, ALTER завершится ошибкой, а не заблокирует таблицу.
+
+USE project_manager;
+
+ALTER TABLE tasks
+  -- Список задач: ORDER BY due_date ASC, id DESC (и обратный порядок — «Срок ↓») без filesort
+  ADD INDEX idx_tasks_due_id (due_date, id DESC),
+  -- Отчёт и сводка просроченных: status IN ('New','InProgress') AND due_date < ... GROUP BY project_id
+  ADD INDEX idx_tasks_status_due (status, due_date, project_id),
+  -- Пересчёт сводки по проектам, фильтр по проекту, внешний ключ fk_tasks_project
+  ADD INDEX idx_tasks_project_status_due (project_id, status, due_date),
+  -- Загрузка сотрудника: employee_id=? AND status IN (...) ORDER BY due_date; внешний ключ fk_tasks_employee
+  ADD INDEX idx_tasks_employee_status_due (employee_id, status, due_date),
+  -- Сортировка списка задач по названию
+  ADD INDEX idx_tasks_title (title),
+  DROP INDEX idx_tasks_due,
+  DROP INDEX idx_tasks_status,
+  DROP INDEX idx_tasks_project,
+  DROP INDEX idx_tasks_employee,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE projects
+  -- Проекты клиента: client_id=? ORDER BY start_date DESC, id DESC; внешний ключ fk_projects_client
+  ADD INDEX idx_projects_client_start (client_id, start_date),
+  -- Список проектов: ORDER BY start_date DESC, id DESC
+  ADD INDEX idx_projects_start (start_date),
+  DROP INDEX idx_projects_client,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Список клиентов: ORDER BY name
+ALTER TABLE clients
+  ADD INDEX idx_clients_name (name),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Дельты: SELECT DISTINCT row_id ... WHERE table_name=? AND deleted_at>=? — только по индексу
+ALTER TABLE deleted_rows
+  ADD INDEX idx_deleted_rows_table_time_row (table_name, deleted_at, row_id),
+  DROP INDEX idx_deleted_rows_table_time,
+  ALGORITHM=INPLACE, LOCK=NONE;
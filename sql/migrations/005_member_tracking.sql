@@ -0,0 +1,15 @@
+-- Отслеживание изменений участников проектов: локальная копия (SyncService) загружает
+-- только добавленных и сменивших роль участников, а не всю таблицу при каждой синхронизации.
+-- Удаление участника записывается в deleted_rows с row_id = project_id: состав такого
+-- проекта сверяется целиком. Каскадные удаления (проекта, сотрудника) триггер не вызывают —
+-- их копия получает вместе с удалением родительской строки.
+
+USE project_manager;
+
+ALTER TABLE project_members
+  ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  ADD INDEX idx_project_members_updated (updated_at),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+CREATE TRIGGER trg_project_members_deleted AFTER DELETE ON project_members
+  FOR EACH ROW INSERT INTO deleted_rows (table_name, row_id) VALUES ('project_members', OLD.project_id);
@@ -0,0 +1,121 @@
+-- Локальная копия БД MySQL ([database] backend = replica в config.ini)
+-- Применяется после sql/sqlite/schema.sql при каждом подключении (все объекты — IF NOT EXISTS).
+--
+-- Изменения, сделанные в приложении, триггеры записывают в очередь sync_outbox; фоновая
+-- синхронизация (src/services/sync_service.py) отправляет их в MySQL и догружает чужие.
+-- Строки с сервера пишутся при sync_control.applying = 1 и в очередь не попадают.
+
+CREATE TABLE IF NOT EXISTS sync_control (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  applying INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO sync_control (id, applying) VALUES (1, 0);
+
+-- Очередь изменений для сервера; для project_members row_id — project_id, key2 — employee_id
+CREATE TABLE IF NOT EXISTS sync_outbox (
+  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+  table_name TEXT NOT NULL,
+  row_id INTEGER NOT NULL,
+  key2 INTEGER NULL,
+  op TEXT NOT NULL CHECK (op IN ('insert','update','delete')),
+  created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  last_error TEXT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sync_outbox_row ON sync_outbox (table_name, row_id);
+
+-- Версия строки на сервере (её updated_at), на которой основана локальная копия
+CREATE TABLE IF NOT EXISTS sync_versions (
+  table_name TEXT NOT NULL,
+  row_id INTEGER NOT NULL,
+  version DATETIME NOT NULL,
+  PRIMARY KEY (table_name, row_id)
+) WITHOUT ROWID;
+
+-- Время сервера последней загрузки изменений по таблице
+CREATE TABLE IF NOT EXISTS sync_state (
+  table_name TEXT PRIMARY KEY,
+  as_of DATETIME NOT NULL
+) WITHOUT ROWID;
+
+-- Локальные изменения, отклонённые из-за более новой версии строки на сервере
+CREATE TABLE IF NOT EXISTS sync_conflicts (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  table_name TEXT NOT NULL,
+  row_id INTEGER NOT NULL,
+  op TEXT NOT NULL,
+  reason TEXT NOT NULL,
+  local_values TEXT NULL,
+  created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Строки, созданные локально, получают id больше максимального INT MySQL: с id строк
+-- сервера они не пересекаются, а после отправки заменяются на id, выданный сервером.
+UPDATE sqlite_sequence SET seq = 2147483647
+  WHERE name IN ('clients','employees','projects','tasks') AND seq < 2147483647;
+INSERT INTO sqlite_sequence (name, seq)
+  SELECT n.name, 2147483647
+  FROM (SELECT 'clients' AS name UNION ALL SELECT 'employees' UNION ALL SELECT 'projects' UNION ALL SELECT 'tasks') n
+  WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence s WHERE s.name = n.name);
+
+-- ===== Очередь изменений =====
+-- UPDATE — только по столбцам данных: обновление updated_at триггером *_touch в очередь не попадает
+CREATE TRIGGER IF NOT EXISTS trg_clients_outbox_insert AFTER INSERT ON clients
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('clients', NEW.id, 'insert'); END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_outbox_update AFTER UPDATE OF name, phone, email, note ON clients
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('clients', NEW.id, 'update'); END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_outbox_delete AFTER DELETE ON clients
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('clients', OLD.id, 'delete'); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_employees_outbox_insert AFTER INSERT ON employees
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('employees', NEW.id, 'insert'); END;
+CREATE TRIGGER IF NOT EXISTS trg_employees_outbox_update AFTER UPDATE OF last_name, first_name, middle_name, position, phone, email, is_active ON employees
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('employees', NEW.id, 'update'); END;
+CREATE TRIGGER IF NOT EXISTS trg_employees_outbox_delete AFTER DELETE ON employees
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('employees', OLD.id, 'delete'); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_outbox_insert AFTER INSERT ON projects
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('projects', NEW.id, 'insert'); END;
+CREATE TRIGGER IF NOT EXISTS trg_projects_outbox_update AFTER UPDATE OF client_id, name, description, start_date, end_date, status ON projects
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('projects', NEW.id, 'update'); END;
+CREATE TRIGGER IF NOT EXISTS trg_projects_outbox_delete AFTER DELETE ON projects
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('projects', OLD.id, 'delete'); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_outbox_insert AFTER INSERT ON tasks
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('tasks', NEW.id, 'insert'); END;
+CREATE TRIGGER IF NOT EXISTS trg_tasks_outbox_update AFTER UPDATE OF project_id, employee_id, title, description, due_date, completed_at, status ON tasks
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('tasks', NEW.id, 'update'); END;
+CREATE TRIGGER IF NOT EXISTS trg_tasks_outbox_delete AFTER DELETE ON tasks
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('tasks', OLD.id, 'delete'); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_members_outbox_insert AFTER INSERT ON project_members
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN
+    INSERT INTO sync_outbox (table_name, row_id, key2, op)
+    VALUES ('project_members', NEW.project_id, NEW.employee_id, 'insert');
+  END;
+-- Смена роли уходит на сервер той же вставкой (INSERT ... ON DUPLICATE KEY UPDATE)
+CREATE TRIGGER IF NOT EXISTS trg_members_outbox_update AFTER UPDATE OF role ON project_members
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN
+    INSERT INTO sync_outbox (table_name, row_id, key2, op)
+    VALUES ('project_members', NEW.project_id, NEW.employee_id, 'update');
+  END;
+CREATE TRIGGER IF NOT EXISTS trg_members_outbox_delete AFTER DELETE ON project_members
+  FOR EACH ROW WHEN (SELECT applying FROM sync_control) = 0
+  BEGIN
+    INSERT INTO sync_outbox (table_name, row_id, key2, op)
+    VALUES ('project_members', OLD.project_id, OLD.employee_id, 'delete');
+  END;
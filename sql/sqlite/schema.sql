@@ -0,0 +1,182 @@
+-- Schema for ПК «Руководитель проектов»
+-- SQLite 3.35+ (локальная БД без сервера: [database] backend = sqlite в config.ini)
+--
+-- Та же схема, что sql/schema.sql с миграциями 001, 003, 004, в диалекте SQLite.
+-- Применяется при каждом подключении (все объекты — IF NOT EXISTS).
+-- Время хранится как текст 'YYYY-MM-DD HH:MM:SS' в местном часовом поясе, как DATETIME в MySQL;
+-- типы DATE/DATETIME в объявлениях столбцов преобразуются в date/datetime (src/db/sqlite_connection.py).
+-- Сводка просроченных задач (миграция 002) не нужна: отчёт по индексу считается на месте.
+
+-- ===== Clients =====
+CREATE TABLE IF NOT EXISTS clients (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL,
+  phone TEXT NULL,
+  email TEXT NULL,
+  note TEXT NULL,
+  created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_clients_name ON clients (name);
+CREATE INDEX IF NOT EXISTS idx_clients_updated ON clients (updated_at);
+
+-- ===== Employees =====
+CREATE TABLE IF NOT EXISTS employees (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  last_name TEXT NOT NULL,
+  first_name TEXT NOT NULL,
+  middle_name TEXT NULL,
+  position TEXT NOT NULL,
+  phone TEXT NULL,
+  email TEXT NULL,
+  is_active INTEGER NOT NULL DEFAULT 1 CHECK (is_active IN (0, 1)),
+  created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_employees_active ON employees (is_active);
+CREATE INDEX IF NOT EXISTS idx_employees_name ON employees (last_name, first_name);
+CREATE INDEX IF NOT EXISTS idx_employees_updated ON employees (updated_at);
+
+-- ===== Projects =====
+CREATE TABLE IF NOT EXISTS projects (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  client_id INTEGER NOT NULL
+    REFERENCES clients (id) ON DELETE RESTRICT ON UPDATE CASCADE,
+  name TEXT NOT NULL,
+  description TEXT NULL,
+  start_date DATE NOT NULL,
+  end_date DATE NULL,
+  status TEXT NOT NULL DEFAULT 'Active'
+    CHECK (status IN ('Planned','Active','Completed','OnHold','Canceled')),
+  created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_projects_client_start ON projects (client_id, start_date);
+CREATE INDEX IF NOT EXISTS idx_projects_start ON projects (start_date);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status);
+CREATE INDEX IF NOT EXISTS idx_projects_dates ON projects (start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_projects_updated ON projects (updated_at);
+
+-- ===== Project members (employees involved in a project) =====
+CREATE TABLE IF NOT EXISTS project_members (
+  project_id INTEGER NOT NULL
+    REFERENCES projects (id) ON DELETE CASCADE ON UPDATE CASCADE,
+  employee_id INTEGER NOT NULL
+    REFERENCES employees (id) ON DELETE CASCADE ON UPDATE CASCADE,
+  role TEXT NOT NULL DEFAULT 'Member',
+  since_date DATE NOT NULL,
+  PRIMARY KEY (project_id, employee_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_members_employee ON project_members (employee_id);
+
+-- ===== Tasks =====
+CREATE TABLE IF NOT EXISTS tasks (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  project_id INTEGER NOT NULL
+    REFERENCES projects (id) ON DELETE CASCADE ON UPDATE CASCADE,
+  employee_id INTEGER NULL
+    REFERENCES employees (id) ON DELETE SET NULL ON UPDATE CASCADE,
+  title TEXT NOT NULL,
+  description TEXT NULL,
+  created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime')),
+  due_date DATE NOT NULL,
+  completed_at DATETIME NULL,
+  status TEXT NOT NULL DEFAULT 'New'
+    CHECK (status IN ('New','InProgress','Done','Canceled')),
+  updated_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+-- Те же составные индексы, что в sql/migrations/004_composite_indexes.sql; в idx_tasks_status_due
+-- добавлен employee_id, чтобы индекс покрывал и отчёт о загрузке по неделям
+CREATE INDEX IF NOT EXISTS idx_tasks_due_id ON tasks (due_date, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date, project_id, employee_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_status_due ON tasks (project_id, status, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_employee_status_due ON tasks (employee_id, status, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks (title);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks (updated_at);
+
+-- ===== updated_at (в MySQL — ON UPDATE CURRENT_TIMESTAMP) =====
+-- Срабатывает только если запрос сам не менял updated_at; рекурсии нет (recursive_triggers выключен)
+CREATE TRIGGER IF NOT EXISTS trg_clients_touch AFTER UPDATE ON clients
+  FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+  BEGIN UPDATE clients SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_employees_touch AFTER UPDATE ON employees
+  FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+  BEGIN UPDATE employees SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_touch AFTER UPDATE ON projects
+  FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+  BEGIN UPDATE projects SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id; END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_touch AFTER UPDATE ON tasks
+  FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+  BEGIN UPDATE tasks SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id; END;
+
+-- ===== Tombstones: id удалённых строк =====
+CREATE TABLE IF NOT EXISTS deleted_rows (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  table_name TEXT NOT NULL,
+  row_id INTEGER NOT NULL,
+  deleted_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_deleted_rows_table_time_row ON deleted_rows (table_name, deleted_at, row_id);
+
+-- В SQLite каскадные действия внешних ключей вызывают триггеры дочерних таблиц, поэтому
+-- задачи удалённого проекта и задачи удалённого сотрудника (SET NULL) отмечаются сами.
+CREATE TRIGGER IF NOT EXISTS trg_clients_deleted AFTER DELETE ON clients
+  FOR EACH ROW BEGIN INSERT INTO deleted_rows (table_name, row_id) VALUES ('clients', OLD.id); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_employees_deleted AFTER DELETE ON employees
+  FOR EACH ROW BEGIN INSERT INTO deleted_rows (table_name, row_id) VALUES ('employees', OLD.id); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_deleted AFTER DELETE ON projects
+  FOR EACH ROW BEGIN INSERT INTO deleted_rows (table_name, row_id) VALUES ('projects', OLD.id); END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_deleted AFTER DELETE ON tasks
+  FOR EACH ROW BEGIN INSERT INTO deleted_rows (table_name, row_id) VALUES ('tasks', OLD.id); END;
+
+-- ===== Полнотекстовый поиск (в MySQL — FULLTEXT из миграции 003) =====
+-- Индексы FTS5 над столбцами таблиц (external content), синхронизируются триггерами;
+-- id в списке UPDATE OF — для замены локального id на серверный (sql/sqlite/replica.sql)
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+  title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+  name, description, content='projects', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+  name, note, content='clients', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_insert AFTER INSERT ON tasks BEGIN
+  INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_delete AFTER DELETE ON tasks BEGIN
+  INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', OLD.id, OLD.title, OLD.description);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_tasks_fts_update AFTER UPDATE OF id, title, description ON tasks BEGIN
+  INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', OLD.id, OLD.title, OLD.description);
+  INSERT INTO tasks_fts (rowid, title, description) VALUES (NEW.id, NEW.title, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_fts_insert AFTER INSERT ON projects BEGIN
+  INSERT INTO projects_fts (rowid, name, description) VALUES (NEW.id, NEW.name, NEW.description);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_projects_fts_delete AFTER DELETE ON projects BEGIN
+  INSERT INTO projects_fts (projects_fts, rowid, name, description) VALUES ('delete', OLD.id, OLD.name, OLD.description);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_projects_fts_update AFTER UPDATE OF id, name, description ON projects BEGIN
+  INSERT INTO projects_fts (projects_fts, rowid, name, description) VALUES ('delete', OLD.id, OLD.name, OLD.description);
+  INSERT INTO projects_fts (rowid, name, description) VALUES (NEW.id, NEW.name, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_clients_fts_insert AFTER INSERT ON clients BEGIN
+  INSERT INTO clients_fts (rowid, name, note) VALUES (NEW.id, NEW.name, NEW.note);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_fts_delete AFTER DELETE ON clients BEGIN
+  INSERT INTO clients_fts (clients_fts, rowid, name, note) VALUES ('delete', OLD.id, OLD.name, OLD.note);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_clients_fts_update AFTER UPDATE OF id, name, note ON clients BEGIN
+  INSERT INTO clients_fts (clients_fts, rowid, name, note) VALUES ('delete', OLD.id, OLD.name, OLD.note);
+  INSERT INTO clients_fts (rowid, name, note) VALUES (NEW.id, NEW.name, NEW.note);
+END;
@@ -1,21 +1,75 @@
 from __future__ import annotations
 
-from src.config import ConfigError, load_mysql_config
+from src.config import (
+    ConfigError,
+    load_cache_config,
+    load_database_config,
+    load_migrations_config,
+    load_monitoring_config,
+    load_mysql_config,
+    load_reports_config,
+    load_sqlite_config,
+)
+from src.core.entities import Client, Employee, Project, set_relation_resolver
 from src.core.errors import DatabaseError
 from src.db.connection import DbConnection
+from src.db.instrumentation import QueryMonitor
+from src.db.migrations import MigrationRunner
+from src.db.sqlite_connection import REPLICA_SCHEMA_FILE, SCHEMA_FILE, SqliteConnection
+from src.db.tracking import ChangeTracker
 from src.db.repositories.mysql.client_repo import ClientRepositoryMySql
 from src.db.repositories.mysql.employee_repo import EmployeeRepositoryMySql
 from src.db.repositories.mysql.project_member_repo import ProjectMemberRepositoryMySql
 from src.db.repositories.mysql.project_repo import ProjectRepositoryMySql
 from src.db.repositories.mysql.report_repo import ReportRepositoryMySql
+from src.db.repositories.mysql.search_repo import SearchRepositoryMySql
+from src.db.repositories.mysql.sync_repo import SyncRepositoryMySql
 from src.db.repositories.mysql.task_repo import TaskRepositoryMySql
+from src.db.repositories.sqlite.client_repo import ClientRepositorySqlite
+from src.db.repositories.sqlite.employee_repo import EmployeeRepositorySqlite
+from src.db.repositories.sqlite.project_member_repo import ProjectMemberRepositorySqlite
+from src.db.repositories.sqlite.project_repo import ProjectRepositorySqlite
+from src.db.repositories.sqlite.replica_repo import ReplicaRepositorySqlite
+from src.db.repositories.sqlite.report_repo import ReportRepositorySqlite
+from src.db.repositories.sqlite.search_repo import SearchRepositorySqlite
+from src.db.repositories.sqlite.task_repo import TaskRepositorySqlite
+from src.services.cache import LookupCache
 from src.services.client_service import ClientService
+from src.services.columnar import ColumnarSnapshot
 from src.services.employee_service import EmployeeService
+from src.services.identity_map import IdentityMap
 from src.services.project_service import ProjectService
 from src.services.report_service import ReportService
+from src.services.search_service import SearchService
+from src.services.sync_service import SyncService
 from src.services.task_service import TaskService
 
 
+# Классы репозиториев по [database] backend из config.ini
+_REPOSITORIES = {
+    "mysql": {
+        "clients": ClientRepositoryMySql,
+        "employees": EmployeeRepositoryMySql,
+        "projects": ProjectRepositoryMySql,
+        "members": ProjectMemberRepositoryMySql,
+        "tasks": TaskRepositoryMySql,
+        "reports": ReportRepositoryMySql,
+        "search": SearchRepositoryMySql,
+    },
+    "sqlite": {
+        "clients": ClientRepositorySqlite,
+        "employees": EmployeeRepositorySqlite,
+        "projects": ProjectRepositorySqlite,
+        "members": ProjectMemberRepositorySqlite,
+        "tasks": TaskRepositorySqlite,
+        "reports": ReportRepositorySqlite,
+        "search": SearchRepositorySqlite,
+    },
+}
+# Локальная копия читается и пишется теми же репозиториями SQLite
+_REPOSITORIES["replica"] = _REPOSITORIES["sqlite"]
+
+
 class AppContext:
     """
     Контейнер зависимостей (DI) для приложения.
@@ -24,39 +78,99 @@ class AppContext:
     """
 
     def __init__(self) -> None:
-        self.db: DbConnection | None = None
+        self.db: DbConnection | SqliteConnection | None = None
+        self.cache: LookupCache | None = None
+        self.identity: IdentityMap | None = None
+        self.tracker: ChangeTracker | None = None
+        self.snapshot: ColumnarSnapshot | None = None
+        self.sync: SyncService | None = None
+        self._remote: DbConnection | None = None
 
         self.clients: ClientService | None = None
         self.employees: EmployeeService | None = None
         self.projects: ProjectService | None = None
         self.tasks: TaskService | None = None
         self.reports: ReportService | None = None
+        self.search: SearchService | None = None
 
     def connect(self) -> None:
         try:
-            cfg = load_mysql_config("config.ini")
+            db_cfg = load_database_config("config.ini")
+            cache_cfg = load_cache_config("config.ini")
+            monitoring_cfg = load_monitoring_config("config.ini")
+            reports_cfg = load_reports_config("config.ini")
+            migrations_cfg = load_migrations_config("config.ini")
+            if db_cfg.backend in ("sqlite", "replica"):
+                sqlite_cfg = load_sqlite_config("config.ini")
+            if db_cfg.backend in ("mysql", "replica"):
+                mysql_cfg = load_mysql_config("config.ini")
         except ConfigError as e:
             raise DatabaseError(str(e)) from e
 
-        self.db = DbConnection(cfg)
-        self.db.connect()
+        monitor = QueryMonitor(monitoring_cfg.slow_query_ms, monitoring_cfg.slow_log or None)
+        if db_cfg.backend == "sqlite":
+            # Схема локальной БД создаётся при подключении, миграции MySQL к ней не относятся
+            self.db = SqliteConnection(sqlite_cfg, monitor)
+            self.db.connect()
+        elif db_cfg.backend == "replica":
+            # Приложение работает с локальной копией; сервер нужен только фоновой синхронизации,
+            # поэтому без связи с ним подключение не падает (соединение откроется при запросе)
+            self.db = SqliteConnection(sqlite_cfg, monitor, schema=(SCHEMA_FILE, REPLICA_SCHEMA_FILE))
+            self.db.connect()
+            self._remote = DbConnection(mysql_cfg, monitor)
+            self.sync = SyncService(
+                ReplicaRepositorySqlite(self.db), SyncRepositoryMySql(self._remote), db_cfg.sync_interval
+            )
+        else:
+            self.db = DbConnection(mysql_cfg, monitor)
+            self.db.connect()
+            if migrations_cfg.auto:
+                MigrationRunner(self.db).migrate()
 
         # repositories
-        client_repo = ClientRepositoryMySql(self.db)
-        employee_repo = EmployeeRepositoryMySql(self.db)
-        project_repo = ProjectRepositoryMySql(self.db)
-        member_repo = ProjectMemberRepositoryMySql(self.db)
-        task_repo = TaskRepositoryMySql(self.db)
-        report_repo = ReportRepositoryMySql(self.db)
-
-        # services
-        self.clients = ClientService(client_repo)
-        self.employees = EmployeeService(employee_repo)
-        self.projects = ProjectService(project_repo, member_repo)
-        self.tasks = TaskService(task_repo)
-        self.reports = ReportService(report_repo)
+        repos = {name: cls(self.db) for name, cls in _REPOSITORIES[db_cfg.backend].items()}
+        client_repo = repos["clients"]
+        employee_repo = repos["employees"]
+        project_repo = repos["projects"]
+        member_repo = repos["members"]
+        task_repo = repos["tasks"]
+        report_repo = repos["reports"]
+        search_repo = repos["search"]
+
+        if reports_cfg.columnar:
+            self.snapshot = ColumnarSnapshot(
+                task_repo, project_repo, member_repo, employee_repo, client_repo, max_age=reports_cfg.max_age
+            )
+
+        # Ленивые связи сущностей (Project.client, Task.project/employee) — через общую карту
+        self.identity = IdentityMap(ttl=cache_cfg.ttl)
+        self.identity.register(Client, client_repo.get_many)
+        self.identity.register(Employee, employee_repo.get_many)
+        self.identity.register(Project, project_repo.get_many)
+        set_relation_resolver(self.identity.get)
+
+        # services (справочники читаются через общий кэш; изменения пишутся по снимкам)
+        self.cache = LookupCache(ttl=cache_cfg.ttl)
+        self.tracker = ChangeTracker()
+        self.clients = ClientService(client_repo, self.cache, self.identity, self.tracker, self.snapshot)
+        self.employees = EmployeeService(employee_repo, self.cache, self.identity, self.tracker, self.snapshot)
+        self.projects = ProjectService(
+            project_repo, member_repo, self.cache, self.identity, self.tracker, self.snapshot
+        )
+        self.tasks = TaskService(task_repo, report_repo, self.snapshot, self.identity, self.tracker)
+        self.reports = ReportService(report_repo, self.snapshot)
+        self.search = SearchService(search_repo)
+        if self.sync is not None:
+            self.sync.start()
 
     def close(self) -> None:
+        set_relation_resolver(None)
+        if self.sync is not None:
+            self.sync.stop()
+            self.sync = None
+        if self._remote is not None:
+            self._remote.close()
+            self._remote = None
         if self.db is not None:
             self.db.close()
 
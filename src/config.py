@@ -12,6 +12,57 @@ class MySqlConfig:
     user: str
     password: str
     database: str
+    # Пул соединений: 0 — одно общее соединение (как раньше)
+    pool_size: int = 0
+    pool_max_age: int = 1800
+    pool_timeout: float = 10.0
+    # Подготовленных выражений на соединение (LRU); 0 — без prepared statements
+    statement_cache_size: int = 64
+
+
+@dataclass(frozen=True, slots=True)
+class DatabaseConfig:
+    # Хранилище данных: "mysql" — сервер MySQL, "sqlite" — локальный файл (без сервера),
+    # "replica" — локальная копия MySQL в файле [sqlite] с фоновой синхронизацией
+    backend: str = "mysql"
+    # Период синхронизации локальной копии с сервером (сек), только для backend = replica
+    sync_interval: float = 10.0
+
+
+@dataclass(frozen=True, slots=True)
+class SqliteConfig:
+    path: str = "project_manager.db"
+    # Размер отображения файла БД в память (байт); 0 — обычное чтение через read()
+    mmap_size: int = 256 * 1024 * 1024
+    # Ожидание блокировки записи другим соединением (сек)
+    busy_timeout: float = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class CacheConfig:
+    # Время жизни закэшированных справочников (сек); 0 — кэш выключен
+    ttl: float = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class MonitoringConfig:
+    # Запросы дольше порога (мс) пишутся в журнал медленных запросов; 0 — журнал выключен
+    slow_query_ms: float = 500.0
+    slow_log: str = "slow_queries.log"
+
+
+@dataclass(frozen=True, slots=True)
+class ReportsConfig:
+    # Отчёты и список задач из снимка в памяти (src/services/columnar.py) вместо запросов
+    columnar: bool = False
+    # Не реже чем раз в столько секунд снимок догружает изменения из БД
+    max_age: float = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class MigrationsConfig:
+    # Применять недостающие миграции схемы при подключении (AppContext.connect)
+    auto: bool = False
 
 
 class ConfigError(RuntimeError):
@@ -41,6 +92,134 @@ def load_mysql_config(config_path: str | Path = "config.ini") -> MySqlConfig:
     except KeyError as e:
         raise ConfigError(f"В config.ini отсутствует обязательный ключ: {e}") from e
 
-    return MySqlConfig(host=host, port=port, user=user, password=password, database=database)
+    try:
+        pool_size = sec.getint("pool_size", 0)
+        pool_max_age = sec.getint("pool_max_age", 1800)
+        pool_timeout = sec.getfloat("pool_timeout", 10.0)
+        statement_cache_size = sec.getint("statement_cache_size", 64)
+    except ValueError as e:
+        raise ConfigError(f"Некорректное значение параметра пула в config.ini: {e}") from e
+    if pool_size < 0 or pool_max_age <= 0 or pool_timeout <= 0:
+        raise ConfigError("Параметры пула (pool_size/pool_max_age/pool_timeout) должны быть положительными.")
+    if statement_cache_size < 0:
+        raise ConfigError("statement_cache_size не может быть отрицательным.")
+
+    return MySqlConfig(
+        host=host,
+        port=port,
+        user=user,
+        password=password,
+        database=database,
+        pool_size=pool_size,
+        pool_max_age=pool_max_age,
+        pool_timeout=pool_timeout,
+        statement_cache_size=statement_cache_size,
+    )
+
+
+BACKENDS = ("mysql", "sqlite", "replica")
 
 
+def load_database_config(config_path: str | Path = "config.ini") -> DatabaseConfig:
+    """Секция [database] необязательна: без неё используется MySQL."""
+    parser = configparser.ConfigParser()
+    parser.read(Path(config_path), encoding="utf-8")
+    if "database" not in parser:
+        return DatabaseConfig()
+    sec = parser["database"]
+    defaults = DatabaseConfig()
+    backend = sec.get("backend", defaults.backend).strip().lower()
+    if backend not in BACKENDS:
+        raise ConfigError(f"[database] backend: ожидается {', '.join(BACKENDS)}, указано «{backend}».")
+    try:
+        sync_interval = sec.getfloat("sync_interval", defaults.sync_interval)
+    except ValueError as e:
+        raise ConfigError(f"Некорректное значение [database] sync_interval в config.ini: {e}") from e
+    if sync_interval <= 0:
+        raise ConfigError("[database] sync_interval должен быть положительным.")
+    return DatabaseConfig(backend=backend, sync_interval=sync_interval)
+
+
+def load_sqlite_config(config_path: str | Path = "config.ini") -> SqliteConfig:
+    """Секция [sqlite] необязательна: без неё файл project_manager.db в текущем каталоге."""
+    parser = configparser.ConfigParser()
+    parser.read(Path(config_path), encoding="utf-8")
+    if "sqlite" not in parser:
+        return SqliteConfig()
+    sec = parser["sqlite"]
+    # Значения по умолчанию — с экземпляра: у dataclass(slots=True) атрибуты класса — дескрипторы слотов
+    defaults = SqliteConfig()
+    try:
+        mmap_size = sec.getint("mmap_size", defaults.mmap_size)
+        busy_timeout = sec.getfloat("busy_timeout", defaults.busy_timeout)
+    except ValueError as e:
+        raise ConfigError(f"Некорректное значение в секции [sqlite] config.ini: {e}") from e
+    if mmap_size < 0 or busy_timeout < 0:
+        raise ConfigError("[sqlite] mmap_size и busy_timeout не могут быть отрицательными.")
+    path = sec.get("path", defaults.path).strip()
+    if not path:
+        raise ConfigError("[sqlite] path не может быть пустым.")
+    return SqliteConfig(path=path, mmap_size=mmap_size, busy_timeout=busy_timeout)
+
+
+def load_cache_config(config_path: str | Path = "config.ini") -> CacheConfig:
+    """Секция [cache] необязательна: без неё используются значения по умолчанию."""
+    parser = configparser.ConfigParser()
+    parser.read(Path(config_path), encoding="utf-8")
+    if "cache" not in parser:
+        return CacheConfig()
+    try:
+        ttl = parser["cache"].getfloat("ttl", CacheConfig().ttl)
+    except ValueError as e:
+        raise ConfigError(f"Некорректное значение [cache] ttl в config.ini: {e}") from e
+    if ttl < 0:
+        raise ConfigError("[cache] ttl не может быть отрицательным.")
+    return CacheConfig(ttl=ttl)
+
+
+def load_monitoring_config(config_path: str | Path = "config.ini") -> MonitoringConfig:
+    """Секция [monitoring] необязательна: без неё используются значения по умолчанию."""
+    parser = configparser.ConfigParser()
+    parser.read(Path(config_path), encoding="utf-8")
+    if "monitoring" not in parser:
+        return MonitoringConfig()
+    sec = parser["monitoring"]
+    defaults = MonitoringConfig()
+    try:
+        slow_query_ms = sec.getfloat("slow_query_ms", defaults.slow_query_ms)
+    except ValueError as e:
+        raise ConfigError(f"Некорректное значение [monitoring] slow_query_ms в config.ini: {e}") from e
+    if slow_query_ms < 0:
+        raise ConfigError("[monitoring] slow_query_ms не может быть отрицательным.")
+    return MonitoringConfig(slow_query_ms=slow_query_ms, slow_log=sec.get("slow_log", defaults.slow_log).strip())
+
+
+def load_reports_config(config_path: str | Path = "config.ini") -> ReportsConfig:
+    """Секция [reports] необязательна: без неё используются значения по умолчанию."""
+    parser = configparser.ConfigParser()
+    parser.read(Path(config_path), encoding="utf-8")
+    if "reports" not in parser:
+        return ReportsConfig()
+    sec = parser["reports"]
+    defaults = ReportsConfig()
+    try:
+        columnar = sec.getboolean("columnar", defaults.columnar)
+        max_age = sec.getfloat("max_age", defaults.max_age)
+    except ValueError as e:
+        raise ConfigError(f"Некорректное значение в секции [reports] config.ini: {e}") from e
+    if max_age < 0:
+        raise ConfigError("[reports] max_age не может быть отрицательным.")
+    return ReportsConfig(columnar=columnar, max_age=max_age)
+
+
+def load_migrations_config(config_path: str | Path = "config.ini") -> MigrationsConfig:
+    """Секция [migrations] необязательна: без неё используются значения по умолчанию."""
+    parser = configparser.ConfigParser()
+    parser.read(Path(config_path), encoding="utf-8")
+    if "migrations" not in parser:
+        return MigrationsConfig()
+    try:
+        auto = parser["migrations"].getboolean("auto", MigrationsConfig().auto)
+    except ValueError as e:
+        raise ConfigError(f"Некорректное значение [migrations] auto в config.ini: {e}") from e
+    return MigrationsConfig(auto=auto)
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date, datetime
-from typing import Optional
-import copy
+from typing import Any, Callable, Optional
+
+
+# Разрешение ссылок по id (IdentityMap, см. src/services/identity_map.py).
+# Пока не задано, ленивые связи (Project.client, Task.project, ...) возвращают None.
+_resolve: Optional[Callable[[type, int], Any]] = None
+
+
+def set_relation_resolver(resolver: Optional[Callable[[type, int], Any]]) -> None:
+    global _resolve
+    _resolve = resolver
+
+
+def _related(cls: type, entity_id: Optional[int]) -> Any:
+    if entity_id is None or _resolve is None:
+        return None
+    return _resolve(cls, entity_id)
 
 
 @dataclass(slots=True)
@@ -14,8 +29,9 @@ class Client:
     email: Optional[str] = None
     note: Optional[str] = None
 
+    # Все поля неизменяемые (str/int/date) — поверхностной копии достаточно
     def clone(self) -> "Client":
-        return copy.deepcopy(self)
+        return replace(self)
 
 
 @dataclass(slots=True)
@@ -36,7 +52,7 @@ class Employee:
         return " ".join(p for p in parts if p)
 
     def clone(self) -> "Employee":
-        return copy.deepcopy(self)
+        return replace(self)
 
 
 @dataclass(slots=True)
@@ -49,8 +65,12 @@ class Project:
     end_date: date | None = None
     status: str = "Active"
 
+    @property
+    def client(self) -> Optional[Client]:
+        return _related(Client, self.client_id)
+
     def clone(self) -> "Project":
-        return copy.deepcopy(self)
+        return replace(self)
 
 
 @dataclass(slots=True)
@@ -65,11 +85,19 @@ class Task:
     completed_at: Optional[datetime] = None
     status: str = "New"
 
+    @property
+    def project(self) -> Optional[Project]:
+        return _related(Project, self.project_id)
+
+    @property
+    def employee(self) -> Optional[Employee]:
+        return _related(Employee, self.employee_id)
+
     def is_active(self) -> bool:
         return self.status in ("New", "InProgress")
 
     def clone(self) -> "Task":
-        return copy.deepcopy(self)
+        return replace(self)
 
 
 @dataclass(slots=True)
@@ -80,3 +108,8 @@ class ProjectMember:
     since_date: date | None = None
 
 
+# Ссылки сущностей: (атрибут с id, тип связанной сущности) — для пакетной загрузки связей
+RELATIONS: dict[type, tuple[tuple[str, type], ...]] = {
+    Project: (("client_id", Client),),
+    Task: (("project_id", Project), ("employee_id", Employee)),
+}
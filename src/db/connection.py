@@ -1,54 +1,305 @@
 from __future__ import annotations
 
-from typing import Any
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+import threading
+import time
+import weakref
 
 import mysql.connector
 
 from src.config import MySqlConfig
 from src.core.errors import DatabaseError
+from src.db.instrumentation import QueryMonitor
+from src.db.statements import StatementCache
+
+
+# Соединение, простоявшее в пуле дольше этого времени, проверяется ping'ом перед выдачей.
+_PING_IDLE_SECONDS = 30.0
+
+
+@dataclass(slots=True)
+class _PoolEntry:
+    conn: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ConnectionPool:
+    """
+    Ограниченный пул соединений MySQL.
+
+    Соединения выдаются на одну операцию (checkout), перед выдачей проверяются
+    и пересоздаются, если превышен максимальный возраст или соединение «умерло».
+    """
+
+    def __init__(self, cfg: MySqlConfig):
+        self._cfg = cfg
+        self._idle: list[_PoolEntry] = []
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        return self._cfg.pool_size
+
+    def _open(self) -> _PoolEntry:
+        return _PoolEntry(_open_connection(self._cfg))
+
+    def _is_healthy(self, entry: _PoolEntry) -> bool:
+        now = time.monotonic()
+        if now - entry.created_at > self._cfg.pool_max_age:
+            return False
+        if now - entry.last_used > _PING_IDLE_SECONDS:
+            try:
+                entry.conn.ping(reconnect=False)
+            except mysql.connector.Error:
+                return False
+        return True
+
+    def acquire(self) -> _PoolEntry:
+        deadline = time.monotonic() + self._cfg.pool_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise DatabaseError("Пул соединений закрыт.")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._created < self._cfg.pool_size:
+                    self._created += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DatabaseError("Нет свободных соединений в пуле (истекло время ожидания).")
+                self._cond.wait(remaining)
+
+        # Сетевые операции выполняем вне блокировки пула.
+        if entry is not None and self._is_healthy(entry):
+            return entry
+        if entry is not None:
+            _close_quietly(entry.conn)
+        try:
+            return self._open()
+        except DatabaseError:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, entry: _PoolEntry, *, broken: bool = False) -> None:
+        with self._cond:
+            if broken or self._closed:
+                self._created -= 1
+                _close_quietly(entry.conn)
+            else:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            _close_quietly(entry.conn)
+
+
+def _open_connection(cfg: MySqlConfig) -> Any:
+    try:
+        return mysql.connector.connect(
+            host=cfg.host,
+            port=cfg.port,
+            user=cfg.user,
+            password=cfg.password,
+            database=cfg.database,
+            autocommit=True,
+        )
+    except mysql.connector.Error as e:
+        raise DatabaseError(f"Ошибка подключения к MySQL: {e}") from e
+
+
+class _Transaction(threading.local):
+    # Соединение открытой в потоке транзакции и глубина вложенности (SAVEPOINT)
+    conn: Any = None
+    depth: int = 0
+
+
+def _tx_command(conn: Any, sql: str) -> None:
+    """START TRANSACTION / COMMIT / SAVEPOINT ... с ошибкой в виде DatabaseError."""
+    try:
+        cur = conn.cursor()
+        try:
+            cur.execute(sql)
+        finally:
+            cur.close()
+    except mysql.connector.Error as e:
+        raise DatabaseError(f"Ошибка транзакции ({sql}): {e}") from e
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except mysql.connector.Error:
+        # Игнорируем ошибки закрытия, это безопасно для UI.
+        pass
 
 
 class DbConnection:
     """
     Обёртка над соединением MySQL.
 
+    Два режима работы:
+    - одно общее соединение (pool_size = 0), доступ к нему сериализуется блокировкой;
+    - пул соединений (pool_size > 0), соединение выдаётся на одну операцию.
+
+    Без пула потоковые выгрузки (stream_checkout) идут через отдельное соединение,
+    открываемое при первой выгрузке: общее не занято на всё время выгрузки.
+
     Для демонстрации ООП: контекстный менеджер + явное закрытие ресурса.
     """
 
-    def __init__(self, cfg: MySqlConfig):
+    def __init__(self, cfg: MySqlConfig, monitor: QueryMonitor | None = None):
         self._cfg = cfg
+        # Статистика запросов, которую ведут репозитории (см. BaseMySqlRepository)
+        self.monitor = monitor or QueryMonitor()
         self._conn: mysql.connector.MySQLConnection | None = None
+        self._pool: ConnectionPool | None = None
+        self._lock = threading.RLock()
+        # Соединение потоковых выгрузок без пула (stream_checkout)
+        self._stream_conn: mysql.connector.MySQLConnection | None = None
+        self._stream_lock = threading.RLock()
+        # Кэш подготовленных выражений живёт столько же, сколько соединение
+        self._statements: weakref.WeakKeyDictionary[Any, StatementCache] = weakref.WeakKeyDictionary()
+        self._statements_lock = threading.Lock()
+        self._tx = _Transaction()
+
+    @property
+    def pooled(self) -> bool:
+        return self._cfg.pool_size > 0
 
     def connect(self) -> None:
-        if self._conn is not None and self._conn.is_connected():
-            return
-        try:
-            self._conn = mysql.connector.connect(
-                host=self._cfg.host,
-                port=self._cfg.port,
-                user=self._cfg.user,
-                password=self._cfg.password,
-                database=self._cfg.database,
-                autocommit=True,
-            )
-        except mysql.connector.Error as e:
-            raise DatabaseError(f"Ошибка подключения к MySQL: {e}") from e
+        with self._lock:
+            if self.pooled:
+                if self._pool is None:
+                    pool = ConnectionPool(self._cfg)
+                    # Проверяем доступ к БД сразу, а не при первом запросе.
+                    pool.release(pool.acquire())
+                    self._pool = pool
+                return
+            if self._conn is not None and self._conn.is_connected():
+                return
+            self._conn = _open_connection(self._cfg)
 
     def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        if self._stream_conn is not None:
+            _close_quietly(self._stream_conn)
+            self._stream_conn = None
         if self._conn is None:
             return
+        _close_quietly(self._conn)
+        self._conn = None
+
+    def statements(self, conn: Any) -> StatementCache | None:
+        """Кэш подготовленных выражений соединения, выданного checkout(); None — выключен в config.ini."""
+        if self._cfg.statement_cache_size <= 0:
+            return None
+        with self._statements_lock:
+            cache = self._statements.get(conn)
+            if cache is None:
+                cache = self._statements[conn] = StatementCache(conn, self._cfg.statement_cache_size)
+            return cache
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        """Выдаёт соединение на время одной операции (в обоих режимах)."""
+        if self._tx.conn is not None:
+            # Внутри transaction() этого потока — соединение транзакции
+            yield self._tx.conn
+            return
+        if not self.pooled:
+            with self._lock:
+                self.connect()
+                assert self._conn is not None
+                yield self._conn
+            return
+
+        self.connect()
+        assert self._pool is not None
+        entry = self._pool.acquire()
+        broken = False
         try:
-            self._conn.close()
-        except mysql.connector.Error:
-            # Игнорируем ошибки закрытия, это безопасно для UI.
-            pass
+            yield entry.conn
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            broken = True
+            raise
         finally:
-            self._conn = None
+            self._pool.release(entry, broken=broken)
 
-    def cursor(self, *, dictionary: bool = True) -> Any:
-        self.connect()
-        assert self._conn is not None
-        return self._conn.cursor(dictionary=dictionary)
+    @contextmanager
+    def stream_checkout(self) -> Iterator[Any]:
+        """
+        Соединение для чтения с открытым курсором на всё время выгрузки (BaseMySqlRepository._stream).
+        С пулом и внутри transaction() — как checkout(); без пула — отдельное соединение:
+        запросы UI и других потоков через общее соединение выгрузку не ждут.
+        """
+        if self._tx.conn is not None or self.pooled:
+            with self.checkout() as conn:
+                yield conn
+            return
+        with self._stream_lock:
+            if self._stream_conn is None or not self._stream_conn.is_connected():
+                self._stream_conn = _open_connection(self._cfg)
+            yield self._stream_conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """
+        Явная транзакция (соединения открываются с autocommit): все запросы репозиториев
+        в этом потоке внутри блока идут через одно соединение и фиксируются одним COMMIT,
+        исключение откатывает их все. Вложенный transaction() — SAVEPOINT: исключение
+        внутри откатывает только вложенный блок.
+
+        Без пула соединение занято транзакцией целиком: другие потоки ждут её конца.
+        """
+        tx = self._tx
+        if tx.conn is not None:
+            conn, name = tx.conn, f"sp{tx.depth}"
+            _tx_command(conn, f"SAVEPOINT {name}")
+            tx.depth += 1
+            try:
+                yield conn
+            except BaseException:
+                _tx_command(conn, f"ROLLBACK TO SAVEPOINT {name}")
+                raise
+            else:
+                _tx_command(conn, f"RELEASE SAVEPOINT {name}")
+            finally:
+                tx.depth -= 1
+            return
+
+        with self.checkout() as conn:
+            _tx_command(conn, "START TRANSACTION")
+            tx.conn, tx.depth = conn, 1
+            try:
+                yield conn
+            except BaseException:
+                tx.conn, tx.depth = None, 0
+                try:
+                    conn.rollback()
+                except mysql.connector.Error:
+                    pass  # соединение оборвалось: сервер откатит транзакцию сам
+                raise
+            tx.conn, tx.depth = None, 0
+            _tx_command(conn, "COMMIT")
 
     def __enter__(self) -> "DbConnection":
         self.connect()
@@ -60,5 +311,3 @@ class DbConnection:
     def __del__(self) -> None:
         # Демонстрация "деструктора": освобождаем ресурс при сборке мусора
         self.close()
-
-
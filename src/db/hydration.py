@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Generic, Iterable, Mapping, Optional, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Hydrator(Generic[T]):
+    """
+    Сборка сущностей из строк-кортежей (курсор без dictionary=True).
+
+    Функция сборки генерируется один раз по списку полей dataclass'а и столбцов запроса:
+    при совпадении порядка конструктор вызывается позиционно, без промежуточного dict
+    на строку; преобразования (`converters`, например int -> bool) встраиваются в неё же.
+    """
+
+    def __init__(
+        self,
+        cls: type[T],
+        columns: Optional[Sequence[str]] = None,
+        converters: Optional[Mapping[str, Callable[[Any], Any]]] = None,
+    ):
+        if not is_dataclass(cls):
+            raise TypeError(f"{cls.__name__} не является dataclass.")
+        names = [f.name for f in fields(cls)]
+        self.cls = cls
+        self.columns: tuple[str, ...] = tuple(columns) if columns is not None else tuple(names)
+        converters = dict(converters or {})
+
+        unknown = [c for c in (*self.columns, *converters) if c not in names]
+        if unknown:
+            raise ValueError(f"У {cls.__name__} нет полей: {', '.join(unknown)}")
+
+        self._one = self._compile(names, converters)
+
+    def _compile(self, names: list[str], converters: dict[str, Callable[[Any], Any]]) -> Callable[[Sequence[Any]], T]:
+        positional = list(self.columns) == names[: len(self.columns)]
+        namespace: dict[str, Any] = {"_cls": self.cls}
+        if positional and not converters:
+            source = "def hydrate(row):\n    return _cls(*row)\n"
+        else:
+            values = [f"v{i}" for i in range(len(self.columns))]
+            args = []
+            for i, col in enumerate(self.columns):
+                expr = values[i]
+                if col in converters:
+                    namespace[f"_conv{i}"] = converters[col]
+                    expr = f"_conv{i}({expr})"
+                args.append(expr if positional else f"{col}={expr}")
+            source = (
+                "def hydrate(row):\n"
+                f"    {', '.join(values)}, = row\n"
+                f"    return _cls({', '.join(args)})\n"
+            )
+        exec(compile(source, f"<hydrate {self.cls.__name__}>", "exec"), namespace)  # noqa: S102
+        return namespace["hydrate"]
+
+    def __call__(self, row: Sequence[Any]) -> T:
+        return self._one(row)
+
+    def all(self, rows: Iterable[Sequence[Any]]) -> list[T]:
+        return list(map(self._one, rows))
+
+    def select_list(self, alias: str = "") -> str:
+        """Список столбцов для SELECT в порядке, который ожидает сборщик."""
+        prefix = f"{alias}." if alias else ""
+        return ", ".join(prefix + c for c in self.columns)
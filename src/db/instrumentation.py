@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+import json
+import re
+import threading
+import time
+
+
+# Верхние границы корзин гистограммы времени выполнения (мс); последняя корзина — всё, что дольше
+BUCKETS_MS: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_source: ContextVar[Optional[str]] = ContextVar("query_source", default=None)
+
+
+@contextmanager
+def query_source(label: str) -> Iterator[None]:
+    """Помечает запросы, выполненные внутри блока, источником (вкладка, отчёт)."""
+    token = _source.set(label)
+    try:
+        yield
+    finally:
+        _source.reset(token)
+
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    """
+    Нормализованный текст запроса: литералы и параметры заменены на ?, списки IN (...)
+    свёрнуты, пробелы схлопнуты. Запросы, отличающиеся только значениями, совпадают.
+    """
+    text = _STRING.sub("?", query)
+    text = text.replace("%s", "?")
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("IN (...)", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+@dataclass(slots=True)
+class QueryStats:
+    fingerprint: str
+    count: int = 0
+    errors: int = 0
+    rows: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    sources: Counter = field(default_factory=Counter)
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile_ms(self, p: float) -> float:
+        """Оценка перцентиля по гистограмме (верхняя граница корзины)."""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if seen >= target:
+                return min(BUCKETS_MS[i], self.max_ms) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def add(self, elapsed_ms: float, rows: int, error: bool, source: Optional[str]) -> None:
+        self.count += 1
+        self.errors += error
+        self.rows += max(rows, 0)
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        i = 0
+        while i < len(BUCKETS_MS) and elapsed_ms > BUCKETS_MS[i]:
+            i += 1
+        self.histogram[i] += 1
+        self.sources[source or "—"] += 1
+
+    def copy(self) -> QueryStats:
+        return QueryStats(
+            self.fingerprint,
+            self.count,
+            self.errors,
+            self.rows,
+            self.total_ms,
+            self.max_ms,
+            list(self.histogram),
+            Counter(self.sources),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.avg_ms, 3),
+            "p95_ms": round(self.percentile_ms(95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": dict(zip([f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"], self.histogram)),
+            "sources": dict(self.sources),
+        }
+
+
+@dataclass(slots=True)
+class Measurement:
+    """Заполняется внутри QueryMonitor.measure(): число строк результата."""
+
+    rows: int = -1
+
+
+class QueryMonitor:
+    """
+    Статистика SQL-запросов по отпечаткам (fingerprint): число вызовов, строк, ошибок,
+    время и гистограмма. Запросы дольше `slow_ms` дописываются в `slow_log` (JSON Lines).
+
+    Потокобезопасен: запросы идут из GUI-потока и фонового пула.
+    """
+
+    def __init__(
+        self,
+        slow_ms: float = 0,
+        slow_log: str | Path | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.slow_ms = slow_ms
+        self.slow_log = Path(slow_log) if slow_log else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: dict[str, QueryStats] = {}
+        self._started = datetime.now()
+
+    @contextmanager
+    def measure(self, query: str) -> Iterator[Measurement]:
+        m = Measurement()
+        start = self._clock()
+        error = False
+        try:
+            yield m
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(query, (self._clock() - start) * 1000, m.rows, error=error)
+
+    def record(self, query: str, elapsed_ms: float, rows: int = -1, *, error: bool = False) -> None:
+        fp = fingerprint(query)
+        source = _source.get()
+        with self._lock:
+            stats = self._stats.get(fp)
+            if stats is None:
+                stats = self._stats[fp] = QueryStats(fp)
+            stats.add(elapsed_ms, rows, error, source)
+        if self.slow_log is not None and self.slow_ms > 0 and elapsed_ms >= self.slow_ms:
+            self._log_slow(fp, elapsed_ms, rows, error, source)
+
+    def _log_slow(self, fp: str, elapsed_ms: float, rows: int, error: bool, source: Optional[str]) -> None:
+        entry = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "ms": round(elapsed_ms, 1),
+            "rows": rows,
+            "error": error,
+            "source": source,
+            "query": fp,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        try:
+            with self._lock, open(self.slow_log, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError:
+            # Журнал медленных запросов не должен ломать работу с БД
+            pass
+
+    def snapshot(self) -> list[QueryStats]:
+        """Копия статистики, отсортированная по суммарному времени (самые дорогие — первыми)."""
+        with self._lock:
+            items = [s.copy() for s in self._stats.values()]
+        items.sort(key=lambda s: s.total_ms, reverse=True)
+        return items
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._started = datetime.now()
+
+    def to_dict(self, **extra: Any) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "started_at": self._started.isoformat(timespec="seconds"),
+            "dumped_at": datetime.now().isoformat(timespec="seconds"),
+            "slow_ms": self.slow_ms,
+            "queries": [s.to_dict() for s in self.snapshot()],
+        }
+        data.update(extra)
+        return data
+
+    def dump_json(self, path: str | Path, **extra: Any) -> None:
+        """Сохраняет статистику в JSON; `extra` — дополнительные разделы (например, статистика кэша)."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(**extra), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+import hashlib
+import re
+import time
+
+import mysql.connector
+from mysql.connector import errorcode
+
+from src.core.errors import DatabaseError
+from src.db.connection import DbConnection
+
+
+SQL_DIR = Path(__file__).resolve().parents[2] / "sql"
+MIGRATIONS_DIR = SQL_DIR / "migrations"
+# Базовая схема (CREATE TABLE IF NOT EXISTS) применяется как версия 0
+SCHEMA_FILE = SQL_DIR / "schema.sql"
+
+_FILE_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+# База выбрана в config.ini: CREATE DATABASE/USE из файлов не выполняются
+_SKIPPED = re.compile(r"^(USE\s|CREATE\s+(DATABASE|SCHEMA)\s)", re.I)
+
+# Объект уже есть (миграцию применили вручную до появления schema_version) — шаг пропускается
+_ALREADY_APPLIED = {
+    errorcode.ER_DUP_FIELDNAME,
+    errorcode.ER_DUP_KEYNAME,
+    errorcode.ER_TABLE_EXISTS_ERROR,
+    errorcode.ER_TRG_ALREADY_EXISTS,
+}
+
+_LOCK_NAME = "project_manager.schema_migrations"
+_LOCK_TIMEOUT = 60
+
+_CREATE_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+      version INT PRIMARY KEY,
+      name VARCHAR(255) NOT NULL,
+      checksum CHAR(64) NOT NULL,
+      applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      duration_ms INT NOT NULL
+    )
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    def text(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def checksum(self) -> str:
+        # Без учёта концов строк: файл мог пройти через git с autocrlf
+        return hashlib.sha256(self.text().replace("\r\n", "\n").encode("utf-8")).hexdigest()
+
+    def statements(self) -> list[str]:
+        return [s for s in split_statements(self.text()) if not _SKIPPED.match(s)]
+
+
+@dataclass(frozen=True, slots=True)
+class AppliedMigration:
+    version: int
+    name: str
+    checksum: str
+    applied_at: Optional[datetime]
+    duration_ms: int
+
+
+def split_statements(sql: str) -> list[str]:
+    """Разбивает файл на запросы по `;` вне строк и комментариев; комментарии отбрасываются."""
+    statements: list[str] = []
+    current: list[str] = []
+    i, n = 0, len(sql)
+    while i < n:
+        ch = sql[i]
+        if ch in "'\"`":
+            end = i + 1
+            while end < n:
+                if sql[end] == "\\" and ch != "`":
+                    end += 2
+                    continue
+                if sql[end] == ch:
+                    if end + 1 < n and sql[end + 1] == ch:  # удвоенная кавычка внутри строки
+                        end += 2
+                        continue
+                    break
+                end += 1
+            current.append(sql[i : end + 1])
+            i = end + 1
+        elif ch == "#" or (sql.startswith("--", i) and (i + 2 >= n or sql[i + 2].isspace())):
+            end = sql.find("\n", i)
+            i = n if end < 0 else end
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            current.append(" ")
+        elif ch == ";":
+            statements.append("".join(current).strip())
+            current = []
+            i += 1
+        else:
+            current.append(ch)
+            i += 1
+    statements.append("".join(current).strip())
+    return [s for s in statements if s]
+
+
+def discover(directory: Path = MIGRATIONS_DIR, schema: Optional[Path] = SCHEMA_FILE) -> list[Migration]:
+    """Миграции NNN_name.sql по возрастанию номера (и schema.sql как версия 0)."""
+    found: dict[int, Migration] = {}
+    if schema is not None and schema.exists():
+        found[0] = Migration(0, "schema", schema)
+    for path in sorted(directory.glob("*.sql")):
+        m = _FILE_NAME.match(path.name)
+        if m is None:
+            continue
+        version = int(m.group(1))
+        if version in found:
+            raise DatabaseError(f"Две миграции с номером {version}: {found[version].path.name} и {path.name}.")
+        found[version] = Migration(version, m.group(2), path)
+    return [found[v] for v in sorted(found)]
+
+
+class MigrationRunner:
+    """
+    Применяет миграции, которых нет в таблице schema_version, по возрастанию номера.
+
+    Повторный запуск ничего не делает; одновременный запуск из нескольких копий
+    приложения сериализуется блокировкой GET_LOCK. DDL в MySQL не транзакционен:
+    версия записывается после всех шагов файла, поэтому прерванная миграция при
+    следующем запуске повторяется (уже созданные столбцы/индексы пропускаются).
+    """
+
+    def __init__(self, db: DbConnection, migrations: Optional[list[Migration]] = None):
+        self._db = db
+        self._migrations = discover() if migrations is None else migrations
+
+    @property
+    def migrations(self) -> list[Migration]:
+        return list(self._migrations)
+
+    def applied(self) -> dict[int, AppliedMigration]:
+        try:
+            with self._db.checkout() as conn:
+                return self._applied(conn)
+        except mysql.connector.Error as e:
+            raise DatabaseError(f"Не удалось прочитать schema_version: {e}") from e
+
+    def pending(self) -> list[Migration]:
+        applied = self.applied()
+        return [m for m in self._migrations if m.version not in applied]
+
+    def changed(self) -> list[Migration]:
+        """Применённые миграции, файлы которых с тех пор изменились."""
+        applied = self.applied()
+        return [m for m in self._migrations if m.version in applied and applied[m.version].checksum != m.checksum]
+
+    def migrate(
+        self,
+        target: Optional[int] = None,
+        on_applied: Optional[Callable[[AppliedMigration], None]] = None,
+    ) -> list[AppliedMigration]:
+        """Применить недостающие миграции (до `target` включительно); возвращает применённые."""
+        done: list[AppliedMigration] = []
+        try:
+            with self._db.checkout() as conn, self._locked(conn):
+                applied = self._applied(conn)
+                for m in self._migrations:
+                    if m.version in applied or (target is not None and m.version > target):
+                        continue
+                    result = self._apply(conn, m)
+                    done.append(result)
+                    if on_applied is not None:
+                        on_applied(result)
+        except mysql.connector.Error as e:
+            raise DatabaseError(f"Ошибка миграции схемы БД: {e}") from e
+        return done
+
+    @contextmanager
+    def _locked(self, conn: Any) -> Iterator[None]:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT GET_LOCK(%s, %s)", (_LOCK_NAME, _LOCK_TIMEOUT))
+            (acquired,) = cur.fetchone()
+            if acquired != 1:
+                raise DatabaseError("Схему БД сейчас обновляет другая копия приложения, повторите позже.")
+            try:
+                yield
+            finally:
+                cur.execute("SELECT RELEASE_LOCK(%s)", (_LOCK_NAME,))
+                cur.fetchall()
+        finally:
+            cur.close()
+
+    def _applied(self, conn: Any) -> dict[int, AppliedMigration]:
+        cur = conn.cursor()
+        try:
+            cur.execute(_CREATE_VERSION_TABLE)
+            cur.execute("SELECT version, name, checksum, applied_at, duration_ms FROM schema_version")
+            return {row[0]: AppliedMigration(*row) for row in cur.fetchall()}
+        finally:
+            cur.close()
+
+    def _apply(self, conn: Any, m: Migration) -> AppliedMigration:
+        start = time.perf_counter()
+        cur = conn.cursor()
+        try:
+            for statement in m.statements():
+                try:
+                    with self._db.monitor.measure(statement) as measure:
+                        cur.execute(statement)
+                        measure.rows = cur.rowcount
+                except mysql.connector.Error as e:
+                    if e.errno not in _ALREADY_APPLIED:
+                        raise DatabaseError(f"Миграция {m.path.name} не применена: {e}") from e
+            duration_ms = round((time.perf_counter() - start) * 1000)
+            cur.execute(
+                "INSERT INTO schema_version (version, name, checksum, duration_ms) VALUES (%s,%s,%s,%s)",
+                (m.version, m.name, m.checksum, duration_ms),
+            )
+        finally:
+            cur.close()
+        return AppliedMigration(m.version, m.name, m.checksum, datetime.now(), duration_ms)
@@ -1,21 +1,104 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Generic, Optional, TypeVar
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Generic, Iterable, Optional, TypeVar
 
 
 T = TypeVar("T")
 
+# Ключ keyset-пагинации: значения столбцов сортировки последней строки страницы.
+PageKey = tuple[Any, ...]
+
+
+@dataclass(slots=True)
+class Page(Generic[T]):
+    items: list[T]
+    # Ключ для запроса следующей страницы; None — страниц больше нет.
+    next_key: Optional[PageKey] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_key is not None
+
+
+@dataclass(frozen=True, slots=True)
+class TaskFilter:
+    """Условия выборки задач (TaskRepositoryMySql.query); пустые поля не фильтруют."""
+
+    statuses: tuple[str, ...] = ()
+    project_id: Optional[int] = None
+    employee_id: Optional[int] = None
+    # Только задачи без исполнителя (employee_id тогда не учитывается)
+    unassigned: bool = False
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+
+    def matches(self, task: Any) -> bool:
+        """То же условие в памяти — для строк дельты list_changed_since."""
+        if self.statuses and task.status not in self.statuses:
+            return False
+        if self.project_id is not None and task.project_id != self.project_id:
+            return False
+        if self.unassigned:
+            if task.employee_id is not None:
+                return False
+        elif self.employee_id is not None and task.employee_id != self.employee_id:
+            return False
+        if self.due_from is not None and (task.due_date is None or task.due_date < self.due_from):
+            return False
+        if self.due_to is not None and (task.due_date is None or task.due_date > self.due_to):
+            return False
+        return True
+
+
+@dataclass(slots=True)
+class ChangeSet(Generic[T]):
+    # Строки, созданные или изменённые с момента `since`
+    changed: list[T]
+    # id удалённых строк (по tombstone-таблице deleted_rows)
+    deleted_ids: list[int] = field(default_factory=list)
+    # Время сервера на момент запроса: передаётся как `since` в следующий раз
+    as_of: Optional[datetime] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changed and not self.deleted_ids
+
 
 class IRepository(ABC, Generic[T]):
     @abstractmethod
     def get_by_id(self, entity_id: int) -> Optional[T]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_many(self, ids: Iterable[int], *, ordered: bool = False) -> list[T]:
+        """
+        Записи с id из `ids` (без повторов; отсутствующих в БД нет) — запросами WHERE id IN (...)
+        вместо get_by_id на каждый id. ordered=True — в порядке `ids`.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def list_all(self) -> list[T]:
         raise NotImplementedError
 
+    @abstractmethod
+    def list_page(
+        self,
+        after_key: Optional[PageKey] = None,
+        limit: int = 100,
+        sort: str = "default",
+    ) -> Page[T]:
+        """Страница записей после `after_key` в порядке сортировки `sort` (keyset-пагинация)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_changed_since(self, since: datetime) -> ChangeSet[T]:
+        """Изменения (updated_at) и удаления (tombstones), начиная с момента `since`."""
+        raise NotImplementedError
+
     @abstractmethod
     def create(self, entity: T) -> int:
         raise NotImplementedError
@@ -27,5 +110,3 @@ class IRepository(ABC, Generic[T]):
     @abstractmethod
     def delete(self, entity_id: int) -> None:
         raise NotImplementedError
-
-
@@ -1,23 +1,239 @@
 from __future__ import annotations
 
-from typing import Any
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping, Optional
+import time
 
 import mysql.connector
+from mysql.connector import errorcode
 
 from src.core.errors import DatabaseError
 from src.db.connection import DbConnection
+from src.db.repositories.base import PageKey
+from src.db.statements import QueryResult, execute_plain
+
+
+# Порядок сортировки для keyset-пагинации: (SQL-выражение, ключ в строке результата, DESC?)
+SortSpec = tuple[tuple[str, str, bool], ...]
+
+# id в одном запросе WHERE id IN (...) (_fetch_by_ids)
+_IN_CHUNK = 512
 
 
 class BaseMySqlRepository:
     def __init__(self, db: DbConnection):
         self._db = db
 
-    def _execute(self, query: str, params: tuple[Any, ...] = ()) -> Any:
+    def _execute(self, query: str, params: tuple[Any, ...] = (), *, tuples: bool = False) -> QueryResult:
+        # Результат читается целиком до возврата соединения (в пул или другим потокам).
+        # Запрос выполняется подготовленным выражением соединения: постоянный текст
+        # запроса репозитория разбирается сервером один раз, дальше передаются только параметры.
+        # tuples=True — строки-кортежи вместо dict (для сборки сущностей через Hydrator).
+        try:
+            with self._db.checkout() as conn, self._db.monitor.measure(query) as m:
+                statements = self._db.statements(conn)
+                if statements is None:
+                    result = execute_plain(conn, query, params, tuples=tuples)
+                else:
+                    result = statements.execute(query, params, tuples=tuples)
+                m.rows = result.rowcount
+                return result
+        except mysql.connector.Error as e:
+            raise DatabaseError(f"Ошибка запроса к БД: {e}") from e
+
+    def _stream(
+        self, query: str, params: tuple[Any, ...] = (), batch_size: int = 1000, *, tuples: bool = False
+    ) -> Iterator[Any]:
+        """
+        Потоковое чтение большого результата: небуферизованный курсор и fetchmany,
+        в памяти одновременно не больше `batch_size` строк.
+
+        Соединение (DbConnection.stream_checkout) занято, пока генератор не исчерпан
+        или не закрыт. В статистику попадает время выполнения запроса (без времени обработки строк).
+        """
+        try:
+            with self._db.stream_checkout() as conn:
+                cur = conn.cursor(dictionary=not tuples)
+                count, elapsed_ms, failed = 0, 0.0, True
+                try:
+                    start = time.perf_counter()
+                    cur.execute(query, params)
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    failed = False
+                    while True:
+                        rows = cur.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        count += len(rows)
+                        yield from rows
+                finally:
+                    self._db.monitor.record(query, elapsed_ms, count, error=failed)
+                    # Выгрузку могли прервать: дочитываем остаток, иначе соединение непригодно.
+                    if conn.unread_result:
+                        conn.consume_results()
+                    cur.close()
+        except mysql.connector.Error as e:
+            raise DatabaseError(f"Ошибка запроса к БД: {e}") from e
+
+    def transaction(self) -> AbstractContextManager[Any]:
+        """
+        Транзакция соединения репозитория (DbConnection.transaction): запросы всех
+        репозиториев этого соединения внутри блока выполняются атомарно, одним COMMIT.
+        """
+        return self._db.transaction()
+
+    def _executemany(self, query: str, rows: list[tuple[Any, ...]]) -> int:
+        """Пакетная запись в одной явной транзакции: либо все строки, либо ни одной."""
+        if not rows:
+            return 0
+        try:
+            # Внутри уже открытой транзакции — SAVEPOINT
+            with self._db.transaction() as conn:
+                cur = conn.cursor()
+                try:
+                    with self._db.monitor.measure(query) as m:
+                        cur.executemany(query, rows)
+                        m.rows = cur.rowcount
+                    return cur.rowcount
+                finally:
+                    cur.close()
+        except mysql.connector.Error as e:
+            raise DatabaseError(f"Ошибка пакетной записи в БД: {e}") from e
+
+    def _execute_in_transaction(self, statements: list[tuple[str, tuple[Any, ...]]]) -> None:
+        """Несколько запросов в одной явной транзакции (во вложенной — SAVEPOINT)."""
         try:
-            cur = self._db.cursor(dictionary=True)
-            cur.execute(query, params)
-            return cur
+            with self._db.transaction() as conn:
+                cur = conn.cursor()
+                try:
+                    for query, params in statements:
+                        with self._db.monitor.measure(query) as m:
+                            cur.execute(query, params)
+                            m.rows = cur.rowcount
+                finally:
+                    cur.close()
         except mysql.connector.Error as e:
             raise DatabaseError(f"Ошибка запроса к БД: {e}") from e
 
+    def server_now(self) -> datetime:
+        """Текущее время сервера БД — отметка для последующего list_changed_since."""
+        row = self._execute("SELECT CURRENT_TIMESTAMP AS now").fetchone()
+        return row["now"]
+
+    def _deleted_since(self, table: str, since: datetime) -> list[int]:
+        cur = self._execute(
+            "SELECT DISTINCT row_id FROM deleted_rows WHERE table_name=%s AND deleted_at>=%s",
+            (table, since),
+        )
+        return [int(r["row_id"]) for r in cur.fetchall()]
+
+    def _fetch_by_ids(
+        self, select_sql: str, ids: Iterable[int], *, tuples: bool = False, ordered: bool = False
+    ) -> list[Any]:
+        """
+        Строки `select_sql` (запрос без WHERE) с id из `ids`: повторы отбрасываются, id идут
+        запросами WHERE id IN (...) по _IN_CHUNK. ordered=True — в порядке первого появления
+        id в `ids` (отсутствующих в БД в ответе нет), иначе — в порядке ответа БД.
+        """
+        ids = tuple(dict.fromkeys(ids))
+        if not ids:
+            return []
+        select_sql = select_sql.rstrip()
+        rows: list[Any] = []
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start : start + _IN_CHUNK]
+            # Список дополняется последним id до степени двойки: разных текстов запроса
+            # (и подготовленных выражений в кэше соединения) — не больше десятка
+            size = 1 << (len(chunk) - 1).bit_length()
+            chunk += (chunk[-1],) * (size - len(chunk))
+            placeholders = ", ".join(["%s"] * size)
+            rows += self._execute(f"{select_sql}\nWHERE id IN ({placeholders})", chunk, tuples=tuples).fetchall()
+        if ordered:
+            position = {entity_id: i for i, entity_id in enumerate(ids)}
+            rows.sort(key=(lambda r: position[r[0]]) if tuples else (lambda r: position[r["id"]]))
+        return rows
+
+    def _update_columns(
+        self, table: str, entity_id: int, values: Mapping[str, Any], columns: tuple[str, ...]
+    ) -> None:
+        """
+        UPDATE только столбцов из `values` (прочие ключи, не входящие в `columns`, игнорируются).
+        Столбцы идут в порядке `columns`, чтобы у одинаковых наборов был один текст запроса.
+        """
+        assigned = [c for c in columns if c in values]
+        if not assigned:
+            return
+        self._execute(
+            f"UPDATE {table} SET {', '.join(f'{c}=%s' for c in assigned)} WHERE id=%s",
+            (*(values[c] for c in assigned), entity_id),
+        )
+
+    @staticmethod
+    def _resolve_sort(sorts: dict[str, SortSpec], sort: str) -> SortSpec:
+        try:
+            return sorts[sort]
+        except KeyError:
+            raise ValueError(f"Неизвестная сортировка: {sort}") from None
+
+    def _fetch_page(
+        self,
+        select_sql: str,
+        order: SortSpec,
+        after_key: Optional[PageKey],
+        limit: int,
+        *,
+        where: str = "",
+        params: tuple[Any, ...] = (),
+        tuples: bool = False,
+    ) -> tuple[list[Any], Optional[PageKey]]:
+        """
+        Keyset-пагинация: вместо OFFSET продолжаем с ключа последней строки,
+        поэтому стоимость страницы не зависит от её номера.
+
+        `select_sql` — запрос без WHERE/ORDER BY/LIMIT; `where` — доп. условие.
+        Возвращает строки страницы и ключ следующей страницы (или None).
+        """
+        if limit <= 0:
+            raise ValueError("limit должен быть положительным.")
+
+        conditions: list[str] = [f"({where})"] if where else []
+        all_params: list[Any] = list(params)
+
+        if after_key is not None:
+            if len(after_key) != len(order):
+                raise ValueError("Ключ страницы не соответствует порядку сортировки.")
+            # (c1 > k1) OR (c1 = k1 AND c2 > k2) OR ... с учётом направления каждого столбца
+            branches: list[str] = []
+            for i, (expr, _, desc) in enumerate(order):
+                parts = [f"{e}=%s" for e, _, _ in order[:i]]
+                parts.append(f"{expr}{'<' if desc else '>'}%s")
+                branches.append("(" + " AND ".join(parts) + ")")
+                all_params.extend(after_key[: i + 1])
+            first_expr, _, first_desc = order[0]
+            # Дублирующее условие по первому столбцу позволяет MySQL взять диапазон по индексу.
+            conditions.append(f"{first_expr}{'<=' if first_desc else '>='}%s")
+            conditions.append("(" + " OR ".join(branches) + ")")
+            all_params.insert(len(params), after_key[0])
+
+        sql = select_sql.rstrip()
+        if conditions:
+            sql += "\nWHERE " + " AND ".join(conditions)
+        sql += "\nORDER BY " + ", ".join(f"{e} {'DESC' if d else 'ASC'}" for e, _, d in order)
+        sql += "\nLIMIT %s"
+        all_params.append(limit + 1)
+
+        result = self._execute(sql, tuple(all_params), tuples=tuples)
+        rows = result.fetchall()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        if tuples:
+            return rows, tuple(last[result.columns.index(key)] for _, key, _ in order)
+        return rows, tuple(last[key] for _, key, _ in order)
+
 
+def is_missing_schema(e: DatabaseError) -> bool:
+    """Нет столбца или таблицы (миграция не применена) — в отличие от обрыва связи и прочих ошибок."""
+    return getattr(e.__cause__, "errno", None) in (errorcode.ER_BAD_FIELD_ERROR, errorcode.ER_NO_SUCH_TABLE)
@@ -1,21 +1,60 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping, Optional
 
 from src.core.entities import Client
-from src.db.repositories.base import IRepository
-from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
+from src.db.hydration import Hydrator
+from src.db.repositories.base import ChangeSet, IRepository, Page, PageKey
+from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository, SortSpec
+
+
+# Столбцы SELECT идут в порядке полей Client
+_CLIENT = Hydrator(Client)
 
 
 class ClientRepositoryMySql(BaseMySqlRepository, IRepository[Client]):
+    _PAGE_SORTS: dict[str, SortSpec] = {
+        "default": (("name", "name", False), ("id", "id", False)),
+        "id": (("id", "id", False),),
+    }
+
     def get_by_id(self, entity_id: int) -> Optional[Client]:
-        cur = self._execute("SELECT id, name, phone, email, note FROM clients WHERE id=%s", (entity_id,))
+        cur = self._execute("SELECT id, name, phone, email, note FROM clients WHERE id=%s", (entity_id,), tuples=True)
         row = cur.fetchone()
-        return None if row is None else Client(**row)
+        return None if row is None else _CLIENT(row)
+
+    def get_many(self, ids: Iterable[int], *, ordered: bool = False) -> list[Client]:
+        rows = self._fetch_by_ids("SELECT id, name, phone, email, note FROM clients", ids, tuples=True, ordered=ordered)
+        return _CLIENT.all(rows)
 
     def list_all(self) -> list[Client]:
-        cur = self._execute("SELECT id, name, phone, email, note FROM clients ORDER BY name")
-        return [Client(**row) for row in cur.fetchall()]
+        cur = self._execute("SELECT id, name, phone, email, note FROM clients ORDER BY name", tuples=True)
+        return _CLIENT.all(cur.fetchall())
+
+    def iter_all(self) -> Iterator[Client]:
+        rows = self._stream("SELECT id, name, phone, email, note FROM clients ORDER BY name", tuples=True)
+        yield from map(_CLIENT, rows)
+
+    def list_page(self, after_key: Optional[PageKey] = None, limit: int = 100, sort: str = "default") -> Page[Client]:
+        rows, next_key = self._fetch_page(
+            "SELECT id, name, phone, email, note FROM clients",
+            self._resolve_sort(self._PAGE_SORTS, sort),
+            after_key,
+            limit,
+            tuples=True,
+        )
+        return Page(_CLIENT.all(rows), next_key)
+
+    def list_changed_since(self, since: datetime) -> ChangeSet[Client]:
+        as_of = self.server_now()
+        cur = self._execute(
+            "SELECT id, name, phone, email, note FROM clients WHERE updated_at>=%s",
+            (since,),
+            tuples=True,
+        )
+        changed = _CLIENT.all(cur.fetchall())
+        return ChangeSet(changed, self._deleted_since("clients", since), as_of)
 
     def create(self, entity: Client) -> int:
         cur = self._execute(
@@ -31,6 +70,10 @@ class ClientRepositoryMySql(BaseMySqlRepository, IRepository[Client]):
             (entity.name, entity.phone, entity.email, entity.note, entity.id),
         )
 
+    def update_fields(self, entity_id: int, changes: Mapping[str, Any]) -> None:
+        """Записать только изменённые поля (см. ChangeTracker.diff)."""
+        self._update_columns("clients", entity_id, changes, ("name", "phone", "email", "note"))
+
     def delete(self, entity_id: int) -> None:
         self._execute("DELETE FROM clients WHERE id=%s", (entity_id,))
 
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping, Optional
 
 from src.core.entities import Employee
-from src.db.repositories.base import IRepository
-from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
+from src.db.hydration import Hydrator
+from src.db.repositories.base import ChangeSet, IRepository, Page, PageKey
+from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository, SortSpec
+
+
+# Столбцы SELECT идут в порядке полей Employee; is_active хранится как TINYINT(1)
+_EMPLOYEE = Hydrator(Employee, converters={"is_active": bool})
 
 
 class EmployeeRepositoryMySql(BaseMySqlRepository, IRepository[Employee]):
+    _PAGE_SORTS: dict[str, SortSpec] = {
+        "default": (
+            ("last_name", "last_name", False),
+            ("first_name", "first_name", False),
+            ("id", "id", False),
+        ),
+        "id": (("id", "id", False),),
+    }
+
     def get_by_id(self, entity_id: int) -> Optional[Employee]:
         cur = self._execute(
             """
@@ -16,12 +31,22 @@ class EmployeeRepositoryMySql(BaseMySqlRepository, IRepository[Employee]):
             WHERE id=%s
             """,
             (entity_id,),
+            tuples=True,
         )
         row = cur.fetchone()
-        if row is None:
-            return None
-        row["is_active"] = bool(row["is_active"])
-        return Employee(**row)
+        return None if row is None else _EMPLOYEE(row)
+
+    def get_many(self, ids: Iterable[int], *, ordered: bool = False) -> list[Employee]:
+        rows = self._fetch_by_ids(
+            """
+            SELECT id, last_name, first_name, middle_name, position, phone, email, is_active
+            FROM employees
+            """,
+            ids,
+            tuples=True,
+            ordered=ordered,
+        )
+        return _EMPLOYEE.all(rows)
 
     def list_all(self) -> list[Employee]:
         cur = self._execute(
@@ -29,13 +54,48 @@ class EmployeeRepositoryMySql(BaseMySqlRepository, IRepository[Employee]):
             SELECT id, last_name, first_name, middle_name, position, phone, email, is_active
             FROM employees
             ORDER BY last_name, first_name
+            """,
+            tuples=True,
+        )
+        return _EMPLOYEE.all(cur.fetchall())
+
+    def iter_all(self) -> Iterator[Employee]:
+        rows = self._stream(
             """
+            SELECT id, last_name, first_name, middle_name, position, phone, email, is_active
+            FROM employees
+            ORDER BY last_name, first_name
+            """,
+            tuples=True,
         )
-        result: list[Employee] = []
-        for row in cur.fetchall():
-            row["is_active"] = bool(row["is_active"])
-            result.append(Employee(**row))
-        return result
+        yield from map(_EMPLOYEE, rows)
+
+    def list_page(self, after_key: Optional[PageKey] = None, limit: int = 100, sort: str = "default") -> Page[Employee]:
+        rows, next_key = self._fetch_page(
+            """
+            SELECT id, last_name, first_name, middle_name, position, phone, email, is_active
+            FROM employees
+            """,
+            self._resolve_sort(self._PAGE_SORTS, sort),
+            after_key,
+            limit,
+            tuples=True,
+        )
+        return Page(_EMPLOYEE.all(rows), next_key)
+
+    def list_changed_since(self, since: datetime) -> ChangeSet[Employee]:
+        as_of = self.server_now()
+        cur = self._execute(
+            """
+            SELECT id, last_name, first_name, middle_name, position, phone, email, is_active
+            FROM employees
+            WHERE updated_at>=%s
+            """,
+            (since,),
+            tuples=True,
+        )
+        changed = _EMPLOYEE.all(cur.fetchall())
+        return ChangeSet(changed, self._deleted_since("employees", since), as_of)
 
     def create(self, entity: Employee) -> int:
         cur = self._execute(
@@ -55,6 +115,18 @@ class EmployeeRepositoryMySql(BaseMySqlRepository, IRepository[Employee]):
         )
         return int(cur.lastrowid)
 
+    def create_many(self, entities: list[Employee]) -> int:
+        return self._executemany(
+            """
+            INSERT INTO employees (last_name, first_name, middle_name, position, phone, email, is_active)
+            VALUES (%s,%s,%s,%s,%s,%s,%s)
+            """,
+            [
+                (e.last_name, e.first_name, e.middle_name, e.position, e.phone, e.email, 1 if e.is_active else 0)
+                for e in entities
+            ],
+        )
+
     def update(self, entity: Employee) -> None:
         assert entity.id is not None
         self._execute(
@@ -75,6 +147,17 @@ class EmployeeRepositoryMySql(BaseMySqlRepository, IRepository[Employee]):
             ),
         )
 
+    def update_fields(self, entity_id: int, changes: Mapping[str, Any]) -> None:
+        """Записать только изменённые поля (см. ChangeTracker.diff)."""
+        if "is_active" in changes:
+            changes = {**changes, "is_active": 1 if changes["is_active"] else 0}
+        self._update_columns(
+            "employees",
+            entity_id,
+            changes,
+            ("last_name", "first_name", "middle_name", "position", "phone", "email", "is_active"),
+        )
+
     def delete(self, entity_id: int) -> None:
         self._execute("DELETE FROM employees WHERE id=%s", (entity_id,))
 
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+from typing import Any, Iterable
+
+from src.core.entities import ProjectMember
+from src.db.hydration import Hydrator
 from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
 
 
+_MEMBER = Hydrator(ProjectMember)
+
+# Строк в одном многострочном INSERT и id в одном DELETE ... IN
+_CHUNK = 500
+
+
 class ProjectMemberRepositoryMySql(BaseMySqlRepository):
+    # Строка VALUES и дополнение INSERT для set_members/change_members (у SQLite — свои, см. _member_row)
+    _MEMBER_VALUES = "(%s,%s,%s, CURRENT_DATE)"
+    # Псевдоним строки (AS new) вместо устаревшей с 8.0.20 функции VALUES() — MySQL 8.0.19+
+    _MEMBER_UPSERT = "AS new ON DUPLICATE KEY UPDATE role=new.role"
+
     def list_members(self, project_id: int) -> list[dict]:
         cur = self._execute(
             """
@@ -25,6 +40,13 @@ class ProjectMemberRepositoryMySql(BaseMySqlRepository):
         )
         return list(cur.fetchall())
 
+    def list_all_members(self) -> list[ProjectMember]:
+        cur = self._execute(
+            "SELECT project_id, employee_id, role, since_date FROM project_members",
+            tuples=True,
+        )
+        return _MEMBER.all(cur.fetchall())
+
     def add_member(self, project_id: int, employee_id: int, role: str) -> None:
         self._execute(
             """
@@ -40,4 +62,57 @@ class ProjectMemberRepositoryMySql(BaseMySqlRepository):
             (project_id, employee_id),
         )
 
+    def set_members(self, project_id: int, members: Iterable[tuple[int, str]]) -> None:
+        """
+        Состав проекта целиком по парам (employee_id, role) — одной транзакцией: прочие
+        участники удаляются одним DELETE, новые и сменившие роль пишутся многострочным
+        INSERT ... ON DUPLICATE KEY UPDATE. Дата участия оставшихся не меняется.
+        """
+        roles = dict(members)  # при повторе сотрудника действует последняя роль
+        delete_sql = "DELETE FROM project_members WHERE project_id=%s"
+        if roles:
+            delete_sql += f" AND employee_id NOT IN ({', '.join(['%s'] * len(roles))})"
+        statements: list[tuple[str, tuple[Any, ...]]] = [(delete_sql, (project_id, *roles))]
+        statements += self._upsert_statements(project_id, roles)
+        self._execute_in_transaction(statements)
+
+    def change_members(
+        self, project_id: int, upserts: Iterable[tuple[int, str]], removed: Iterable[int]
+    ) -> None:
+        """
+        Изменения состава одной транзакцией: участники removed удаляются, пары upserts
+        (employee_id, role) добавляются или меняют роль. Прочие участники не затрагиваются —
+        в том числе добавленные другими пользователями после чтения состава.
+        """
+        roles = dict(upserts)
+        removed_ids = [employee_id for employee_id in dict.fromkeys(removed) if employee_id not in roles]
+        statements: list[tuple[str, tuple[Any, ...]]] = []
+        for start in range(0, len(removed_ids), _CHUNK):
+            chunk = removed_ids[start : start + _CHUNK]
+            statements.append(
+                (
+                    "DELETE FROM project_members WHERE project_id=%s "
+                    f"AND employee_id IN ({', '.join(['%s'] * len(chunk))})",
+                    (project_id, *chunk),
+                )
+            )
+        statements += self._upsert_statements(project_id, roles)
+        if statements:
+            self._execute_in_transaction(statements)
+
+    def _upsert_statements(self, project_id: int, roles: dict[int, str]) -> list[tuple[str, tuple[Any, ...]]]:
+        rows = [self._member_row(project_id, employee_id, role) for employee_id, role in roles.items()]
+        statements = []
+        for start in range(0, len(rows), _CHUNK):
+            chunk = rows[start : start + _CHUNK]
+            statements.append(
+                (
+                    "INSERT INTO project_members (project_id, employee_id, role, since_date) "
+                    f"VALUES {', '.join([self._MEMBER_VALUES] * len(chunk))} {self._MEMBER_UPSERT}",
+                    tuple(v for row in chunk for v in row),
+                )
+            )
+        return statements
 
+    def _member_row(self, project_id: int, employee_id: int, role: str) -> tuple[Any, ...]:
+        return (project_id, employee_id, role)
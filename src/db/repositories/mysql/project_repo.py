@@ -1,13 +1,25 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping, Optional
 
 from src.core.entities import Project
-from src.db.repositories.base import IRepository
-from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
+from src.db.hydration import Hydrator
+from src.db.repositories.base import ChangeSet, IRepository, Page, PageKey
+from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository, SortSpec
+
+
+# Столбцы SELECT идут в порядке полей Project
+_PROJECT = Hydrator(Project)
 
 
 class ProjectRepositoryMySql(BaseMySqlRepository, IRepository[Project]):
+    # Тот же порядок, что и в list_all: start_date DESC, id DESC
+    _PAGE_SORTS: dict[str, SortSpec] = {
+        "default": (("p.start_date", "start_date", True), ("p.id", "id", True)),
+        "id": (("p.id", "id", True),),
+    }
+
     def get_by_id(self, entity_id: int) -> Optional[Project]:
         cur = self._execute(
             """
@@ -16,9 +28,22 @@ class ProjectRepositoryMySql(BaseMySqlRepository, IRepository[Project]):
             WHERE id=%s
             """,
             (entity_id,),
+            tuples=True,
         )
         row = cur.fetchone()
-        return None if row is None else Project(**row)
+        return None if row is None else _PROJECT(row)
+
+    def get_many(self, ids: Iterable[int], *, ordered: bool = False) -> list[Project]:
+        rows = self._fetch_by_ids(
+            """
+            SELECT id, client_id, name, description, start_date, end_date, status
+            FROM projects
+            """,
+            ids,
+            tuples=True,
+            ordered=ordered,
+        )
+        return _PROJECT.all(rows)
 
     def list_all(self) -> list[Project]:
         cur = self._execute(
@@ -26,9 +51,34 @@ class ProjectRepositoryMySql(BaseMySqlRepository, IRepository[Project]):
             SELECT id, client_id, name, description, start_date, end_date, status
             FROM projects
             ORDER BY start_date DESC, id DESC
+            """,
+            tuples=True,
+        )
+        return _PROJECT.all(cur.fetchall())
+
+    def iter_all(self) -> Iterator[Project]:
+        rows = self._stream(
+            """
+            SELECT id, client_id, name, description, start_date, end_date, status
+            FROM projects
+            ORDER BY start_date DESC, id DESC
+            """,
+            tuples=True,
+        )
+        yield from map(_PROJECT, rows)
+
+    def list_page(self, after_key: Optional[PageKey] = None, limit: int = 100, sort: str = "default") -> Page[Project]:
+        rows, next_key = self._fetch_page(
             """
+            SELECT p.id, p.client_id, p.name, p.description, p.start_date, p.end_date, p.status
+            FROM projects p
+            """,
+            self._resolve_sort(self._PAGE_SORTS, sort),
+            after_key,
+            limit,
+            tuples=True,
         )
-        return [Project(**row) for row in cur.fetchall()]
+        return Page(_PROJECT.all(rows), next_key)
 
     def list_all_with_client_name(self) -> list[dict]:
         cur = self._execute(
@@ -41,6 +91,35 @@ class ProjectRepositoryMySql(BaseMySqlRepository, IRepository[Project]):
         )
         return list(cur.fetchall())
 
+    def list_page_with_client_name(
+        self, after_key: Optional[PageKey] = None, limit: int = 100, sort: str = "default"
+    ) -> Page[dict]:
+        rows, next_key = self._fetch_page(
+            """
+            SELECT p.id, p.name, c.name AS client_name, p.start_date, p.end_date, p.status
+            FROM projects p
+            JOIN clients c ON c.id = p.client_id
+            """,
+            self._resolve_sort(self._PAGE_SORTS, sort),
+            after_key,
+            limit,
+        )
+        return Page(rows, next_key)
+
+    def list_changed_since(self, since: datetime) -> ChangeSet[Project]:
+        as_of = self.server_now()
+        cur = self._execute(
+            """
+            SELECT id, client_id, name, description, start_date, end_date, status
+            FROM projects
+            WHERE updated_at>=%s
+            """,
+            (since,),
+            tuples=True,
+        )
+        changed = _PROJECT.all(cur.fetchall())
+        return ChangeSet(changed, self._deleted_since("projects", since), as_of)
+
     def create(self, entity: Project) -> int:
         cur = self._execute(
             """
@@ -58,6 +137,15 @@ class ProjectRepositoryMySql(BaseMySqlRepository, IRepository[Project]):
         )
         return int(cur.lastrowid)
 
+    def create_many(self, entities: list[Project]) -> int:
+        return self._executemany(
+            """
+            INSERT INTO projects (client_id, name, description, start_date, end_date, status)
+            VALUES (%s,%s,%s,%s,%s,%s)
+            """,
+            [(e.client_id, e.name, e.description, e.start_date, e.end_date, e.status) for e in entities],
+        )
+
     def update(self, entity: Project) -> None:
         assert entity.id is not None
         self._execute(
@@ -77,6 +165,15 @@ class ProjectRepositoryMySql(BaseMySqlRepository, IRepository[Project]):
             ),
         )
 
+    def update_fields(self, entity_id: int, changes: Mapping[str, Any]) -> None:
+        """Записать только изменённые поля (см. ChangeTracker.diff)."""
+        self._update_columns(
+            "projects",
+            entity_id,
+            changes,
+            ("client_id", "name", "description", "start_date", "end_date", "status"),
+        )
+
     def delete(self, entity_id: int) -> None:
         self._execute("DELETE FROM projects WHERE id=%s", (entity_id,))
 
@@ -1,77 +1,212 @@
 from __future__ import annotations
 
+from datetime import date
+from typing import Any, Iterable, Iterator, Optional
+
+from mysql.connector import errorcode
+
+from src.core.errors import DatabaseError
 from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
 
 
+_PROJECTS_BY_CLIENT_SQL = """
+    SELECT p.id, p.name, p.start_date, p.end_date, p.status
+    FROM projects p
+    WHERE p.client_id=%s
+    ORDER BY p.start_date DESC, p.id DESC
+"""
+
+# Незавершённые задачи — IN по открытым статусам, а не NOT IN: так MySQL берёт диапазоны
+# индекса idx_tasks_status_due (status, due_date, project_id) вместо полного просмотра
+_OVERDUE_PROJECTS_SQL = """
+    SELECT
+      p.id,
+      p.name,
+      c.name AS client_name,
+      MIN(t.due_date) AS first_overdue_due_date,
+      COUNT(*) AS overdue_tasks
+    FROM projects p
+    JOIN clients c ON c.id = p.client_id
+    JOIN tasks t ON t.project_id = p.id
+    WHERE t.due_date < CURRENT_DATE
+      AND t.status IN ('New','InProgress')
+    GROUP BY p.id, p.name, c.name
+    ORDER BY first_overdue_due_date ASC, overdue_tasks DESC
+"""
+
+_OVERDUE_SUMMARY_SQL = """
+    SELECT
+      p.id,
+      p.name,
+      c.name AS client_name,
+      s.first_overdue_due_date,
+      s.overdue_tasks
+    FROM project_overdue_summary s
+    JOIN projects p ON p.id = s.project_id
+    JOIN clients c ON c.id = p.client_id
+    ORDER BY s.first_overdue_due_date ASC, s.overdue_tasks DESC
+"""
+
+# {cutoff} — граница просрочки, {projects} — необязательный фильтр по проектам
+_OVERDUE_SUMMARY_FILL = """
+    INSERT INTO project_overdue_summary (project_id, overdue_tasks, first_overdue_due_date)
+    SELECT t.project_id, COUNT(*), MIN(t.due_date)
+    FROM tasks t
+    WHERE t.due_date < {cutoff}
+      AND t.status IN ('New','InProgress')
+      {projects}
+    GROUP BY t.project_id
+"""
+
+_OVERDUE_SUMMARY = "project_overdue_summary"
+
+_EMPLOYEES_BY_PROJECT_SQL = """
+    SELECT
+      e.id AS employee_id,
+      CONCAT(e.last_name, ' ', e.first_name, IFNULL(CONCAT(' ', e.middle_name), '')) AS employee_name,
+      e.position,
+      pm.role,
+      pm.since_date
+    FROM project_members pm
+    JOIN employees e ON e.id = pm.employee_id
+    WHERE pm.project_id=%s
+    ORDER BY e.last_name, e.first_name
+"""
+
+_EMPLOYEE_WORKLOAD_SQL = """
+    SELECT
+      p.id AS project_id,
+      p.name AS project_name,
+      t.id AS task_id,
+      t.title AS task_title,
+      t.due_date,
+      t.status
+    FROM tasks t
+    JOIN projects p ON p.id = t.project_id
+    WHERE t.employee_id=%s
+      AND t.status IN ('New','InProgress')
+    ORDER BY t.due_date ASC, t.id DESC
+"""
+
+# Недели — с понедельника (DATE_SUB ... WEEKDAY), границы периода — понедельники.
+# Группировка по задачам идёт в подзапросе, имена сотрудников присоединяются к готовым ячейкам.
+_WORKLOAD_HEATMAP_SQL = """
+    SELECT
+      w.employee_id,
+      CONCAT(e.last_name, ' ', e.first_name, IFNULL(CONCAT(' ', e.middle_name), '')) AS employee_name,
+      w.week_start,
+      w.active_tasks,
+      w.overdue_tasks
+    FROM (
+      SELECT
+        t.employee_id,
+        DATE_SUB(t.due_date, INTERVAL WEEKDAY(t.due_date) DAY) AS week_start,
+        COUNT(*) AS active_tasks,
+        COUNT(CASE WHEN t.due_date < CURRENT_DATE THEN 1 END) AS overdue_tasks
+      FROM tasks t
+      WHERE t.status IN ('New','InProgress')
+        AND t.employee_id IS NOT NULL
+        AND t.due_date >= %s
+        AND t.due_date < %s
+      GROUP BY t.employee_id, week_start
+    ) w
+    JOIN employees e ON e.id = w.employee_id
+    ORDER BY e.last_name, e.first_name, w.employee_id, w.week_start
+"""
+
+
 class ReportRepositoryMySql(BaseMySqlRepository):
+    # Ключи совпадают с именами методов-отчётов
+    _REPORTS = {
+        "projects_by_client": _PROJECTS_BY_CLIENT_SQL,
+        "overdue_projects": _OVERDUE_PROJECTS_SQL,
+        "employees_by_project": _EMPLOYEES_BY_PROJECT_SQL,
+        "employee_workload": _EMPLOYEE_WORKLOAD_SQL,
+    }
+
     def projects_by_client(self, client_id: int) -> list[dict]:
-        cur = self._execute(
-            """
-            SELECT p.id, p.name, p.start_date, p.end_date, p.status
-            FROM projects p
-            WHERE p.client_id=%s
-            ORDER BY p.start_date DESC, p.id DESC
-            """,
-            (client_id,),
-        )
+        cur = self._execute(_PROJECTS_BY_CLIENT_SQL, (client_id,))
         return list(cur.fetchall())
 
     def overdue_projects(self) -> list[dict]:
-        cur = self._execute(
-            """
-            SELECT
-              p.id,
-              p.name,
-              c.name AS client_name,
-              MIN(t.due_date) AS first_overdue_due_date,
-              COUNT(*) AS overdue_tasks
-            FROM projects p
-            JOIN clients c ON c.id = p.client_id
-            JOIN tasks t ON t.project_id = p.id
-            WHERE t.due_date < CURRENT_DATE
-              AND t.status NOT IN ('Done','Canceled')
-            GROUP BY p.id, p.name, c.name
-            ORDER BY first_overdue_due_date ASC, overdue_tasks DESC
-            """
-        )
+        cur = self._execute(_OVERDUE_PROJECTS_SQL)
         return list(cur.fetchall())
 
-    def employees_by_project(self, project_id: int) -> list[dict]:
-        cur = self._execute(
-            """
-            SELECT
-              e.id AS employee_id,
-              CONCAT(e.last_name, ' ', e.first_name, IFNULL(CONCAT(' ', e.middle_name), '')) AS employee_name,
-              e.position,
-              pm.role,
-              pm.since_date
-            FROM project_members pm
-            JOIN employees e ON e.id = pm.employee_id
-            WHERE pm.project_id=%s
-            ORDER BY e.last_name, e.first_name
-            """,
-            (project_id,),
+    # ---- сводка просроченных задач (sql/migrations/002_overdue_summary.sql) ----
+    def overdue_projects_summary(self) -> Optional[list[dict]]:
+        """
+        То же, что overdue_projects, но из сводной таблицы. Если сводка рассчитана
+        на прошлую дату, сначала пересчитывается целиком (раз в сутки).
+        None — сводной таблицы нет (миграция не применена).
+        """
+        try:
+            state = self._execute(
+                "SELECT CURRENT_DATE AS today, (SELECT as_of FROM summary_state WHERE name=%s) AS as_of",
+                (_OVERDUE_SUMMARY,),
+            ).fetchone()
+            if state["as_of"] is None or state["as_of"] < state["today"]:
+                self.rebuild_overdue_summary(state["today"])
+            return list(self._execute(_OVERDUE_SUMMARY_SQL).fetchall())
+        except DatabaseError as e:
+            if _is_missing_table(e):
+                return None
+            raise
+
+    def rebuild_overdue_summary(self, today: date) -> None:
+        self._execute_in_transaction(
+            [
+                ("DELETE FROM project_overdue_summary", ()),
+                (_OVERDUE_SUMMARY_FILL.format(cutoff="%s", projects=""), (today,)),
+                (
+                    "INSERT INTO summary_state (name, as_of) VALUES (%s, %s) AS new "
+                    "ON DUPLICATE KEY UPDATE as_of=new.as_of",
+                    (_OVERDUE_SUMMARY, today),
+                ),
+            ]
         )
+
+    def refresh_overdue_summary(self, project_ids: Iterable[int]) -> None:
+        """Пересчёт строк сводки только для указанных проектов (после изменения их задач)."""
+        ids = tuple(sorted({int(pid) for pid in project_ids}))
+        if not ids:
+            return
+        placeholders = ", ".join(["%s"] * len(ids))
+        try:
+            self._execute_in_transaction(
+                [
+                    (f"DELETE FROM project_overdue_summary WHERE project_id IN ({placeholders})", ids),
+                    (
+                        _OVERDUE_SUMMARY_FILL.format(
+                            cutoff="CURRENT_DATE", projects=f"AND t.project_id IN ({placeholders})"
+                        ),
+                        ids,
+                    ),
+                ]
+            )
+        except DatabaseError as e:
+            if not _is_missing_table(e):
+                raise
+
+    def employees_by_project(self, project_id: int) -> list[dict]:
+        cur = self._execute(_EMPLOYEES_BY_PROJECT_SQL, (project_id,))
         return list(cur.fetchall())
 
     def employee_workload(self, employee_id: int) -> list[dict]:
-        cur = self._execute(
-            """
-            SELECT
-              p.id AS project_id,
-              p.name AS project_name,
-              t.id AS task_id,
-              t.title AS task_title,
-              t.due_date,
-              t.status
-            FROM tasks t
-            JOIN projects p ON p.id = t.project_id
-            WHERE t.employee_id=%s
-              AND t.status IN ('New','InProgress')
-            ORDER BY t.due_date ASC, t.id DESC
-            """,
-            (employee_id,),
-        )
+        cur = self._execute(_EMPLOYEE_WORKLOAD_SQL, (employee_id,))
         return list(cur.fetchall())
 
+    def workload_heatmap(self, week_from: date, week_to: date) -> list[dict]:
+        cur = self._execute(_WORKLOAD_HEATMAP_SQL, (week_from, week_to))
+        return list(cur.fetchall())
+
+    def iter_report(self, report: str, params: tuple[Any, ...] = ()) -> Iterator[dict]:
+        """Потоковое чтение отчёта по ключу (для выгрузки без загрузки всего результата в память)."""
+        try:
+            sql = self._REPORTS[report]
+        except KeyError:
+            raise ValueError(f"Неизвестный отчёт: {report}") from None
+        return self._stream(sql, params)
+
 
+def _is_missing_table(e: DatabaseError) -> bool:
+    return getattr(e.__cause__, "errno", None) == errorcode.ER_NO_SUCH_TABLE
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from mysql.connector import errorcode
+
+from src.core.errors import DatabaseError
+from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
+
+
+# Ветка UNION по каждому виду записей: (kind, id, title, detail, score).
+# Каждая ветка сама отбирает лучшие offset+limit строк по индексу FULLTEXT,
+# внешний запрос только сливает их.
+_BRANCHES: dict[str, str] = {
+    "task": """
+        (SELECT 'task' AS kind, t.id, t.title, p.name AS detail,
+                MATCH(t.title, t.description) AGAINST (%s IN BOOLEAN MODE) AS score
+         FROM tasks t
+         JOIN projects p ON p.id = t.project_id
+         WHERE MATCH(t.title, t.description) AGAINST (%s IN BOOLEAN MODE)
+         ORDER BY score DESC
+         LIMIT %s)
+    """,
+    "project": """
+        (SELECT 'project' AS kind, p.id, p.name AS title, c.name AS detail,
+                MATCH(p.name, p.description) AGAINST (%s IN BOOLEAN MODE) AS score
+         FROM projects p
+         JOIN clients c ON c.id = p.client_id
+         WHERE MATCH(p.name, p.description) AGAINST (%s IN BOOLEAN MODE)
+         ORDER BY score DESC
+         LIMIT %s)
+    """,
+    "client": """
+        (SELECT 'client' AS kind, c.id, c.name AS title, LEFT(c.note, 100) AS detail,
+                MATCH(c.name, c.note) AGAINST (%s IN BOOLEAN MODE) AS score
+         FROM clients c
+         WHERE MATCH(c.name, c.note) AGAINST (%s IN BOOLEAN MODE)
+         ORDER BY score DESC
+         LIMIT %s)
+    """,
+}
+
+SEARCH_KINDS = tuple(_BRANCHES)
+
+
+class SearchRepositoryMySql(BaseMySqlRepository):
+    def search(self, query: str, kinds: Iterable[str] = SEARCH_KINDS, limit: int = 50, offset: int = 0) -> list[dict]:
+        """
+        Полнотекстовый поиск (MATCH ... AGAINST в BOOLEAN MODE, `query` — уже в синтаксисе
+        MySQL) по индексам миграции 003. Строки отсортированы по убыванию релевантности.
+        """
+        kinds = [k for k in SEARCH_KINDS if k in set(kinds)]
+        if not kinds:
+            return []
+        params: list[object] = []
+        for _ in kinds:
+            params += [query, query, offset + limit]
+        sql = (
+            " UNION ALL ".join(_BRANCHES[k] for k in kinds)
+            + " ORDER BY score DESC, kind, id LIMIT %s OFFSET %s"
+        )
+        try:
+            cur = self._execute(sql, (*params, limit, offset))
+        except DatabaseError as e:
+            if _is_missing_fulltext(e):
+                raise DatabaseError(
+                    "Нет полнотекстовых индексов для поиска: примените sql/migrations/003_fulltext_search.sql."
+                ) from e
+            raise
+        return list(cur.fetchall())
+
+
+def _is_missing_fulltext(e: DatabaseError) -> bool:
+    return getattr(e.__cause__, "errno", None) == errorcode.ER_FT_MATCHING_KEY_NOT_FOUND
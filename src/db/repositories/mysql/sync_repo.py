@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Optional
+
+import mysql.connector
+
+from src.core.errors import DatabaseError
+from src.db.connection import DbConnection
+from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
+from src.db.repositories.mysql.report_repo import ReportRepositoryMySql
+
+
+# Таблицы локальной копии в порядке внешних ключей (родители раньше детей) и их столбцы
+# без id и updated_at. created_at задаёт сервер: он только загружается, но не отправляется.
+SYNC_TABLES: dict[str, tuple[str, ...]] = {
+    "clients": ("name", "phone", "email", "note"),
+    "employees": ("last_name", "first_name", "middle_name", "position", "phone", "email", "is_active"),
+    "projects": ("client_id", "name", "description", "start_date", "end_date", "status"),
+    "tasks": ("project_id", "employee_id", "title", "description", "created_at", "due_date", "completed_at", "status"),
+}
+SERVER_COLUMNS = frozenset({"created_at"})
+
+# Результат отправки изменения с проверкой версии
+APPLIED, CONFLICT, MISSING = "applied", "conflict", "missing"
+
+_MEMBER_SELECT = "SELECT project_id, employee_id, role, since_date FROM project_members"
+# id проектов в одном WHERE project_id IN (...)
+_PROJECTS_CHUNK = 500
+
+
+class SyncRepositoryMySql(BaseMySqlRepository):
+    """
+    Серверная сторона синхронизации локальной копии (src/services/sync_service.py).
+
+    Запись задачи и пересчёт строк сводки просроченных её проектов (старого и нового) —
+    одна транзакция, как в TaskService.
+    """
+
+    def __init__(self, db: DbConnection):
+        super().__init__(db)
+        self._reports = ReportRepositoryMySql(db)
+
+    def iter_changed(self, table: str, since: Optional[datetime]) -> Iterator[tuple]:
+        """Строки (id, столбцы SYNC_TABLES..., updated_at), изменённые с `since`; None — все."""
+        sql = f"SELECT id, {', '.join(SYNC_TABLES[table])}, updated_at FROM {table}"
+        if since is None:
+            return self._stream(sql, tuples=True)
+        return self._stream(f"{sql} WHERE updated_at>=%s", (since,), tuples=True)
+
+    def deleted_since(self, table: str, since: datetime) -> list[int]:
+        return self._deleted_since(table, since)
+
+    def get_row(self, table: str, row_id: int) -> Optional[tuple]:
+        cur = self._execute(
+            f"SELECT id, {', '.join(SYNC_TABLES[table])}, updated_at FROM {table} WHERE id=%s",
+            (row_id,),
+            tuples=True,
+        )
+        return cur.fetchone()
+
+    def list_members(self, project_ids: Optional[Iterable[int]] = None) -> list[tuple]:
+        """Участники (project_id, employee_id, role, since_date): все или только проектов `project_ids`."""
+        if project_ids is None:
+            return self._execute(_MEMBER_SELECT, tuples=True).fetchall()
+        ids = sorted(set(project_ids))
+        rows: list[tuple] = []
+        for start in range(0, len(ids), _PROJECTS_CHUNK):
+            chunk = tuple(ids[start : start + _PROJECTS_CHUNK])
+            sql = f"{_MEMBER_SELECT} WHERE project_id IN ({', '.join(['%s'] * len(chunk))})"
+            rows += self._execute(sql, chunk, tuples=True).fetchall()
+        return rows
+
+    def members_changed_since(self, since: datetime) -> list[tuple]:
+        """
+        Участники, добавленные или сменившие роль с `since` (миграция 005). Удаления —
+        deleted_since("project_members", ...): id проектов, состав которых сверить целиком.
+        """
+        return self._execute(f"{_MEMBER_SELECT} WHERE updated_at>=%s", (since,), tuples=True).fetchall()
+
+    def _version(self, table: str, row_id: int) -> Optional[datetime]:
+        row = self._execute(f"SELECT updated_at FROM {table} WHERE id=%s", (row_id,)).fetchone()
+        return None if row is None else row["updated_at"]
+
+    def _task_projects(self, table: str, row_id: int) -> list[int]:
+        """Проект задачи до записи: его строку сводки просроченных тоже пересчитать."""
+        if table != "tasks":
+            return []
+        row = self._execute("SELECT project_id FROM tasks WHERE id=%s", (row_id,)).fetchone()
+        return [] if row is None else [row["project_id"]]
+
+    def _refresh_overdue(self, table: str, project_ids: list[int]) -> None:
+        if table == "tasks":
+            self._reports.refresh_overdue_summary(project_ids)
+
+    def insert(self, table: str, values: dict[str, Any]) -> tuple[int, datetime]:
+        """Новая строка; возвращает id, выданный сервером, и её версию."""
+        columns = [c for c in SYNC_TABLES[table] if c not in SERVER_COLUMNS]
+        with self.transaction():
+            cur = self._execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                tuple(values[c] for c in columns),
+            )
+            row_id = int(cur.lastrowid)
+            version = self._version(table, row_id)
+            self._refresh_overdue(table, [values["project_id"]] if table == "tasks" else [])
+        assert version is not None
+        return row_id, version
+
+    def update(
+        self, table: str, row_id: int, values: dict[str, Any], version: Optional[datetime]
+    ) -> tuple[str, Optional[datetime]]:
+        """
+        UPDATE, только если строка на сервере не новее `version` (её updated_at при загрузке).
+        Возвращает (APPLIED | CONFLICT | MISSING, версия строки на сервере).
+        """
+        columns = [c for c in SYNC_TABLES[table] if c not in SERVER_COLUMNS]
+        sql = f"UPDATE {table} SET {', '.join(f'{c}=%s' for c in columns)} WHERE id=%s"
+        params: tuple[Any, ...] = (*(values[c] for c in columns), row_id)
+        if version is not None:
+            sql += " AND updated_at<=%s"
+            params += (version,)
+        with self.transaction():
+            old_projects = self._task_projects(table, row_id)
+            changed = self._execute(sql, params).rowcount
+            current = self._version(table, row_id)
+            if changed:
+                self._refresh_overdue(table, old_projects + [values["project_id"]])
+        if current is None:
+            return MISSING, None
+        # rowcount 0 и при совпадении значений: тогда версия на сервере не новее нашей
+        if changed or version is None or current <= version:
+            return APPLIED, current
+        return CONFLICT, current
+
+    def delete(self, table: str, row_id: int, version: Optional[datetime]) -> str:
+        """DELETE с той же проверкой версии; уже удалённая строка — не конфликт."""
+        sql, params = f"DELETE FROM {table} WHERE id=%s", (row_id,)
+        if version is not None:
+            sql += " AND updated_at<=%s"
+            params += (version,)
+        with self.transaction():
+            old_projects = self._task_projects(table, row_id)
+            if self._execute(sql, params).rowcount:
+                self._refresh_overdue(table, old_projects)
+                return APPLIED
+            return APPLIED if self._version(table, row_id) is None else CONFLICT
+
+    def add_member(self, project_id: int, employee_id: int, role: str, since_date: date) -> None:
+        self._execute(
+            """
+            INSERT INTO project_members (project_id, employee_id, role, since_date)
+            VALUES (%s,%s,%s,%s) AS new
+            ON DUPLICATE KEY UPDATE role=new.role
+            """,
+            (project_id, employee_id, role, since_date),
+        )
+
+    def remove_member(self, project_id: int, employee_id: int) -> None:
+        self._execute(
+            "DELETE FROM project_members WHERE project_id=%s AND employee_id=%s",
+            (project_id, employee_id),
+        )
+
+
+def is_rejected(e: DatabaseError) -> bool:
+    """Сервер отклонил данные (внешний ключ, формат) — повтор не поможет, в отличие от обрыва связи."""
+    return isinstance(e.__cause__, (mysql.connector.errors.IntegrityError, mysql.connector.errors.DataError))
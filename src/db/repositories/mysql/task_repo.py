@@ -1,13 +1,48 @@
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Mapping, Optional
 
 from src.core.entities import Task
-from src.db.repositories.base import IRepository
-from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
+from src.db.hydration import Hydrator
+from src.db.repositories.base import ChangeSet, IRepository, Page, PageKey, TaskFilter
+from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository, SortSpec
+
+
+_VIEW_SELECT = """
+    SELECT
+      t.id,
+      p.name AS project_name,
+      CONCAT(e.last_name, ' ', e.first_name, IFNULL(CONCAT(' ', e.middle_name), '')) AS employee_name,
+      t.title,
+      t.due_date,
+      t.status
+    FROM tasks t
+    JOIN projects p ON p.id = t.project_id
+    LEFT JOIN employees e ON e.id = t.employee_id
+"""
+
+_TASK_SELECT = """
+    SELECT t.id, t.project_id, t.employee_id, t.title, t.description, t.created_at, t.due_date,
+           t.completed_at, t.status
+    FROM tasks t
+"""
+
+UNASSIGNED = "(не назначено)"
+
+# Столбцы SELECT идут в порядке полей Task
+_TASK = Hydrator(Task)
 
 
 class TaskRepositoryMySql(BaseMySqlRepository, IRepository[Task]):
+    # default — тот же порядок, что и в list_all: due_date ASC, id DESC
+    _PAGE_SORTS: dict[str, SortSpec] = {
+        "default": (("t.due_date", "due_date", False), ("t.id", "id", True)),
+        "due_desc": (("t.due_date", "due_date", True), ("t.id", "id", False)),
+        "title": (("t.title", "title", False), ("t.id", "id", False)),
+        "id": (("t.id", "id", True),),
+    }
+
     def get_by_id(self, entity_id: int) -> Optional[Task]:
         cur = self._execute(
             """
@@ -16,9 +51,13 @@ class TaskRepositoryMySql(BaseMySqlRepository, IRepository[Task]):
             WHERE id=%s
             """,
             (entity_id,),
+            tuples=True,
         )
         row = cur.fetchone()
-        return None if row is None else Task(**row)
+        return None if row is None else _TASK(row)
+
+    def get_many(self, ids: Iterable[int], *, ordered: bool = False) -> list[Task]:
+        return _TASK.all(self._fetch_by_ids(_TASK_SELECT, ids, tuples=True, ordered=ordered))
 
     def list_all(self) -> list[Task]:
         cur = self._execute(
@@ -26,11 +65,102 @@ class TaskRepositoryMySql(BaseMySqlRepository, IRepository[Task]):
             SELECT id, project_id, employee_id, title, description, created_at, due_date, completed_at, status
             FROM tasks
             ORDER BY due_date ASC, id DESC
+            """,
+            tuples=True,
+        )
+        return _TASK.all(cur.fetchall())
+
+    def iter_all(self) -> Iterator[Task]:
+        rows = self._stream(
             """
+            SELECT id, project_id, employee_id, title, description, created_at, due_date, completed_at, status
+            FROM tasks
+            ORDER BY due_date ASC, id DESC
+            """,
+            tuples=True,
+        )
+        yield from map(_TASK, rows)
+
+    def list_page(self, after_key: Optional[PageKey] = None, limit: int = 100, sort: str = "default") -> Page[Task]:
+        return self.query(TaskFilter(), sort, after_key, limit)
+
+    def query(
+        self,
+        filters: TaskFilter,
+        sort: str = "default",
+        after_key: Optional[PageKey] = None,
+        limit: int = 100,
+    ) -> Page[Task]:
+        """
+        Страница задач по условиям `filters` в порядке `sort` (ключи _PAGE_SORTS).
+        Условия и сортировка выполняются сервером по индексам tasks, клиент получает только страницу.
+        """
+        where, params = _filter_sql(filters)
+        rows, next_key = self._fetch_page(
+            _TASK_SELECT,
+            self._resolve_sort(self._PAGE_SORTS, sort),
+            after_key,
+            limit,
+            where=where,
+            params=params,
+            tuples=True,
         )
-        return [Task(**row) for row in cur.fetchall()]
+        return Page(_TASK.all(rows), next_key)
+
+    def iter_query(self, filters: TaskFilter, sort: str = "default") -> Iterator[Task]:
+        """Все задачи выборки query() потоком — для выгрузки."""
+        where, params = _filter_sql(filters)
+        order = self._resolve_sort(self._PAGE_SORTS, sort)
+        sql = _TASK_SELECT.rstrip()
+        if where:
+            sql += f"\nWHERE {where}"
+        sql += "\nORDER BY " + ", ".join(f"{e} {'DESC' if d else 'ASC'}" for e, _, d in order)
+        yield from map(_TASK, self._stream(sql, params, tuples=True))
 
     def list_all_with_names(self) -> list[dict]:
+        cur = self._execute(_VIEW_SELECT + "ORDER BY t.due_date ASC, t.id DESC")
+        rows = list(cur.fetchall())
+        for r in rows:
+            if r.get("employee_name") is None:
+                r["employee_name"] = UNASSIGNED
+        return rows
+
+    def iter_all_with_names(self) -> Iterator[dict]:
+        """То же, что list_all_with_names, но потоком — для выгрузки больших таблиц."""
+        for r in self._stream(_VIEW_SELECT + "ORDER BY t.due_date ASC, t.id DESC"):
+            if r.get("employee_name") is None:
+                r["employee_name"] = UNASSIGNED
+            yield r
+
+    def list_page_with_names(
+        self, after_key: Optional[PageKey] = None, limit: int = 100, sort: str = "default"
+    ) -> Page[dict]:
+        rows, next_key = self._fetch_page(_VIEW_SELECT, self._resolve_sort(self._PAGE_SORTS, sort), after_key, limit)
+        for r in rows:
+            if r.get("employee_name") is None:
+                r["employee_name"] = UNASSIGNED
+        return Page(rows, next_key)
+
+    def list_changed_since(self, since: datetime) -> ChangeSet[Task]:
+        as_of = self.server_now()
+        cur = self._execute(
+            """
+            SELECT id, project_id, employee_id, title, description, created_at, due_date, completed_at, status
+            FROM tasks
+            WHERE updated_at>=%s
+            """,
+            (since,),
+            tuples=True,
+        )
+        changed = _TASK.all(cur.fetchall())
+        return ChangeSet(changed, self._deleted_since("tasks", since), as_of)
+
+    def list_changed_with_names_since(self, since: datetime) -> ChangeSet[dict]:
+        """
+        Дельта для представления list_all_with_names: кроме изменённых задач
+        включает задачи, у которых переименовали проект или исполнителя.
+        """
+        as_of = self.server_now()
         cur = self._execute(
             """
             SELECT
@@ -40,17 +170,24 @@ class TaskRepositoryMySql(BaseMySqlRepository, IRepository[Task]):
               t.title,
               t.due_date,
               t.status
-            FROM tasks t
+            FROM (
+              SELECT id FROM tasks WHERE updated_at>=%s
+              UNION
+              SELECT t2.id FROM projects p2 JOIN tasks t2 ON t2.project_id = p2.id WHERE p2.updated_at>=%s
+              UNION
+              SELECT t3.id FROM employees e3 JOIN tasks t3 ON t3.employee_id = e3.id WHERE e3.updated_at>=%s
+            ) ch
+            JOIN tasks t ON t.id = ch.id
             JOIN projects p ON p.id = t.project_id
             LEFT JOIN employees e ON e.id = t.employee_id
-            ORDER BY t.due_date ASC, t.id DESC
-            """
+            """,
+            (since, since, since),
         )
         rows = list(cur.fetchall())
         for r in rows:
             if r.get("employee_name") is None:
-                r["employee_name"] = "(не назначено)"
-        return rows
+                r["employee_name"] = UNASSIGNED
+        return ChangeSet(rows, self._deleted_since("tasks", since), as_of)
 
     def create(self, entity: Task) -> int:
         cur = self._execute(
@@ -70,6 +207,18 @@ class TaskRepositoryMySql(BaseMySqlRepository, IRepository[Task]):
         )
         return int(cur.lastrowid)
 
+    def create_many(self, entities: list[Task]) -> int:
+        return self._executemany(
+            """
+            INSERT INTO tasks (project_id, employee_id, title, description, due_date, completed_at, status)
+            VALUES (%s,%s,%s,%s,%s,%s,%s)
+            """,
+            [
+                (e.project_id, e.employee_id, e.title, e.description, e.due_date, e.completed_at, e.status)
+                for e in entities
+            ],
+        )
+
     def update(self, entity: Task) -> None:
         assert entity.id is not None
         self._execute(
@@ -90,7 +239,38 @@ class TaskRepositoryMySql(BaseMySqlRepository, IRepository[Task]):
             ),
         )
 
+    def update_fields(self, entity_id: int, changes: Mapping[str, Any]) -> None:
+        """Записать только изменённые поля (см. ChangeTracker.diff)."""
+        self._update_columns(
+            "tasks",
+            entity_id,
+            changes,
+            ("project_id", "employee_id", "title", "description", "due_date", "completed_at", "status"),
+        )
+
     def delete(self, entity_id: int) -> None:
         self._execute("DELETE FROM tasks WHERE id=%s", (entity_id,))
 
 
+def _filter_sql(f: TaskFilter) -> tuple[str, tuple[Any, ...]]:
+    """Условие WHERE (без слова WHERE) и его параметры; пустой фильтр — пустая строка."""
+    conditions: list[str] = []
+    params: list[Any] = []
+    if f.statuses:
+        conditions.append(f"t.status IN ({', '.join(['%s'] * len(f.statuses))})")
+        params.extend(f.statuses)
+    if f.project_id is not None:
+        conditions.append("t.project_id=%s")
+        params.append(f.project_id)
+    if f.unassigned:
+        conditions.append("t.employee_id IS NULL")
+    elif f.employee_id is not None:
+        conditions.append("t.employee_id=%s")
+        params.append(f.employee_id)
+    if f.due_from is not None:
+        conditions.append("t.due_date>=%s")
+        params.append(f.due_from)
+    if f.due_to is not None:
+        conditions.append("t.due_date<=%s")
+        params.append(f.due_to)
+    return " AND ".join(conditions), tuple(params)
@@ -0,0 +1 @@
+"""SQLite repository implementations (same queries as mysql/, dialect-specific parts overridden)."""
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterator
+import re
+import sqlite3
+import time
+
+from src.core.errors import DatabaseError
+from src.db.repositories.mysql.base_mysql_repo import BaseMySqlRepository
+from src.db.sqlite_connection import SqliteConnection
+from src.db.statements import QueryResult
+
+
+_CONCAT = re.compile(r"\bCONCAT\(", re.I)
+
+
+def _split_args(sql: str, start: int) -> tuple[list[str], int]:
+    """Аргументы вызова с `start` (сразу за открывающей скобкой) и позиция за закрывающей."""
+    args: list[str] = []
+    depth, quote, begin = 0, "", start
+    for i in range(start, len(sql)):
+        ch = sql[i]
+        if quote:
+            if ch == quote:
+                quote = ""
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")" and depth:
+            depth -= 1
+        elif ch == ")" or (ch == "," and not depth):
+            args.append(sql[begin:i].strip())
+            begin = i + 1
+            if ch == ")":
+                return args, i + 1
+    raise ValueError(f"Незакрытая скобка в запросе: {sql[start - 7:start + 40]!r}")
+
+
+def _concat_to_pipes(sql: str) -> str:
+    # CONCAT(a, b) MySQL -> (a || b): || в SQLite так же даёт NULL, если NULL хоть один аргумент
+    m = _CONCAT.search(sql)
+    if m is None:
+        return sql
+    args, end = _split_args(sql, m.end())
+    joined = " || ".join(_concat_to_pipes(a) for a in args)
+    return f"{sql[:m.start()]}({joined}){_concat_to_pipes(sql[end:])}"
+
+
+@lru_cache(maxsize=1024)
+def _sql(query: str) -> str:
+    """Запрос репозитория MySQL -> SQLite: параметры %s -> ?, CONCAT -> ||. Переводится один раз на текст."""
+    return _concat_to_pipes(query).replace("%s", "?")
+
+
+def _read(cur: sqlite3.Cursor, tuples: bool) -> QueryResult:
+    if cur.description is None:
+        return QueryResult([], cur.rowcount, cur.lastrowid)
+    columns = tuple(d[0] for d in cur.description)
+    rows = cur.fetchall()
+    if not tuples:
+        rows = [dict(zip(columns, row)) for row in rows]
+    return QueryResult(rows, len(rows), cur.lastrowid, columns)
+
+
+class BaseSqliteRepository(BaseMySqlRepository):
+    """
+    Защищённые методы BaseMySqlRepository поверх sqlite3.
+
+    Репозитории SQLite наследуют запросы репозиториев MySQL (переносимый SQL) и
+    переопределяют только то, что зависит от диалекта. Этот класс ставится первым
+    в списке базовых, чтобы его _execute/_stream/... шли раньше MySQL-версий.
+    """
+
+    def __init__(self, db: SqliteConnection):
+        self._db = db
+
+    def _execute(self, query: str, params: tuple[Any, ...] = (), *, tuples: bool = False) -> QueryResult:
+        try:
+            with self._db.checkout() as conn, self._db.monitor.measure(query) as m:
+                result = _read(conn.execute(_sql(query), params), tuples)
+                m.rows = result.rowcount
+                return result
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Ошибка запроса к БД: {e}") from e
+
+    def _stream(
+        self, query: str, params: tuple[Any, ...] = (), batch_size: int = 1000, *, tuples: bool = False
+    ) -> Iterator[Any]:
+        try:
+            with self._db.checkout() as conn:
+                count, elapsed_ms, failed = 0, 0.0, True
+                cur = conn.cursor()
+                try:
+                    start = time.perf_counter()
+                    cur.execute(_sql(query), params)
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    failed = False
+                    columns = tuple(d[0] for d in cur.description or ())
+                    while True:
+                        rows = cur.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        count += len(rows)
+                        if tuples:
+                            yield from rows
+                        else:
+                            yield from (dict(zip(columns, row)) for row in rows)
+                finally:
+                    self._db.monitor.record(query, elapsed_ms, count, error=failed)
+                    cur.close()
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Ошибка запроса к БД: {e}") from e
+
+    def _executemany(self, query: str, rows: list[tuple[Any, ...]]) -> int:
+        if not rows:
+            return 0
+        try:
+            with self._db.transaction() as conn, self._db.monitor.measure(query) as m:
+                cur = conn.executemany(_sql(query), rows)
+                m.rows = cur.rowcount
+                return cur.rowcount
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Ошибка пакетной записи в БД: {e}") from e
+
+    def _execute_in_transaction(self, statements: list[tuple[str, tuple[Any, ...]]]) -> None:
+        try:
+            with self._db.transaction() as conn:
+                for query, params in statements:
+                    with self._db.monitor.measure(query) as m:
+                        m.rows = conn.execute(_sql(query), params).rowcount
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Ошибка запроса к БД: {e}") from e
+
+    def server_now(self) -> datetime:
+        # Метки updated_at/deleted_at пишутся в местном времени (sql/sqlite/schema.sql)
+        row = self._execute("SELECT datetime('now', 'localtime') AS \"now [DATETIME]\"").fetchone()
+        return row["now"]
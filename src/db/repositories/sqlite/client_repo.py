@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from src.db.repositories.mysql.client_repo import ClientRepositoryMySql
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+class ClientRepositorySqlite(BaseSqliteRepository, ClientRepositoryMySql):
+    """Запросы ClientRepositoryMySql переносимы как есть."""
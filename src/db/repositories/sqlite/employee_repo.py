@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from src.db.repositories.mysql.employee_repo import EmployeeRepositoryMySql
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+class EmployeeRepositorySqlite(BaseSqliteRepository, EmployeeRepositoryMySql):
+    """Запросы EmployeeRepositoryMySql переносимы как есть."""
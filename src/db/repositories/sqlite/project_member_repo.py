@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from src.db.repositories.mysql.project_member_repo import ProjectMemberRepositoryMySql
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+class ProjectMemberRepositorySqlite(BaseSqliteRepository, ProjectMemberRepositoryMySql):
+    # Роль перезаписывается, только если она другая: иначе UPDATE попал бы в очередь синхронизации
+    _MEMBER_VALUES = "(%s,%s,%s,%s)"
+    _MEMBER_UPSERT = (
+        "ON CONFLICT(project_id, employee_id) DO UPDATE SET role=excluded.role "
+        "WHERE project_members.role <> excluded.role"
+    )
+
+    def add_member(self, project_id: int, employee_id: int, role: str) -> None:
+        # CURRENT_DATE в SQLite — дата по UTC; дата участия — местная, как на сервере MySQL
+        self._execute(
+            """
+            INSERT INTO project_members (project_id, employee_id, role, since_date)
+            VALUES (%s,%s,%s,%s)
+            """,
+            (project_id, employee_id, role, date.today()),
+        )
+
+    def _member_row(self, project_id: int, employee_id: int, role: str) -> tuple[Any, ...]:
+        return (project_id, employee_id, role, date.today())
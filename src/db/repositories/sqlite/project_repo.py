@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from src.db.repositories.mysql.project_repo import ProjectRepositoryMySql
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+class ProjectRepositorySqlite(BaseSqliteRepository, ProjectRepositoryMySql):
+    """Запросы ProjectRepositoryMySql переносимы как есть."""
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Optional
+import json
+
+from src.db.repositories.mysql.sync_repo import SYNC_TABLES
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+# Предел id строк MySQL (INT): больше — id строки, ещё не отправленной на сервер
+LOCAL_ID_BASE = 2147483647
+
+# Запись строк с сервера: триггеры очереди (sql/sqlite/replica.sql) при этом молчат
+_BEGIN_APPLY = ("UPDATE sync_control SET applying=1", ())
+_END_APPLY = ("UPDATE sync_control SET applying=0", ())
+
+
+def is_local_id(row_id: int) -> bool:
+    return row_id > LOCAL_ID_BASE
+
+
+# Строки сервера не перезаписывают строки с неотправленными изменениями. Очередь проверяется
+# в той же транзакции, что и запись: правка, сделанная во время загрузки, не теряется.
+# Параметры условия — (table_name, row_id) или для участников (project_id, employee_id).
+_NOT_PENDING = "NOT EXISTS (SELECT 1 FROM sync_outbox WHERE table_name=%s AND row_id=%s)"
+_MEMBER_NOT_PENDING = (
+    "NOT EXISTS (SELECT 1 FROM sync_outbox WHERE table_name='project_members' AND row_id=%s AND key2=%s)"
+)
+
+
+def _upsert_sql(table: str) -> str:
+    columns = SYNC_TABLES[table]
+    return (
+        f"INSERT INTO {table} (id, {', '.join(columns)}) SELECT {', '.join(['%s'] * (len(columns) + 1))} "
+        f"WHERE {_NOT_PENDING} "
+        f"ON CONFLICT(id) DO UPDATE SET {', '.join(f'{c}=excluded.{c}' for c in columns)}"
+    )
+
+
+_SET_VERSION = (
+    "INSERT INTO sync_versions (table_name, row_id, version) VALUES (%s,%s,%s) "
+    "ON CONFLICT(table_name, row_id) DO UPDATE SET version=excluded.version"
+)
+_SET_SYNC_STATE = (
+    "INSERT INTO sync_state (table_name, as_of) VALUES (%s,%s) "
+    "ON CONFLICT(table_name) DO UPDATE SET as_of=excluded.as_of"
+)
+# id проектов в одном WHERE project_id IN (...) (replace_members)
+_MEMBER_PROJECTS_CHUNK = 500
+# Версия строки сервера — только если строка записана (см. _NOT_PENDING)
+_APPLY_VERSION = (
+    f"INSERT INTO sync_versions (table_name, row_id, version) SELECT %s,%s,%s WHERE {_NOT_PENDING} "
+    "ON CONFLICT(table_name, row_id) DO UPDATE SET version=excluded.version"
+)
+
+
+class ReplicaRepositorySqlite(BaseSqliteRepository):
+    """Локальная сторона синхронизации: очередь изменений, версии строк, применение строк сервера."""
+
+    # ---- очередь ----
+    def pending(self, limit: int = 500) -> list[dict]:
+        cur = self._execute(
+            "SELECT seq, table_name, row_id, key2, op, attempts FROM sync_outbox ORDER BY seq LIMIT %s",
+            (limit,),
+        )
+        return list(cur.fetchall())
+
+    def pending_count(self) -> int:
+        return int(self._execute("SELECT COUNT(*) AS n FROM sync_outbox").fetchone()["n"])
+
+    def done(self, seqs: Iterable[int]) -> None:
+        seqs = tuple(seqs)
+        if seqs:
+            self._execute(f"DELETE FROM sync_outbox WHERE seq IN ({', '.join(['%s'] * len(seqs))})", seqs)
+
+    def failed(self, seq: int, error: str) -> None:
+        self._execute("UPDATE sync_outbox SET attempts=attempts+1, last_error=%s WHERE seq=%s", (error, seq))
+
+    # ---- локальные строки и версии ----
+    def get_row(self, table: str, row_id: int) -> Optional[dict[str, Any]]:
+        cur = self._execute(f"SELECT id, {', '.join(SYNC_TABLES[table])} FROM {table} WHERE id=%s", (row_id,))
+        return cur.fetchone()
+
+    def get_member(self, project_id: int, employee_id: int) -> Optional[dict[str, Any]]:
+        cur = self._execute(
+            "SELECT role, since_date FROM project_members WHERE project_id=%s AND employee_id=%s",
+            (project_id, employee_id),
+        )
+        return cur.fetchone()
+
+    def version(self, table: str, row_id: int) -> Optional[datetime]:
+        cur = self._execute(
+            'SELECT version AS "version [DATETIME]" FROM sync_versions WHERE table_name=%s AND row_id=%s',
+            (table, row_id),
+        )
+        row = cur.fetchone()
+        return None if row is None else row["version"]
+
+    def set_version(self, table: str, row_id: int, version: datetime) -> None:
+        self._execute(_SET_VERSION, (table, row_id, version))
+
+    def remap(self, table: str, local_id: int, server_id: int, version: datetime) -> None:
+        """
+        Заменить локальный id отправленной строки на серверный. Ссылки в дочерних таблицах
+        меняются каскадом (ON UPDATE CASCADE), в очереди — здесь же; старый id уходит
+        в deleted_rows, чтобы открытые таблицы приложения убрали строку с ним.
+        """
+        statements = [
+            _BEGIN_APPLY,
+            (f"UPDATE {table} SET id=%s WHERE id=%s", (server_id, local_id)),
+            ("UPDATE sync_outbox SET row_id=%s WHERE table_name=%s AND row_id=%s", (server_id, table, local_id)),
+            ("INSERT INTO deleted_rows (table_name, row_id) VALUES (%s,%s)", (table, local_id)),
+            (_SET_VERSION, (table, server_id, version)),
+        ]
+        if table == "projects":
+            statements.append(
+                (
+                    "UPDATE sync_outbox SET row_id=%s WHERE table_name='project_members' AND row_id=%s",
+                    (server_id, local_id),
+                )
+            )
+        elif table == "employees":
+            statements.append(
+                (
+                    "UPDATE sync_outbox SET key2=%s WHERE table_name='project_members' AND key2=%s",
+                    (server_id, local_id),
+                )
+            )
+        statements.append(_END_APPLY)
+        self._execute_in_transaction(statements)
+
+    # ---- строки с сервера ----
+    def apply(self, table: str, rows: list[tuple], deleted_ids: Iterable[int] = (), as_of: Optional[datetime] = None) -> None:
+        """
+        Строки сервера (id, столбцы..., updated_at) и удалённые id — одной транзакцией,
+        кроме строк с неотправленными изменениями. `as_of` — время сервера, с которого
+        продолжится следующая загрузка.
+        """
+        upsert = _upsert_sql(table)
+        statements = [_BEGIN_APPLY]
+        for row in rows:
+            statements.append((upsert, (*row[:-1], table, row[0])))
+            statements.append((_APPLY_VERSION, (table, row[0], row[-1], table, row[0])))
+        for row_id in deleted_ids:
+            statements.append((f"DELETE FROM {table} WHERE id=%s AND {_NOT_PENDING}", (row_id, table, row_id)))
+            statements.append(
+                (
+                    f"DELETE FROM sync_versions WHERE table_name=%s AND row_id=%s AND {_NOT_PENDING}",
+                    (table, row_id, table, row_id),
+                )
+            )
+        if as_of is not None:
+            statements.append((_SET_SYNC_STATE, (table, as_of)))
+        statements.append(_END_APPLY)
+        self._execute_in_transaction(statements)
+
+    def replace_members(
+        self, rows: list[tuple], projects: Optional[Iterable[int]] = None, as_of: Optional[datetime] = None
+    ) -> int:
+        """
+        Участники проектов по строкам сервера (project_id, employee_id, role, since_date): строки
+        добавляются или меняют роль, а состав проектов `projects` (None — всех) сверяется
+        целиком — лишние участники удаляются. Пары с неотправленными изменениями не трогаются.
+        `as_of` — время сервера, с которого продолжится следующая загрузка.
+        Возвращает число отправленных в БД изменений.
+        """
+        select = "SELECT project_id, employee_id, role FROM project_members"
+        if projects is None:
+            local_rows = self._execute(select, tuples=True).fetchall()
+        else:
+            projects = set(projects)
+            ids = sorted(projects | {r[0] for r in rows})
+            local_rows = []
+            for start in range(0, len(ids), _MEMBER_PROJECTS_CHUNK):
+                chunk = tuple(ids[start : start + _MEMBER_PROJECTS_CHUNK])
+                sql = f"{select} WHERE project_id IN ({', '.join(['%s'] * len(chunk))})"
+                local_rows += self._execute(sql, chunk, tuples=True).fetchall()
+        local = {(r[0], r[1]): r[2] for r in local_rows}
+        remote = {(r[0], r[1]): r for r in rows}
+        statements = [_BEGIN_APPLY]
+        for key in local.keys() - remote.keys():
+            if projects is not None and key[0] not in projects:
+                continue
+            statements.append(
+                (
+                    f"DELETE FROM project_members WHERE project_id=%s AND employee_id=%s AND {_MEMBER_NOT_PENDING}",
+                    (*key, *key),
+                )
+            )
+        for key, row in remote.items():
+            if local.get(key) != row[2]:
+                statements.append(
+                    (
+                        "INSERT INTO project_members (project_id, employee_id, role, since_date) "
+                        f"SELECT %s,%s,%s,%s WHERE {_MEMBER_NOT_PENDING} "
+                        "ON CONFLICT(project_id, employee_id) DO UPDATE SET role=excluded.role",
+                        (*row, *key),
+                    )
+                )
+        changed = len(statements) - 1
+        if as_of is not None:
+            statements.append((_SET_SYNC_STATE, ("project_members", as_of)))
+        if len(statements) == 1:
+            return 0
+        statements.append(_END_APPLY)
+        self._execute_in_transaction(statements)
+        return changed
+
+    def sync_state(self, table: str) -> Optional[datetime]:
+        cur = self._execute('SELECT as_of AS "as_of [DATETIME]" FROM sync_state WHERE table_name=%s', (table,))
+        row = cur.fetchone()
+        return None if row is None else row["as_of"]
+
+    # ---- конфликты ----
+    def add_conflict(self, table: str, row_id: int, op: str, reason: str, local_values: Optional[dict] = None) -> None:
+        self._execute(
+            "INSERT INTO sync_conflicts (table_name, row_id, op, reason, local_values) VALUES (%s,%s,%s,%s,%s)",
+            (table, row_id, op, reason, None if local_values is None else json.dumps(local_values, default=str)),
+        )
+
+    def list_conflicts(self, limit: int = 100) -> list[dict]:
+        cur = self._execute(
+            "SELECT id, table_name, row_id, op, reason, local_values, created_at FROM sync_conflicts "
+            "ORDER BY id DESC LIMIT %s",
+            (limit,),
+        )
+        return list(cur.fetchall())
+
+    def conflict_count(self) -> int:
+        return int(self._execute("SELECT COUNT(*) AS n FROM sync_conflicts").fetchone()["n"])
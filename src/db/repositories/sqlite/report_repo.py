@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Optional
+
+from src.db.repositories.mysql.report_repo import ReportRepositoryMySql
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+# Вычисляемые даты приходят из SQLite текстом: тип задаётся псевдонимом "имя [DATE]".
+# CURRENT_DATE в SQLite — по UTC, поэтому «сегодня» — date('now', 'localtime').
+# Задачи группируются по проекту в подзапросе (по покрывающему индексу idx_tasks_status_due),
+# проекты и клиенты присоединяются к готовым строкам — втрое быстрее группировки после JOIN.
+_OVERDUE_PROJECTS_SQL = """
+    SELECT
+      p.id,
+      p.name,
+      c.name AS client_name,
+      o.first_overdue_due_date AS "first_overdue_due_date [DATE]",
+      o.overdue_tasks
+    FROM (
+      SELECT t.project_id, MIN(t.due_date) AS first_overdue_due_date, COUNT(*) AS overdue_tasks
+      FROM tasks t
+      WHERE t.due_date < date('now', 'localtime')
+        AND t.status IN ('New','InProgress')
+      GROUP BY t.project_id
+    ) o
+    JOIN projects p ON p.id = o.project_id
+    JOIN clients c ON c.id = p.client_id
+    ORDER BY o.first_overdue_due_date ASC, o.overdue_tasks DESC
+"""
+
+# Неделя — номер юлианского дня // 7: JDN, кратный 7, приходится на понедельник.
+# Число вместо строки date(...) на каждую задачу; в дату переводятся только готовые ячейки.
+_WORKLOAD_HEATMAP_SQL = """
+    SELECT
+      w.employee_id,
+      CONCAT(e.last_name, ' ', e.first_name, IFNULL(CONCAT(' ', e.middle_name), '')) AS employee_name,
+      date(w.week * 7 - 0.5) AS "week_start [DATE]",
+      w.active_tasks,
+      w.overdue_tasks
+    FROM (
+      SELECT
+        t.employee_id,
+        CAST(julianday(t.due_date) + 0.5 AS INTEGER) / 7 AS week,
+        COUNT(*) AS active_tasks,
+        COUNT(CASE WHEN t.due_date < date('now', 'localtime') THEN 1 END) AS overdue_tasks
+      FROM tasks t
+      WHERE t.status IN ('New','InProgress')
+        AND t.employee_id IS NOT NULL
+        AND t.due_date >= %s
+        AND t.due_date < %s
+      GROUP BY t.employee_id, week
+    ) w
+    JOIN employees e ON e.id = w.employee_id
+    ORDER BY e.last_name, e.first_name, w.employee_id, w.week
+"""
+
+
+class ReportRepositorySqlite(BaseSqliteRepository, ReportRepositoryMySql):
+    _REPORTS = {**ReportRepositoryMySql._REPORTS, "overdue_projects": _OVERDUE_PROJECTS_SQL}
+
+    def overdue_projects(self) -> list[dict]:
+        cur = self._execute(_OVERDUE_PROJECTS_SQL)
+        return list(cur.fetchall())
+
+    # Сводной таблицы просроченных в локальной БД нет: отчёт по idx_tasks_status_due
+    # на объёмах одного рабочего места считается быстрее, чем её поддержка.
+    def overdue_projects_summary(self) -> Optional[list[dict]]:
+        return None
+
+    def rebuild_overdue_summary(self, today: date) -> None:
+        pass
+
+    def refresh_overdue_summary(self, project_ids: Iterable[int]) -> None:
+        pass
+
+    def workload_heatmap(self, week_from: date, week_to: date) -> list[dict]:
+        cur = self._execute(_WORKLOAD_HEATMAP_SQL, (week_from, week_to))
+        return list(cur.fetchall())
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Iterable
+import re
+
+from src.db.repositories.mysql.search_repo import SEARCH_KINDS, SearchRepositoryMySql
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+# Ветки по индексам FTS5 из sql/sqlite/schema.sql: (kind, id, title, detail, score).
+# bm25() тем меньше, чем запись релевантнее, поэтому score — со знаком минус.
+# В SQLite у частей UNION не бывает своих ORDER BY/LIMIT — каждая ветка во вложенном SELECT.
+_BRANCHES: dict[str, str] = {
+    "task": """
+        SELECT * FROM (
+          SELECT 'task' AS kind, t.id, t.title, p.name AS detail, -bm25(tasks_fts) AS score
+          FROM tasks_fts
+          JOIN tasks t ON t.id = tasks_fts.rowid
+          JOIN projects p ON p.id = t.project_id
+          WHERE tasks_fts MATCH %s
+          ORDER BY score DESC
+          LIMIT %s)
+    """,
+    "project": """
+        SELECT * FROM (
+          SELECT 'project' AS kind, p.id, p.name AS title, c.name AS detail, -bm25(projects_fts) AS score
+          FROM projects_fts
+          JOIN projects p ON p.id = projects_fts.rowid
+          JOIN clients c ON c.id = p.client_id
+          WHERE projects_fts MATCH %s
+          ORDER BY score DESC
+          LIMIT %s)
+    """,
+    "client": """
+        SELECT * FROM (
+          SELECT 'client' AS kind, c.id, c.name AS title, substr(c.note, 1, 100) AS detail,
+                 -bm25(clients_fts) AS score
+          FROM clients_fts
+          JOIN clients c ON c.id = clients_fts.rowid
+          WHERE clients_fts MATCH %s
+          ORDER BY score DESC
+          LIMIT %s)
+    """,
+}
+
+_TERM = re.compile(r"\+?(\w+)(\*?)")
+
+
+def fts_query(boolean_query: str) -> str:
+    """Запрос BOOLEAN MODE MySQL (`+слово*` ...) -> запрос FTS5: все слова обязательны, * — префикс."""
+    return " ".join(f'"{word}"{star}' for word, star in _TERM.findall(boolean_query))
+
+
+class SearchRepositorySqlite(BaseSqliteRepository, SearchRepositoryMySql):
+    def search(self, query: str, kinds: Iterable[str] = SEARCH_KINDS, limit: int = 50, offset: int = 0) -> list[dict]:
+        kinds = [k for k in SEARCH_KINDS if k in set(kinds)]
+        match = fts_query(query)
+        if not kinds or not match:
+            return []
+        params: list[object] = []
+        for _ in kinds:
+            params += [match, offset + limit]
+        sql = (
+            " UNION ALL ".join(_BRANCHES[k] for k in kinds)
+            + " ORDER BY score DESC, kind, id LIMIT %s OFFSET %s"
+        )
+        cur = self._execute(sql, (*params, limit, offset))
+        return list(cur.fetchall())
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from src.db.repositories.mysql.task_repo import TaskRepositoryMySql
+from src.db.repositories.sqlite.base_sqlite_repo import BaseSqliteRepository
+
+
+class TaskRepositorySqlite(BaseSqliteRepository, TaskRepositoryMySql):
+    """Запросы TaskRepositoryMySql переносимы как есть (CONCAT переводится в || при выполнении, см. base_sqlite_repo._sql)."""
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterator
+import sqlite3
+import threading
+
+from src.config import SqliteConfig
+from src.core.errors import DatabaseError
+from src.db.instrumentation import QueryMonitor
+
+
+SCHEMA_FILE = Path(__file__).resolve().parents[2] / "sql" / "sqlite" / "schema.sql"
+# Очередь изменений и версии строк локальной копии MySQL ([database] backend = replica)
+REPLICA_SCHEMA_FILE = SCHEMA_FILE.with_name("replica.sql")
+
+# Подготовленных выражений на соединение (кэш модуля sqlite3, аналог statement_cache_size)
+_CACHED_STATEMENTS = 256
+
+# Даты хранятся текстом ISO 8601: так они сравниваются и сортируются как строки.
+# Столбцы, объявленные DATE/DATETIME (и псевдонимы "имя [DATE]"), читаются как date/datetime.
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(" "))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+
+
+def _open_connection(cfg: SqliteConfig) -> sqlite3.Connection:
+    try:
+        conn = sqlite3.connect(
+            cfg.path,
+            timeout=cfg.busy_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            isolation_level=None,  # autocommit, транзакции — явным BEGIN (как autocommit=True у MySQL)
+            check_same_thread=False,  # соединения всех потоков закрывает close()
+            cached_statements=_CACHED_STATEMENTS,
+        )
+        # WAL: чтение не блокируется записью, фоновые загрузки идут параллельно с сохранением
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={int(cfg.mmap_size)}")
+        return conn
+    except sqlite3.Error as e:
+        raise DatabaseError(f"Ошибка открытия БД SQLite {cfg.path}: {e}") from e
+
+
+def _tx_command(conn: sqlite3.Connection, sql: str) -> None:
+    try:
+        conn.execute(sql)
+    except sqlite3.Error as e:
+        raise DatabaseError(f"Ошибка транзакции ({sql}): {e}") from e
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+class SqliteConnection:
+    """
+    Локальная БД SQLite с тем же интерфейсом, что DbConnection (checkout, monitor, statements).
+
+    У каждого потока своё соединение с файлом: в режиме WAL читатели не ждут писателя,
+    а записи сериализует сам SQLite (ожидание блокировки — busy_timeout).
+    Схема (по умолчанию sql/sqlite/schema.sql) применяется при первом подключении.
+    """
+
+    def __init__(
+        self, cfg: SqliteConfig, monitor: QueryMonitor | None = None, schema: tuple[Path, ...] = (SCHEMA_FILE,)
+    ):
+        self._cfg = cfg
+        self._schema = schema
+        self.monitor = monitor or QueryMonitor()
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._schema_applied = False
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _open_connection(self._cfg)
+            with self._lock:
+                self._conns.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def connect(self) -> None:
+        conn = self._thread_connection()
+        with self._lock:
+            if self._schema_applied:
+                return
+            try:
+                for path in self._schema:
+                    conn.executescript(path.read_text(encoding="utf-8"))
+            except sqlite3.Error as e:
+                raise DatabaseError(f"Не удалось создать схему БД SQLite: {e}") from e
+            self._schema_applied = True
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            _close_quietly(conn)
+        # Соединения потоков закрыты: следующий checkout() откроет новые
+        self._local = threading.local()
+
+    def statements(self, conn: Any) -> None:
+        """Подготовленные выражения кэширует сам модуль sqlite3 (cached_statements)."""
+        return None
+
+    @contextmanager
+    def checkout(self) -> Iterator[sqlite3.Connection]:
+        """Соединение текущего потока."""
+        if not self._schema_applied:
+            self.connect()
+        yield self._thread_connection()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Явная транзакция соединения потока, как DbConnection.transaction(): один COMMIT
+        на все запросы блока, вложенный блок — SAVEPOINT. IMMEDIATE: блокировка записи
+        берётся сразу, а не при первом INSERT (иначе возможен отказ посреди транзакции).
+        """
+        with self.checkout() as conn:
+            depth = getattr(self._local, "depth", 0)
+            if depth:
+                name = f"sp{depth}"
+                _tx_command(conn, f"SAVEPOINT {name}")
+                self._local.depth = depth + 1
+                try:
+                    yield conn
+                except BaseException:
+                    # ROLLBACK TO оставляет точку сохранения открытой — её снимает RELEASE
+                    _tx_command(conn, f"ROLLBACK TO SAVEPOINT {name}")
+                    _tx_command(conn, f"RELEASE SAVEPOINT {name}")
+                    raise
+                else:
+                    _tx_command(conn, f"RELEASE SAVEPOINT {name}")
+                finally:
+                    self._local.depth = depth
+                return
+
+            _tx_command(conn, "BEGIN IMMEDIATE")
+            self._local.depth = 1
+            try:
+                yield conn
+            except BaseException:
+                self._local.depth = 0
+                if conn.in_transaction:
+                    _tx_command(conn, "ROLLBACK")
+                raise
+            self._local.depth = 0
+            _tx_command(conn, "COMMIT")
+
+    def __enter__(self) -> "SqliteConnection":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
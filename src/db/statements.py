@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+import mysql.connector
+from mysql.connector import errorcode
+
+
+@dataclass(slots=True)
+class QueryResult:
+    """
+    Результат запроса, уже полностью прочитанный с сервера (курсор к этому моменту закрыт
+    или возвращён в кэш). Повторяет ту часть интерфейса курсора, которой пользуются репозитории.
+    """
+
+    rows: list[Any]  # dict или кортежи (tuples=True)
+    rowcount: int
+    lastrowid: Optional[int]
+    columns: tuple[str, ...] = ()
+    _pos: int = 0
+
+    def fetchone(self) -> Optional[Any]:
+        if self._pos >= len(self.rows):
+            return None
+        row = self.rows[self._pos]
+        self._pos += 1
+        return row
+
+    def fetchall(self) -> list[Any]:
+        rows = self.rows[self._pos :]
+        self._pos = len(self.rows)
+        return rows
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.fetchall())
+
+
+def _read(cur: Any) -> QueryResult:
+    if cur.description is None:
+        return QueryResult([], cur.rowcount, cur.lastrowid)
+    rows = cur.fetchall()
+    return QueryResult(rows, cur.rowcount, cur.lastrowid, tuple(d[0] for d in cur.description))
+
+
+def execute_plain(conn: Any, query: str, params: tuple[Any, ...], *, tuples: bool = False) -> QueryResult:
+    """Выполнение без подготовленных выражений: курсор закрывается сразу после чтения результата."""
+    with closing(conn.cursor(dictionary=not tuples)) as cur:
+        cur.execute(query, params)
+        return _read(cur)
+
+
+class StatementCache:
+    """
+    Подготовленные на сервере выражения (prepared statements) одного соединения.
+
+    На каждый текст запроса держится свой курсор prepared=True: повторный вызов
+    того же запроса не разбирается сервером заново, передаются только параметры.
+    Курсоров не больше `max_size`; самый давно использованный закрывается (LRU).
+    """
+
+    def __init__(self, conn: Any, max_size: int = 64):
+        self._conn = conn
+        self._max_size = max_size
+        # (текст запроса, кортежи?) -> (тот же объект строки, курсор)
+        self._cursors: OrderedDict[tuple[str, bool], tuple[str, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def execute(self, query: str, params: tuple[Any, ...], *, tuples: bool = False) -> QueryResult:
+        try:
+            return self._execute(query, params, tuples)
+        except mysql.connector.Error as e:
+            # После переподключения сервер забывает подготовленные выражения — готовим заново.
+            if e.errno != errorcode.ER_UNKNOWN_STMT_HANDLER:
+                raise
+            self.clear()
+            return self._execute(query, params, tuples)
+
+    def _execute(self, query: str, params: tuple[Any, ...], tuples: bool) -> QueryResult:
+        key = (query, tuples)
+        entry = self._cursors.get(key)
+        if entry is None:
+            entry = (query, self._conn.cursor(prepared=True, dictionary=not tuples))
+            self._cursors[key] = entry
+            while len(self._cursors) > self._max_size:
+                _, (_, old) = self._cursors.popitem(last=False)
+                _close_cursor(old)
+        else:
+            self._cursors.move_to_end(key)
+
+        # Курсор сравнивает текст с предыдущим вызовом по ссылке — передаём сохранённую строку.
+        stored, cur = entry
+        try:
+            cur.execute(stored, params)
+            return _read(cur)
+        except BaseException:
+            # Курсор в неизвестном состоянии (например, недочитанный результат) — не переиспользуем
+            self.discard(key)
+            raise
+
+    def discard(self, key: tuple[str, bool]) -> None:
+        entry = self._cursors.pop(key, None)
+        if entry is not None:
+            _close_cursor(entry[1])
+
+    def clear(self) -> None:
+        cursors, self._cursors = self._cursors, OrderedDict()
+        for _, cur in cursors.values():
+            _close_cursor(cur)
+
+
+def _close_cursor(cur: Any) -> None:
+    try:
+        cur.close()
+    except mysql.connector.Error:
+        # Соединение могло быть уже закрыто: выражения освобождены сервером вместе с ним.
+        pass
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import fields
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Optional, TypeVar
+import threading
+
+
+T = TypeVar("T")
+
+
+class ChangeTracker:
+    """
+    Снимки сущностей в том виде, в каком они прочитаны из БД, по ключу (тип, id).
+
+    Снимок — кортеж значений полей (без копирования объекта). При сохранении diff()
+    сравнивает сущность со снимком и возвращает только изменённые столбцы: репозиторий
+    пишет их одним UPDATE ... SET, а неизменённая запись не пишется вовсе.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: dict[tuple[type, int], tuple[Any, ...]] = {}
+        self._getters: dict[type, tuple[tuple[str, ...], Callable[[Any], tuple[Any, ...]]]] = {}
+        self._lock = threading.Lock()
+
+    def _getter(self, cls: type) -> tuple[tuple[str, ...], Callable[[Any], tuple[Any, ...]]]:
+        entry = self._getters.get(cls)
+        if entry is None:
+            names = tuple(f.name for f in fields(cls))
+            entry = self._getters[cls] = (names, attrgetter(*names))
+        return entry
+
+    def track(self, entity: T) -> T:
+        if entity.id is not None:
+            _, values = self._getter(type(entity))
+            with self._lock:
+                self._snapshots[(type(entity), entity.id)] = values(entity)
+        return entity
+
+    def track_all(self, entities: Iterable[T]) -> list[T]:
+        entities = list(entities)
+        if entities:
+            _, values = self._getter(type(entities[0]))
+            with self._lock:
+                for e in entities:
+                    if e.id is not None:
+                        self._snapshots[(type(e), e.id)] = values(e)
+        return entities
+
+    def snapshot(self, cls: type, entity_id: int) -> Optional[dict[str, Any]]:
+        """Значения полей на момент чтения; None — сущность не отслеживается."""
+        with self._lock:
+            snap = self._snapshots.get((cls, entity_id))
+        if snap is None:
+            return None
+        names, _ = self._getter(cls)
+        return dict(zip(names, snap))
+
+    def diff(self, entity: Any) -> Optional[dict[str, Any]]:
+        """Изменённые поля {имя: новое значение}; None — снимка нет (писать все столбцы)."""
+        cls = type(entity)
+        with self._lock:
+            snap = self._snapshots.get((cls, entity.id))
+        if snap is None:
+            return None
+        names, values = self._getter(cls)
+        return {name: new for name, old, new in zip(names, snap, values(entity)) if old != new}
+
+    def save(
+        self,
+        entity: Any,
+        update: Callable[[Any], None],
+        update_fields: Callable[[int, dict[str, Any]], None],
+    ) -> bool:
+        """
+        Записать сущность: только изменённые столбцы (update_fields), без снимка — целиком
+        (update). False — изменений нет, запрос к БД не выполнялся.
+        """
+        changes = self.diff(entity)
+        if changes is None:
+            update(entity)
+        elif not changes:
+            return False
+        else:
+            update_fields(entity.id, changes)
+        self.track(entity)
+        return True
+
+    def forget(self, cls: type, entity_id: int) -> None:
+        with self._lock:
+            self._snapshots.pop((cls, entity_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
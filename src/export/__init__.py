@@ -0,0 +1 @@
+"""Выгрузка таблиц в файлы (CSV/XLSX/PDF)."""
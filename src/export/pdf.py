@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import os
+from typing import Sequence
+
+from PyQt6.QtCore import QMarginsF, QRectF, Qt
+from PyQt6.QtGui import QFont, QPageLayout, QPageSize, QPainter, QPdfWriter
+
+from src.export.writers import ExportError, TableWriter
+
+
+# В PyQt6 флаги разных перечислений не складываются напрямую — передаём int
+_CELL_FLAGS = (
+    Qt.TextFlag.TextWordWrap.value | Qt.AlignmentFlag.AlignLeft.value | Qt.AlignmentFlag.AlignTop.value
+)
+
+
+class PdfTableWriter(TableWriter):
+    """
+    PDF рисуется построчно через QPainter: строка таблицы сразу попадает на страницу,
+    шапка повторяется на каждой странице. Вместо одного QTextDocument на всю таблицу
+    в памяти держится только текущая порция строк.
+
+    Ширины столбцов подбираются по шапке и первой порции строк.
+    QPdfWriter (в отличие от QPrinter) можно использовать вне GUI-потока.
+    """
+
+    RESOLUTION = 300
+    PADDING_PT = 2.5
+    MAX_CELL_LINES = 6
+
+    def __init__(self, path: str | os.PathLike, title: str, headers: Sequence[str]):
+        super().__init__(path, title, headers)
+        self._pdf = QPdfWriter(str(self.path))
+        self._pdf.setResolution(self.RESOLUTION)
+        self._pdf.setTitle(title)
+        self._pdf.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        self._pdf.setPageMargins(QMarginsF(10, 10, 10, 10), QPageLayout.Unit.Millimeter)
+        self._pdf.setPageOrientation(
+            QPageLayout.Orientation.Landscape if len(self.headers) > 6 else QPageLayout.Orientation.Portrait
+        )
+
+        self._painter = QPainter()
+        if not self._painter.begin(self._pdf):
+            raise ExportError(f"Не удалось открыть файл для записи:\n{self.path}")
+
+        self._font = QFont("Arial", 9)
+        self._bold = QFont(self._font)
+        self._bold.setBold(True)
+        self._pad = self.PADDING_PT * self.RESOLUTION / 72
+        self._page = self._painter.viewport()
+        self._widths: list[float] | None = None
+        self._page_no = 0
+        self._y = 0.0
+        self._bottom = 0.0
+
+    # ---- раскладка ----
+    def _fit_widths(self, rows: Sequence[Sequence[str]]) -> None:
+        # Доля столбца ~ характерная длина текста (с ограничением, чтобы один длинный
+        # столбец не сжимал остальные до нечитаемого).
+        weights = [max(4, min(len(h), 40)) for h in self.headers]
+        for row in rows:
+            for i, cell in enumerate(row[: len(weights)]):
+                weights[i] = max(weights[i], min(len(cell), 40))
+        total = sum(weights) or 1
+        self._widths = [self._page.width() * w / total for w in weights]
+
+    def _row_height(self, cells: Sequence[str], font: QFont) -> float:
+        self._painter.setFont(font)
+        line = self._painter.fontMetrics().height()
+        height = line
+        for cell, width in zip(cells, self._widths):
+            rect = self._painter.boundingRect(
+                QRectF(0, 0, width - 2 * self._pad, 1e6), _CELL_FLAGS, cell
+            )
+            height = max(height, min(rect.height(), line * self.MAX_CELL_LINES))
+        return height + 2 * self._pad
+
+    def _draw_row(self, cells: Sequence[str], font: QFont, height: float, *, header: bool = False) -> None:
+        p = self._painter
+        p.setFont(font)
+        x = float(self._page.left())
+        for cell, width in zip(cells, self._widths):
+            box = QRectF(x, self._y, width, height)
+            if header:
+                p.fillRect(box, Qt.GlobalColor.lightGray)
+            p.drawRect(box)
+            # Текст длиннее MAX_CELL_LINES строк обрезается границей ячейки
+            p.setClipRect(box)
+            p.drawText(
+                box.adjusted(self._pad, self._pad, -self._pad, -self._pad),
+                _CELL_FLAGS,
+                cell,
+            )
+            p.setClipping(False)
+            x += width
+        self._y += height
+
+    def _start_page(self) -> None:
+        if self._page_no:
+            self._pdf.newPage()
+        self._page_no += 1
+        p = self._painter
+        self._y = float(self._page.top())
+
+        # Номер страницы внизу (общее число страниц при потоковой записи неизвестно)
+        p.setFont(self._font)
+        footer_h = p.fontMetrics().height()
+        p.drawText(
+            QRectF(self._page.left(), self._page.bottom() - footer_h, self._page.width(), footer_h),
+            Qt.AlignmentFlag.AlignRight.value,
+            f"стр. {self._page_no}",
+        )
+        self._bottom = self._page.bottom() - footer_h - self._pad
+
+        if self._page_no == 1:
+            title_font = QFont(self._font)
+            title_font.setPointSize(12)
+            title_font.setBold(True)
+            p.setFont(title_font)
+            title_h = p.fontMetrics().height()
+            p.drawText(QRectF(self._page.left(), self._y, self._page.width(), title_h), 0, self.title)
+            self._y += title_h * 1.5
+
+        self._draw_row(self.headers, self._bold, self._row_height(self.headers, self._bold), header=True)
+
+    # ---- TableWriter ----
+    def write_rows(self, rows: Sequence[Sequence[str]]) -> None:
+        if self._widths is None:
+            self._fit_widths(rows)
+            self._start_page()
+        for row in rows:
+            height = self._row_height(row, self._font)
+            if self._y + height > self._bottom:
+                self._start_page()
+            self._draw_row(row, self._font, height)
+
+    def close(self) -> None:
+        if not self._painter.isActive():
+            return
+        if self._widths is None:
+            # Пустая таблица: страница только с заголовком и шапкой
+            self.write_rows([])
+        self._painter.end()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+from xml.sax.saxutils import escape
+import csv
+import itertools
+import os
+import re
+import zipfile
+
+from src.core.errors import AppError
+
+
+class ExportError(AppError):
+    """Ошибки выгрузки таблицы в файл."""
+
+
+class ExportCancelled(ExportError):
+    """Выгрузка прервана пользователем."""
+
+
+class TableWriter(ABC):
+    """
+    Построчная запись таблицы в файл. Строки приходят порциями через write_rows(),
+    поэтому в памяти держится только текущая порция, а не вся таблица.
+    """
+
+    def __init__(self, path: str | os.PathLike, title: str, headers: Sequence[str]):
+        self.path = Path(path)
+        self.title = title
+        self.headers = list(headers)
+
+    @abstractmethod
+    def write_rows(self, rows: Sequence[Sequence[str]]) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    def abort(self) -> None:
+        """Закрывает писатель и удаляет недописанный файл."""
+        try:
+            self.close()
+        finally:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> TableWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvTableWriter(TableWriter):
+    # utf-8-sig и ';' — чтобы Excel с русской локалью открыл файл без мастера импорта
+    def __init__(self, path: str | os.PathLike, title: str, headers: Sequence[str]):
+        super().__init__(path, title, headers)
+        self._file = open(self.path, "w", encoding="utf-8-sig", newline="")
+        self._csv = csv.writer(self._file, delimiter=";")
+        self._csv.writerow(self.headers)
+
+    def write_rows(self, rows: Sequence[Sequence[str]]) -> None:
+        self._csv.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+
+# Символы, недопустимые в XML 1.0 (встречаются в "грязных" данных из БД)
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class XlsxTableWriter(TableWriter):
+    """
+    Минимальный XLSX без сторонних библиотек: лист пишется потоком прямо в zip
+    (ячейки inlineStr, без таблицы общих строк), остальные части — при закрытии.
+    """
+
+    MAX_ROWS = 1_048_576
+
+    def __init__(self, path: str | os.PathLike, title: str, headers: Sequence[str]):
+        super().__init__(path, title, headers)
+        self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._rows = 0
+        self._put(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            "<sheetData>"
+        )
+        self.write_rows([self.headers])
+
+    def _put(self, text: str) -> None:
+        self._sheet.write(text.encode("utf-8"))
+
+    def write_rows(self, rows: Sequence[Sequence[str]]) -> None:
+        if self._rows + len(rows) > self.MAX_ROWS:
+            raise ExportError(f"В XLSX помещается не более {self.MAX_ROWS} строк; выберите CSV.")
+        parts: list[str] = []
+        for row in rows:
+            self._rows += 1
+            parts.append(f'<row r="{self._rows}">')
+            for cell in row:
+                if cell:
+                    text = escape(_XML_INVALID.sub("", cell))
+                    parts.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+                else:
+                    parts.append("<c/>")
+            parts.append("</row>")
+        self._put("".join(parts))
+
+    def close(self) -> None:
+        if self._sheet is None:
+            return
+        self._put("</sheetData></worksheet>")
+        self._sheet.close()
+        self._sheet = None
+        # Имя листа: не длиннее 31 символа и без []:*?/\
+        name = re.sub(r"[\[\]:*?/\\]", " ", self.title)[:31].strip() or "Лист1"
+        self._zip.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        self._zip.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(name=escape(name, {'"': "&quot;"})))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        self._zip.close()
+
+    def abort(self) -> None:
+        # Недописанный лист не закрываем как корректный документ
+        if self._sheet is not None:
+            self._sheet.close()
+            self._sheet = None
+        self._zip.close()
+        self.path.unlink(missing_ok=True)
+
+
+def write_table(
+    writer: TableWriter,
+    rows: Iterable[Sequence[str]],
+    *,
+    chunk_size: int = 500,
+    progress: Optional[Callable[[int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> int:
+    """
+    Переносит строки из итератора в писатель порциями по `chunk_size`.
+    Возвращает число записанных строк; при отмене бросает ExportCancelled.
+    """
+    total = 0
+    it = iter(rows)
+    while True:
+        if cancelled is not None and cancelled():
+            raise ExportCancelled("Выгрузка отменена.")
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk:
+            return total
+        writer.write_rows(chunk)
+        total += len(chunk)
+        if progress is not None:
+            progress(total)
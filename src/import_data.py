@@ -0,0 +1,208 @@
+"""
+Пакетный импорт задач, проектов и сотрудников из CSV или JSONL.
+
+Запуск:
+    python -m src.import_data tasks tasks.csv
+    python -m src.import_data employees staff.jsonl --errors errors.csv
+
+Первая строка CSV — заголовок с именами полей (как в таблицах БД), JSONL — один объект на строку.
+Некорректные записи не прерывают загрузку, а попадают в отчёт об ошибках.
+"""
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    # Позволяет запускать файл напрямую: `python src/import_data.py`
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+import argparse
+import csv
+import json
+import sys
+
+from src.app_context import AppContext
+from src.core.entities import Employee, Project, Task
+from src.core.errors import AppError, ValidationError
+from src.services.bulk_import import ImportReport, RowError
+
+
+# ---- Преобразование полей ----
+def _opt_str(value: Any) -> str | None:
+    if value is None:
+        return None
+    s = str(value).strip()
+    return s or None
+
+
+def _int(value: Any, field: str) -> int:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        raise ValidationError(f"Поле «{field}»: ожидается целое число, получено {value!r}.") from None
+
+
+def _opt_int(value: Any, field: str) -> int | None:
+    return None if _opt_str(value) is None else _int(value, field)
+
+
+def _opt_date(value: Any, field: str) -> date | None:
+    s = _opt_str(value)
+    if s is None:
+        return None
+    try:
+        return date.fromisoformat(s)
+    except ValueError:
+        raise ValidationError(f"Поле «{field}»: ожидается дата YYYY-MM-DD, получено {value!r}.") from None
+
+
+def _opt_datetime(value: Any, field: str) -> datetime | None:
+    s = _opt_str(value)
+    if s is None:
+        return None
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        raise ValidationError(f"Поле «{field}»: ожидается дата/время ISO 8601, получено {value!r}.") from None
+
+
+def _bool(value: Any, default: bool = True) -> bool:
+    s = _opt_str(value)
+    if s is None:
+        return default
+    return s.lower() in ("1", "true", "yes", "да")
+
+
+# ---- Разбор записей ----
+def _parse_task(rec: dict[str, Any]) -> Task:
+    return Task(
+        project_id=_int(rec.get("project_id"), "project_id"),
+        employee_id=_opt_int(rec.get("employee_id"), "employee_id"),
+        title=str(rec.get("title") or ""),
+        description=_opt_str(rec.get("description")),
+        due_date=_opt_date(rec.get("due_date"), "due_date"),
+        completed_at=_opt_datetime(rec.get("completed_at"), "completed_at"),
+        status=_opt_str(rec.get("status")) or "New",
+    )
+
+
+def _parse_project(rec: dict[str, Any]) -> Project:
+    return Project(
+        client_id=_int(rec.get("client_id"), "client_id"),
+        name=str(rec.get("name") or ""),
+        description=_opt_str(rec.get("description")),
+        start_date=_opt_date(rec.get("start_date"), "start_date"),
+        end_date=_opt_date(rec.get("end_date"), "end_date"),
+        status=_opt_str(rec.get("status")) or "Active",
+    )
+
+
+def _parse_employee(rec: dict[str, Any]) -> Employee:
+    return Employee(
+        last_name=str(rec.get("last_name") or ""),
+        first_name=str(rec.get("first_name") or ""),
+        middle_name=_opt_str(rec.get("middle_name")),
+        position=str(rec.get("position") or ""),
+        phone=_opt_str(rec.get("phone")),
+        email=_opt_str(rec.get("email")),
+        is_active=_bool(rec.get("is_active")),
+    )
+
+
+PARSERS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "tasks": _parse_task,
+    "projects": _parse_project,
+    "employees": _parse_employee,
+}
+
+
+def read_records(path: Path, fmt: str) -> Iterator[dict[str, Any]]:
+    """Построчное чтение файла: в памяти не держится больше одной записи."""
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Строка {line_no}: некорректный JSON: {e}") from e
+            if not isinstance(rec, dict):
+                raise ValueError(f"Строка {line_no}: ожидается JSON-объект.")
+            yield rec
+
+
+def run_import(ctx: AppContext, kind: str, records: Iterable[dict[str, Any]], batch_size: int) -> ImportReport:
+    parse = PARSERS[kind]
+    parse_errors: list[RowError] = []
+    # Номер исходной записи для каждой сущности, переданной в сервис (сервис нумерует по порядку).
+    record_numbers = array("I")
+
+    def entities() -> Iterator[Any]:
+        for record_no, rec in enumerate(records, start=1):
+            try:
+                entity = parse(rec)
+            except ValidationError as e:
+                parse_errors.append(RowError(record_no, str(e)))
+                continue
+            record_numbers.append(record_no)
+            yield entity
+
+    assert ctx.tasks is not None and ctx.projects is not None and ctx.employees is not None
+    if kind == "tasks":
+        report = ctx.tasks.create_tasks_many(entities(), batch_size)
+    elif kind == "projects":
+        report = ctx.projects.create_projects_many(entities(), batch_size)
+    else:
+        report = ctx.employees.create_employees_many(entities(), batch_size)
+
+    errors = parse_errors + [RowError(record_numbers[e.row - 1], e.message) for e in report.errors]
+    errors.sort(key=lambda e: e.row)
+    return ImportReport(report.imported, errors)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Пакетный импорт данных в ПК «Руководитель проектов».")
+    ap.add_argument("kind", choices=sorted(PARSERS), help="что импортировать")
+    ap.add_argument("path", type=Path, help="файл CSV или JSONL")
+    ap.add_argument("--format", choices=["csv", "jsonl"], help="формат файла (по умолчанию — по расширению)")
+    ap.add_argument("--batch-size", type=int, default=500, help="строк в одной транзакции (по умолчанию 500)")
+    ap.add_argument("--errors", type=Path, help="сохранить отчёт об ошибках в CSV")
+    args = ap.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "jsonl")
+
+    ctx = AppContext()
+    try:
+        ctx.connect()
+        report = run_import(ctx, args.kind, read_records(args.path, fmt), args.batch_size)
+    except (AppError, OSError, ValueError) as e:
+        print(f"Импорт прерван: {e}", file=sys.stderr)
+        return 2
+    finally:
+        ctx.close()
+
+    print(f"Импортировано: {report.imported}, с ошибками: {report.failed}")
+    if args.errors is not None:
+        with args.errors.open("w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["record", "error"])
+            w.writerows((e.row, e.message) for e in report.errors)
+        print(f"Отчёт об ошибках: {args.errors}")
+    else:
+        for e in report.errors[:20]:
+            print(f"  запись {e.row}: {e.message}")
+        if report.failed > 20:
+            print(f"  ... и ещё {report.failed - 20} (используйте --errors для полного отчёта)")
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,280 @@
+"""
+Проверка планов запросов репозиториев: EXPLAIN FORMAT=JSON по каждому SQL-запросу
+из src/db/repositories/mysql/ и список полных просмотров, filesort и временных таблиц.
+
+Запуск (нужен config.ini с доступом к БД, лучше — с данными реального объёма):
+    python -m src.index_advisor
+    python -m src.index_advisor --max-rows 10000 -v
+
+Запросы берутся из исходников: аргументы _execute/_stream/_execute_in_transaction,
+а для _fetch_page и _fetch_by_ids — запрос страницы для каждой сортировки _PAGE_SORTS
+и выборка по списку id. Параметры %s подставляются примерными значениями по имени столбца.
+Код возврата 1 — есть замечания на таблицах больше --max-rows строк.
+"""
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    # Позволяет запускать файл напрямую: `python src/index_advisor.py`
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+import argparse
+import ast
+import json
+import re
+import sys
+
+import mysql.connector
+
+from src.config import ConfigError, load_mysql_config
+from src.core.errors import DatabaseError
+from src.db.connection import DbConnection
+from src.db.instrumentation import fingerprint
+
+
+REPOSITORIES = Path(__file__).resolve().parent / "db" / "repositories" / "mysql"
+
+# Методы BaseMySqlRepository, первым аргументом которых передаётся готовый запрос
+_EXECUTORS = {"_execute", "_stream"}
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT\s+INTO\s+\w+\s*\([^)]*\)\s*SELECT)\b", re.I | re.S)
+
+
+@dataclass(slots=True)
+class Statement:
+    location: str
+    sql: str
+
+
+@dataclass(slots=True)
+class Finding:
+    kind: str  # "full scan" / "full index scan" / "filesort" / "temporary" / "error"
+    table: Optional[str]
+    rows: int
+    detail: str = ""
+
+
+@dataclass(slots=True)
+class Report:
+    statement: Statement
+    findings: list[Finding] = field(default_factory=list)
+
+
+# ---- Сбор запросов из исходников ----
+class _Collector(ast.NodeVisitor):
+    def __init__(self, path: Path):
+        self._file = path.name
+        self._constants: dict[str, str] = {}
+        self._sorts: dict[str, Any] = {}
+        self._where: list[str] = []
+        self.statements: list[Statement] = []
+
+    def _resolve(self, node: ast.AST) -> Optional[str]:
+        """Строка из литерала, имени константы модуля, их суммы или .format(...) с литералами."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self._constants.get(node.id)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left, right = self._resolve(node.left), self._resolve(node.right)
+            return None if left is None or right is None else left + right
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format":
+            template = self._resolve(node.func.value)
+            kwargs = {kw.arg: self._resolve(kw.value) for kw in node.keywords}
+            if template is None or node.args or None in kwargs.values() or None in kwargs:
+                return None
+            return template.format(**kwargs)
+        return None
+
+    def _add(self, node: ast.AST, sql: str, note: str = "") -> None:
+        where = ".".join(self._where) or "<module>"
+        label = f"{self._file}:{node.lineno} {where}" + (f" ({note})" if note else "")
+        self.statements.append(Statement(label, sql))
+
+    def visit_Module(self, node: ast.Module) -> None:
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                value = self._resolve(stmt.value)
+                if value is not None:
+                    self._constants[stmt.targets[0].id] = value
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        sorts = self._sorts
+        self._sorts = {}
+        for stmt in node.body:
+            if isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name) and stmt.target.id == "_PAGE_SORTS":
+                self._sorts = ast.literal_eval(stmt.value)
+        self._where.append(node.name)
+        self.generic_visit(node)
+        self._where.pop()
+        self._sorts = sorts
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._where.append(node.name)
+        self.generic_visit(node)
+        self._where.pop()
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = node.func.attr if isinstance(node.func, ast.Attribute) else None
+        first = self._resolve(node.args[0]) if node.args else None
+        if name in _EXECUTORS and first is not None:
+            self._add(node, first)
+        elif name == "_execute_in_transaction" and node.args and isinstance(node.args[0], (ast.List, ast.Tuple)):
+            for item in node.args[0].elts:
+                if isinstance(item, ast.Tuple) and item.elts:
+                    sql = self._resolve(item.elts[0])
+                    if sql is not None:
+                        self._add(node, sql)
+        elif name == "_fetch_by_ids" and first is not None:
+            self._add(node, f"{first.rstrip()}\nWHERE id IN (%s, %s, %s)")
+        elif name == "_fetch_page" and first is not None:
+            for sort, order in self._sorts.items():
+                order_by = ", ".join(f"{e} {'DESC' if d else 'ASC'}" for e, _, d in order)
+                self._add(node, f"{first.rstrip()}\nORDER BY {order_by}\nLIMIT %s", f"sort={sort}")
+        self.generic_visit(node)
+
+
+def collect_statements(root: Path = REPOSITORIES) -> list[Statement]:
+    """Запросы репозиториев, для которых EXPLAIN имеет смысл (без INSERT ... VALUES и DDL)."""
+    seen: set[str] = set()
+    result: list[Statement] = []
+    for path in sorted(root.glob("*.py")):
+        collector = _Collector(path)
+        collector.visit(ast.parse(path.read_text(encoding="utf-8"), str(path)))
+        for st in collector.statements:
+            key = fingerprint(st.sql)
+            if _EXPLAINABLE.match(st.sql) and key not in seen:
+                seen.add(key)
+                result.append(st)
+    return result
+
+
+# ---- Примерные значения параметров ----
+_BEFORE_PARAM = re.compile(r"([\w.]+)\s*(?:=|<>|!=|<=|>=|<|>)\s*$|([\w.]+)\s+IN\s*\([^()]*$|\b(LIMIT|OFFSET|AGAINST\s*\()\s*$", re.I)
+
+
+def _sample(before: str) -> str:
+    m = _BEFORE_PARAM.search(before[-200:])
+    if m is None:
+        return "1"
+    if m.group(3):
+        word = m.group(3).upper()
+        return "100" if word == "LIMIT" else "0" if word == "OFFSET" else "'проект*'"
+    column = (m.group(1) or m.group(2)).rsplit(".", 1)[-1].lower()
+    if column == "table_name":
+        return "'tasks'"
+    if column.endswith("_at") or column == "since":
+        return "NOW() - INTERVAL 1 DAY"
+    if "date" in column:
+        return "CURRENT_DATE"
+    if column == "status":
+        return "'New'"
+    if column == "id" or column.endswith("_id"):
+        return "1"
+    return "'a'"
+
+
+def with_sample_params(sql: str) -> str:
+    parts = sql.split("%s")
+    out = [parts[0]]
+    for part in parts[1:]:
+        out.append(_sample("".join(out)))
+        out.append(part)
+    return "".join(out)
+
+
+# ---- Разбор плана ----
+def _walk(node: Any, out: list[Finding]) -> int:
+    """Собирает замечания по узлам плана; возвращает наибольшую оценку строк в поддереве."""
+    if isinstance(node, list):
+        return max((_walk(item, out) for item in node), default=0)
+    if not isinstance(node, dict):
+        return 0
+    rows = max((_walk(value, out) for value in node.values()), default=0)
+    if "access_type" in node:
+        own = int(node.get("rows_examined_per_scan") or 0)
+        rows = max(rows, own)
+        table = node.get("table_name")
+        if node["access_type"] == "ALL":
+            out.append(Finding("full scan", table, own))
+        elif node["access_type"] == "index":
+            out.append(Finding("full index scan", table, own, f"индекс {node.get('key')}"))
+    if node.get("using_filesort"):
+        out.append(Finding("filesort", None, rows))
+    if node.get("using_temporary_table"):
+        out.append(Finding("temporary", None, rows))
+    return rows
+
+
+def analyze(conn: Any, statement: Statement) -> Report:
+    report = Report(statement)
+    cur = conn.cursor()
+    try:
+        cur.execute("EXPLAIN FORMAT=JSON " + with_sample_params(statement.sql))
+        plan = json.loads(cur.fetchone()[0])
+    except mysql.connector.Error as e:
+        report.findings.append(Finding("error", None, 0, str(e)))
+        return report
+    finally:
+        cur.close()
+    _walk(plan, report.findings)
+    return report
+
+
+def run(db: DbConnection, statements: list[Statement]) -> Iterator[Report]:
+    with db.checkout() as conn:
+        for st in statements:
+            yield analyze(conn, st)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="EXPLAIN запросов репозиториев MySQL: полные просмотры и filesort.")
+    ap.add_argument("--config", type=Path, default=Path("config.ini"), help="файл настроек (по умолчанию config.ini)")
+    ap.add_argument(
+        "--max-rows",
+        type=int,
+        default=1000,
+        help="замечания по оценке до стольких строк не считаются проблемой (по умолчанию 1000)",
+    )
+    ap.add_argument("-v", "--verbose", action="store_true", help="показать и запросы без замечаний")
+    args = ap.parse_args(argv)
+
+    try:
+        db = DbConnection(load_mysql_config(args.config))
+        db.connect()
+    except (ConfigError, DatabaseError) as e:
+        print(f"Нет подключения к БД: {e}", file=sys.stderr)
+        return 2
+
+    statements = collect_statements()
+    problems = 0
+    try:
+        for report in run(db, statements):
+            serious = [f for f in report.findings if f.kind == "error" or f.rows > args.max_rows]
+            problems += bool(serious)
+            if not report.findings and not args.verbose:
+                continue
+            print(report.statement.location)
+            print(f"    {fingerprint(report.statement.sql)[:160]}")
+            for f in report.findings:
+                mark = "!" if f in serious else "-"
+                where = f" {f.table}" if f.table else ""
+                rows = f", ~{f.rows} строк" if f.rows else ""
+                extra = f" ({f.detail})" if f.detail else ""
+                print(f"  {mark} {f.kind}{where}{rows}{extra}")
+            if not report.findings:
+                print("  ok")
+    finally:
+        db.close()
+
+    print(f"\nЗапросов: {len(statements)}, с замечаниями (> {args.max_rows} строк): {problems}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+"""
+Миграции схемы БД: sql/schema.sql (версия 0) и sql/migrations/NNN_*.sql.
+
+Запуск:
+    python -m src.migrate            # применить недостающие
+    python -m src.migrate --to 3     # применить до версии 3 включительно
+    python -m src.migrate status     # что применено, сколько заняло, что ожидает
+
+Применённые версии хранятся в таблице schema_version; повторный запуск ничего не меняет.
+"""
+from __future__ import annotations
+
+if __name__ == "__main__" and __package__ is None:
+    # Позволяет запускать файл напрямую: `python src/migrate.py`
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pathlib import Path
+import argparse
+import sys
+
+from src.config import ConfigError, load_mysql_config
+from src.core.errors import AppError
+from src.db.connection import DbConnection
+from src.db.migrations import AppliedMigration, MigrationRunner
+
+
+def _print_applied(m: AppliedMigration) -> None:
+    print(f"  {m.version:03d} {m.name:32} {m.duration_ms:8d} мс")
+
+
+def _status(runner: MigrationRunner) -> None:
+    applied = runner.applied()
+    changed = {m.version for m in runner.changed()}
+    for m in runner.migrations:
+        a = applied.get(m.version)
+        if a is None:
+            print(f"  {m.version:03d} {m.name:32} ожидает")
+            continue
+        note = "  (файл изменён после применения)" if m.version in changed else ""
+        print(f"  {m.version:03d} {m.name:32} {a.applied_at:%Y-%m-%d %H:%M}  {a.duration_ms:8d} мс{note}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Миграции схемы БД ПК «Руководитель проектов».")
+    ap.add_argument("command", nargs="?", choices=["up", "status"], default="up", help="по умолчанию — up")
+    ap.add_argument("--to", type=int, help="применить миграции до этой версии включительно")
+    ap.add_argument("--config", type=Path, default=Path("config.ini"), help="файл настроек (по умолчанию config.ini)")
+    args = ap.parse_args(argv)
+
+    db: DbConnection | None = None
+    try:
+        db = DbConnection(load_mysql_config(args.config))
+        db.connect()
+        runner = MigrationRunner(db)
+        if args.command == "status":
+            _status(runner)
+            return 0
+        done = runner.migrate(args.to, on_applied=_print_applied)
+    except (ConfigError, AppError) as e:
+        print(f"Миграция прервана: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if db is not None:
+            db.close()
+
+    print(f"Применено миграций: {len(done)}" if done else "Схема БД актуальна.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
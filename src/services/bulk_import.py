@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, TypeVar
+
+from src.core.errors import DatabaseError, ValidationError
+
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class RowError:
+    row: int  # номер записи во входном потоке, с 1
+    message: str
+
+
+@dataclass(slots=True)
+class ImportReport:
+    imported: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+
+def import_in_batches(
+    items: Iterable[T],
+    validate: Callable[[T], None],
+    write_batch: Callable[[list[T]], Any],
+    write_one: Callable[[T], Any],
+    batch_size: int = 500,
+) -> ImportReport:
+    """
+    Потоковый импорт: каждая запись проверяется, корректные пишутся пакетами
+    (`write_batch` — одна транзакция на пакет). Ошибка записи не прерывает загрузку:
+    откатившийся пакет повторяется построчно, чтобы найти конкретные записи с ошибкой.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size должен быть положительным.")
+
+    report = ImportReport()
+    batch: list[tuple[int, T]] = []
+
+    def flush() -> None:
+        if not batch:
+            return
+        try:
+            write_batch([item for _, item in batch])
+            report.imported += len(batch)
+        except DatabaseError:
+            for row_no, item in batch:
+                try:
+                    write_one(item)
+                    report.imported += 1
+                except DatabaseError as e:
+                    report.errors.append(RowError(row_no, str(e)))
+        batch.clear()
+
+    for row_no, item in enumerate(items, start=1):
+        try:
+            validate(item)
+        except ValidationError as e:
+            report.errors.append(RowError(row_no, str(e)))
+            continue
+        batch.append((row_no, item))
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return report
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+import threading
+import time
+
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: list
+    loaded_at: float
+
+
+class LookupCache:
+    """
+    Read-through кэш справочных списков (клиенты, сотрудники, проекты).
+
+    Запись сбрасывается сервисом при create/update/delete соответствующей сущности,
+    а изменения, сделанные другими пользователями, подхватываются по истечении TTL.
+    """
+
+    def __init__(self, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: dict[str, _Entry] = {}
+        # Поколение ключа растёт при сбросе: результат загрузки, начатой до сброса, не сохраняется.
+        self._generations: dict[str, int] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: str, loader: Callable[[], list[T]]) -> list[T]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry.loaded_at < self._ttl:
+                self._stats.hits += 1
+                return list(entry.value)
+            self._stats.misses += 1
+            generation = self._generations.get(key, 0)
+
+        # Запрос к БД выполняем без блокировки.
+        value = list(loader())
+
+        with self._lock:
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = _Entry(value, self._clock())
+        return list(value)
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._stats.hits, self._stats.misses, self._stats.invalidations)
@@ -1,28 +1,100 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Iterator
+
 from src.core.entities import Client
 from src.core.validation import require_non_empty, validate_email_optional
+from src.db.repositories.base import ChangeSet, Page, PageKey
 from src.db.repositories.mysql.client_repo import ClientRepositoryMySql
+from src.db.tracking import ChangeTracker
+from src.services.cache import LookupCache
+from src.services.columnar import ColumnarSnapshot
+from src.services.identity_map import IdentityMap
 
 
 class ClientService:
-    def __init__(self, repo: ClientRepositoryMySql):
+    CACHE_KEY = "clients"
+
+    def __init__(
+        self,
+        repo: ClientRepositoryMySql,
+        cache: LookupCache | None = None,
+        identity: IdentityMap | None = None,
+        tracker: ChangeTracker | None = None,
+        store: ColumnarSnapshot | None = None,
+    ):
         self._repo = repo
+        self._cache = cache or LookupCache(ttl=0)
+        # Общие объекты Client для ленивых связей Project.client
+        self._identity = identity or IdentityMap()
+        # Снимки прочитанных записей: update_client пишет только изменённые поля
+        self._tracker = tracker or ChangeTracker()
+        # Снимок для отчётов (см. ReportService): названия клиентов в нём устаревают после записи
+        self._store = store
+
+    def list_clients(self, *, fresh: bool = False) -> list[Client]:
+        # fresh=True — явное обновление списка пользователем, минуя кэш
+        if not fresh:
+            return self._cache.get_or_load(self.CACHE_KEY, self._load_all)
+        self._cache.invalidate(self.CACHE_KEY)
+        clients = self._cache.get_or_load(self.CACHE_KEY, self._load_all)
+        self._identity.put(*clients)
+        return clients
+
+    def _load_all(self) -> list[Client]:
+        return self._tracker.track_all(self._repo.list_all())
+
+    def iter_clients(self) -> Iterator[Client]:
+        return self._repo.iter_all()
+
+    def list_clients_page(self, after_key: PageKey | None = None, limit: int = 100) -> Page[Client]:
+        page = self._repo.list_page(after_key, limit)
+        self._tracker.track_all(page.items)
+        return page
+
+    def server_now(self) -> datetime:
+        return self._repo.server_now()
+
+    def list_clients_changed_since(self, since: datetime) -> ChangeSet[Client]:
+        changes = self._repo.list_changed_since(since)
+        if not changes.is_empty:
+            # Изменения других пользователей: кэш справочника больше не актуален
+            self._cache.invalidate(self.CACHE_KEY)
+            self._identity.apply(Client, changes)
+            self._tracker.track_all(changes.changed)
+            for entity_id in changes.deleted_ids:
+                self._tracker.forget(Client, entity_id)
+        return changes
 
-    def list_clients(self) -> list[Client]:
-        return self._repo.list_all()
+    def _mark_stale(self) -> None:
+        # После записи: снимок отчётов (ColumnarSnapshot) перечитает изменения при следующем чтении
+        if self._store is not None:
+            self._store.mark_stale()
 
     def create_client(self, c: Client) -> int:
         c.name = require_non_empty(c.name, "Название клиента")
         validate_email_optional(c.email)
-        return self._repo.create(c)
+        new_id = self._repo.create(c)
+        self._cache.invalidate(self.CACHE_KEY)
+        self._mark_stale()
+        return new_id
 
     def update_client(self, c: Client) -> None:
         c.name = require_non_empty(c.name, "Название клиента")
         validate_email_optional(c.email)
-        self._repo.update(c)
+        # Ничего не изменилось — ни одного запроса к БД
+        if not self._tracker.save(c, self._repo.update, self._repo.update_fields):
+            return
+        self._cache.invalidate(self.CACHE_KEY)
+        self._identity.evict(Client, c.id)
+        self._mark_stale()
 
     def delete_client(self, client_id: int) -> None:
         self._repo.delete(client_id)
+        self._tracker.forget(Client, client_id)
+        self._cache.invalidate(self.CACHE_KEY)
+        self._identity.evict(Client, client_id)
+        self._mark_stale()
 
 
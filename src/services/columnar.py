@@ -0,0 +1,508 @@
+from __future__ import annotations
+
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Optional
+import threading
+import time
+
+from src.core.entities import Client, Employee, Project, ProjectMember, Task
+from src.db.repositories.mysql.client_repo import ClientRepositoryMySql
+from src.db.repositories.mysql.employee_repo import EmployeeRepositoryMySql
+from src.db.repositories.mysql.project_member_repo import ProjectMemberRepositoryMySql
+from src.db.repositories.mysql.project_repo import ProjectRepositoryMySql
+from src.db.repositories.mysql.task_repo import UNASSIGNED, TaskRepositoryMySql
+
+try:  # NumPy необязателен: без него отчёты считаются циклом по тем же столбцам
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+
+# Коды статусов задач (ENUM в sql/schema.sql); -1 — удалённая строка (слот до уплотнения)
+_TASK_STATUSES = ("New", "InProgress", "Done", "Canceled")
+_STATUS_CODE = {s: i for i, s in enumerate(_TASK_STATUSES)}
+_NEW, _IN_PROGRESS = _STATUS_CODE["New"], _STATUS_CODE["InProgress"]
+_DELETED = -1
+_NONE = -1  # задача без исполнителя / пустая дата
+
+
+def _ordinal(d: Optional[date]) -> int:
+    return d.toordinal() if d is not None else _NONE
+
+
+def _from_ordinal(n: int) -> Optional[date]:
+    return date.fromordinal(n) if n > 0 else None
+
+
+def _full_name(last: str, first: str, middle: Optional[str]) -> str:
+    # Как CONCAT(last_name, ' ', first_name, IFNULL(CONCAT(' ', middle_name), '')) в SQL-отчётах
+    return f"{last} {first}" + (f" {middle}" if middle is not None else "")
+
+
+class ColumnarSnapshot:
+    """
+    Снимок tasks/projects/project_members (и справочников) в памяти процесса, по столбцам.
+
+    Задачи хранятся массивами array: ссылки на проект и исполнителя — коды (номера строк
+    в справочниках), статус — код, даты — порядковые номера дней. Отчёты считаются
+    фильтрами и группировками по этим столбцам (через NumPy, если он установлен)
+    без обращения к MySQL.
+
+    Снимок догружает изменения (updated_at + deleted_rows, см. миграцию 001) при чтении,
+    если он старше `max_age` секунд; mark_stale() — обновить при следующем чтении.
+    Участники проектов не имеют отметки изменения и перечитываются целиком.
+    """
+
+    # Удалённые слоты задач вычищаются, когда их становится больше этой доли
+    COMPACT_RATIO = 0.25
+
+    def __init__(
+        self,
+        tasks: TaskRepositoryMySql,
+        projects: ProjectRepositoryMySql,
+        members: ProjectMemberRepositoryMySql,
+        employees: EmployeeRepositoryMySql,
+        clients: ClientRepositoryMySql,
+        max_age: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._tasks_repo = tasks
+        self._projects_repo = projects
+        self._members_repo = members
+        self._employees_repo = employees
+        self._clients_repo = clients
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.RLock()
+
+        self._as_of: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._stale = True
+        self._reset()
+
+    def _reset(self) -> None:
+        # справочники
+        self._client_name: dict[int, str] = {}
+        self._emp_code: dict[int, int] = {}
+        self._emp_id: list[int] = []
+        self._emp_last: list[str] = []
+        self._emp_first: list[str] = []
+        self._emp_middle: list[Optional[str]] = []
+        self._emp_position: list[str] = []
+
+        self._proj_code: dict[int, int] = {}
+        self._proj_id: list[int] = []
+        self._proj_client = array("q")
+        self._proj_name: list[str] = []
+        self._proj_start = array("i")
+        self._proj_end = array("i")
+        self._proj_status: list[str] = []
+
+        # участники проектов
+        self._mem_project = array("i")
+        self._mem_employee = array("i")
+        self._mem_role: list[str] = []
+        self._mem_since = array("i")
+
+        # задачи
+        self._task_pos: dict[int, int] = {}
+        self._t_id = array("q")
+        self._t_project = array("i")
+        self._t_employee = array("i")
+        self._t_due = array("i")
+        self._t_status = array("b")
+        self._t_title: list[str] = []
+        self._dead = 0
+
+    # ---- обновление ----
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    def ensure_fresh(self) -> None:
+        with self._lock:
+            if self._stale or self._clock() - self._refreshed_at >= self._max_age:
+                self.refresh()
+
+    def refresh(self, *, full: bool = False) -> None:
+        with self._lock:
+            as_of = self._tasks_repo.server_now()
+            self._stale = False
+            if full or self._as_of is None or not self._apply_changes(self._as_of):
+                self._load_all()
+            self._as_of = as_of
+            self._refreshed_at = self._clock()
+
+    def _load_all(self) -> None:
+        self._reset()
+        for c in self._clients_repo.list_all():
+            self._put_client(c)
+        for e in self._employees_repo.list_all():
+            self._put_employee(e)
+        for p in self._projects_repo.list_all():
+            self._put_project(p)
+        self._load_members()
+        for t in self._tasks_repo.iter_all():
+            if self._known(t.project_id, t.employee_id):
+                self._put_task(t)
+            else:
+                # Проект/сотрудник создан уже после их выборки — придёт со следующей дельтой
+                self._stale = True
+
+    def _apply_changes(self, since: datetime) -> bool:
+        """
+        Догрузка изменений с момента `since`. False — дельту применить нельзя, нужна полная
+        загрузка: удалены проекты или сотрудники (каскад по задачам и участникам не отмечается
+        в updated_at). Проекты и сотрудники, появившиеся между запросами, дочитываются по id.
+        """
+        # Порядок важен: задачи ссылаются на проекты и сотрудников из той же дельты
+        clients = self._clients_repo.list_changed_since(since)
+        employees = self._employees_repo.list_changed_since(since)
+        projects = self._projects_repo.list_changed_since(since)
+        if any(pid in self._proj_code for pid in projects.deleted_ids) or any(
+            eid in self._emp_code for eid in employees.deleted_ids
+        ):
+            return False
+
+        for c in clients.changed:
+            self._put_client(c)
+        for cid in clients.deleted_ids:
+            self._client_name.pop(cid, None)
+        for e in employees.changed:
+            self._put_employee(e)
+        for p in projects.changed:
+            self._put_project(p)
+
+        tasks = self._tasks_repo.list_changed_since(since)
+        for tid in tasks.deleted_ids:
+            pos = self._task_pos.pop(tid, None)
+            if pos is not None:
+                self._t_status[pos] = _DELETED
+                self._dead += 1
+
+        self._load_missing(tasks.changed)
+        if not all(self._known(t.project_id, t.employee_id) for t in tasks.changed):
+            return False
+        for t in tasks.changed:
+            self._put_task(t)
+        self._load_members()
+        if self._dead > len(self._t_id) * self.COMPACT_RATIO:
+            self._compact()
+        return True
+
+    def _load_missing(self, tasks: list[Task]) -> None:
+        """Проекты (с клиентами) и сотрудники задач, которых нет в снимке, — только они, по id."""
+        project_ids = {t.project_id for t in tasks} - self._proj_code.keys()
+        employee_ids = {t.employee_id for t in tasks if t.employee_id is not None} - self._emp_code.keys()
+        for e in self._employees_repo.get_many(employee_ids):
+            self._put_employee(e)
+        projects = self._projects_repo.get_many(project_ids)
+        for c in self._clients_repo.get_many({p.client_id for p in projects} - self._client_name.keys()):
+            self._put_client(c)
+        for p in projects:
+            self._put_project(p)
+
+    def _known(self, project_id: int, employee_id: Optional[int]) -> bool:
+        return project_id in self._proj_code and (employee_id is None or employee_id in self._emp_code)
+
+    def _put_client(self, c: Client) -> None:
+        self._client_name[c.id] = c.name
+
+    def _put_employee(self, e: Employee) -> None:
+        code = self._emp_code.get(e.id)
+        if code is None:
+            self._emp_code[e.id] = len(self._emp_id)
+            self._emp_id.append(e.id)
+            self._emp_last.append(e.last_name)
+            self._emp_first.append(e.first_name)
+            self._emp_middle.append(e.middle_name)
+            self._emp_position.append(e.position)
+            return
+        self._emp_last[code] = e.last_name
+        self._emp_first[code] = e.first_name
+        self._emp_middle[code] = e.middle_name
+        self._emp_position[code] = e.position
+
+    def _put_project(self, p: Project) -> None:
+        code = self._proj_code.get(p.id)
+        if code is None:
+            self._proj_code[p.id] = len(self._proj_id)
+            self._proj_id.append(p.id)
+            self._proj_client.append(p.client_id)
+            self._proj_name.append(p.name)
+            self._proj_start.append(_ordinal(p.start_date))
+            self._proj_end.append(_ordinal(p.end_date))
+            self._proj_status.append(p.status)
+            return
+        self._proj_client[code] = p.client_id
+        self._proj_name[code] = p.name
+        self._proj_start[code] = _ordinal(p.start_date)
+        self._proj_end[code] = _ordinal(p.end_date)
+        self._proj_status[code] = p.status
+
+    def _put_task(self, t: Task) -> None:
+        project = self._proj_code[t.project_id]
+        employee = self._emp_code[t.employee_id] if t.employee_id is not None else _NONE
+        pos = self._task_pos.get(t.id)
+        if pos is None:
+            self._task_pos[t.id] = len(self._t_id)
+            self._t_id.append(t.id)
+            self._t_project.append(project)
+            self._t_employee.append(employee)
+            self._t_due.append(_ordinal(t.due_date))
+            self._t_status.append(_STATUS_CODE[t.status])
+            self._t_title.append(t.title)
+            return
+        self._t_project[pos] = project
+        self._t_employee[pos] = employee
+        self._t_due[pos] = _ordinal(t.due_date)
+        self._t_status[pos] = _STATUS_CODE[t.status]
+        self._t_title[pos] = t.title
+
+    def _load_members(self) -> None:
+        members: list[ProjectMember] = [
+            m for m in self._members_repo.list_all_members() if self._known(m.project_id, m.employee_id)
+        ]
+        self._mem_project = array("i", (self._proj_code[m.project_id] for m in members))
+        self._mem_employee = array("i", (self._emp_code[m.employee_id] for m in members))
+        self._mem_role = [m.role for m in members]
+        self._mem_since = array("i", (_ordinal(m.since_date) for m in members))
+
+    def _compact(self) -> None:
+        keep = [i for i, s in enumerate(self._t_status) if s != _DELETED]
+        self._t_id = array("q", (self._t_id[i] for i in keep))
+        self._t_project = array("i", (self._t_project[i] for i in keep))
+        self._t_employee = array("i", (self._t_employee[i] for i in keep))
+        self._t_due = array("i", (self._t_due[i] for i in keep))
+        self._t_status = array("b", (self._t_status[i] for i in keep))
+        self._t_title = [self._t_title[i] for i in keep]
+        self._task_pos = {tid: pos for pos, tid in enumerate(self._t_id)}
+        self._dead = 0
+
+    # ---- выборки ----
+    def _today(self) -> int:
+        # Дата сервера БД (как CURRENT_DATE в SQL), сдвинутая на время с момента обновления
+        assert self._as_of is not None
+        return (self._as_of + timedelta(seconds=self._clock() - self._refreshed_at)).date().toordinal()
+
+    def _task_positions(self, *, employee: Optional[int] = None, overdue_before: Optional[int] = None) -> Any:
+        """
+        Позиции неудалённых задач (ndarray с NumPy, иначе list); фильтры — исполнитель (код)
+        и/или активные задачи со сроком раньше `overdue_before`.
+        """
+        active_only = employee is not None or overdue_before is not None
+        if np is not None:
+            status = np.frombuffer(self._t_status, dtype=np.int8)
+            mask = ((status == _NEW) | (status == _IN_PROGRESS)) if active_only else (status != _DELETED)
+            if employee is not None:
+                mask &= np.frombuffer(self._t_employee, dtype=np.int32) == employee
+            if overdue_before is not None:
+                due = np.frombuffer(self._t_due, dtype=np.int32)
+                mask &= (due != _NONE) & (due < overdue_before)
+            return np.flatnonzero(mask)
+
+        result = []
+        for i, (s, e, d) in enumerate(zip(self._t_status, self._t_employee, self._t_due)):
+            if active_only:
+                if s != _NEW and s != _IN_PROGRESS:
+                    continue
+            elif s == _DELETED:
+                continue
+            if employee is not None and e != employee:
+                continue
+            if overdue_before is not None and (d == _NONE or d >= overdue_before):
+                continue
+            result.append(i)
+        return result
+
+    def _by_due_then_id_desc(self, positions: Any) -> list[int]:
+        # ORDER BY t.due_date ASC, t.id DESC (NULL-срок — первым, как в MySQL)
+        if np is not None:
+            due = np.frombuffer(self._t_due, dtype=np.int32)[positions]
+            ids = np.frombuffer(self._t_id, dtype=np.int64)[positions]
+            return positions[np.lexsort((-ids, due))].tolist()
+        due, ids = self._t_due, self._t_id
+        return sorted(positions, key=lambda i: (due[i], -ids[i]))
+
+    # ---- отчёты (те же строки, что у ReportRepositoryMySql) ----
+    def projects_by_client(self, client_id: int) -> list[dict]:
+        with self._lock:
+            codes = [
+                c for c, cid in enumerate(self._proj_client) if cid == client_id
+            ]
+            codes.sort(key=lambda c: (-self._proj_start[c], -self._proj_id[c]))
+            return [
+                {
+                    "id": self._proj_id[c],
+                    "name": self._proj_name[c],
+                    "start_date": _from_ordinal(self._proj_start[c]),
+                    "end_date": _from_ordinal(self._proj_end[c]),
+                    "status": self._proj_status[c],
+                }
+                for c in codes
+            ]
+
+    def overdue_projects(self) -> list[dict]:
+        with self._lock:
+            positions = self._task_positions(overdue_before=self._today())
+            if np is not None:
+                # GROUP BY project: COUNT(*) — bincount, MIN(due_date) — minimum.at
+                projects = np.frombuffer(self._t_project, dtype=np.int32)[positions]
+                due = np.frombuffer(self._t_due, dtype=np.int32)[positions]
+                per_project = np.bincount(projects, minlength=len(self._proj_id))
+                earliest = np.full(len(self._proj_id), np.iinfo(np.int32).max, dtype=np.int32)
+                np.minimum.at(earliest, projects, due)
+                codes = np.flatnonzero(per_project)
+                codes = codes[np.lexsort((-per_project[codes], earliest[codes]))]
+                counts = per_project[codes].tolist()
+                first = earliest[codes].tolist()
+                codes = codes.tolist()
+            else:
+                by_code: dict[int, list[int]] = {}
+                for i in positions:
+                    code, d = self._t_project[i], self._t_due[i]
+                    agg = by_code.get(code)
+                    if agg is None:
+                        by_code[code] = [1, d]
+                    else:
+                        agg[0] += 1
+                        agg[1] = min(agg[1], d)
+                codes = sorted(by_code, key=lambda c: (by_code[c][1], -by_code[c][0]))
+                counts = [by_code[c][0] for c in codes]
+                first = [by_code[c][1] for c in codes]
+
+            return [
+                {
+                    "id": self._proj_id[c],
+                    "name": self._proj_name[c],
+                    "client_name": self._client_name.get(self._proj_client[c]),
+                    "first_overdue_due_date": _from_ordinal(d),
+                    "overdue_tasks": n,
+                }
+                for c, n, d in zip(codes, counts, first)
+            ]
+
+    def employees_by_project(self, project_id: int) -> list[dict]:
+        with self._lock:
+            code = self._proj_code.get(project_id)
+            if np is not None:
+                rows = np.flatnonzero(np.frombuffer(self._mem_project, dtype=np.int32) == code).tolist()
+            else:
+                rows = [i for i, p in enumerate(self._mem_project) if p == code]
+            rows.sort(key=lambda i: (self._emp_last[self._mem_employee[i]], self._emp_first[self._mem_employee[i]]))
+            result = []
+            for i in rows:
+                e = self._mem_employee[i]
+                result.append(
+                    {
+                        "employee_id": self._emp_id[e],
+                        "employee_name": _full_name(self._emp_last[e], self._emp_first[e], self._emp_middle[e]),
+                        "position": self._emp_position[e],
+                        "role": self._mem_role[i],
+                        "since_date": _from_ordinal(self._mem_since[i]),
+                    }
+                )
+            return result
+
+    def employee_workload(self, employee_id: int) -> list[dict]:
+        with self._lock:
+            code = self._emp_code.get(employee_id)
+            if code is None:
+                return []
+            return [
+                {
+                    "project_id": self._proj_id[self._t_project[i]],
+                    "project_name": self._proj_name[self._t_project[i]],
+                    "task_id": self._t_id[i],
+                    "task_title": self._t_title[i],
+                    "due_date": _from_ordinal(self._t_due[i]),
+                    "status": _TASK_STATUSES[self._t_status[i]],
+                }
+                for i in self._by_due_then_id_desc(self._task_positions(employee=code))
+            ]
+
+    def workload_heatmap(self, week_from: date, week_to: date) -> list[dict]:
+        """
+        Активные и просроченные задачи по сотрудникам и неделям: срок в [week_from, week_to),
+        границы — понедельники. Те же строки, что у ReportRepositoryMySql.workload_heatmap.
+        """
+        start, end = week_from.toordinal(), week_to.toordinal()
+        weeks = (end - start) // 7
+        with self._lock:
+            today = self._today()
+            if np is not None:
+                # GROUP BY (сотрудник, неделя) — bincount по ключу код * weeks + неделя
+                status = np.frombuffer(self._t_status, dtype=np.int8)
+                employee = np.frombuffer(self._t_employee, dtype=np.int32)
+                due = np.frombuffer(self._t_due, dtype=np.int32)
+                mask = (status == _NEW) | (status == _IN_PROGRESS)
+                mask &= (employee != _NONE) & (due >= start) & (due < end)
+                positions = np.flatnonzero(mask)
+                due = due[positions]
+                keys = employee[positions].astype(np.int64) * weeks + (due - start) // 7
+                size = len(self._emp_id) * weeks
+                active = np.bincount(keys, minlength=size)
+                overdue = np.bincount(keys[due < today], minlength=size)
+                cells = np.flatnonzero(active)
+                counts = {int(k): (int(a), int(o)) for k, a, o in zip(cells, active[cells], overdue[cells])}
+            else:
+                counts = {}
+                for s, e, d in zip(self._t_status, self._t_employee, self._t_due):
+                    if (s != _NEW and s != _IN_PROGRESS) or e == _NONE or not start <= d < end:
+                        continue
+                    key = e * weeks + (d - start) // 7
+                    a, o = counts.get(key, (0, 0))
+                    counts[key] = (a + 1, o + (d < today))
+
+            def order(key: int) -> tuple:
+                e = key // weeks
+                return self._emp_last[e], self._emp_first[e], self._emp_id[e], key % weeks
+
+            rows = []
+            for key in sorted(counts, key=order):
+                e, week = divmod(key, weeks)
+                a, o = counts[key]
+                rows.append(
+                    {
+                        "employee_id": self._emp_id[e],
+                        "employee_name": _full_name(self._emp_last[e], self._emp_first[e], self._emp_middle[e]),
+                        "week_start": date.fromordinal(start + week * 7),
+                        "active_tasks": a,
+                        "overdue_tasks": o,
+                    }
+                )
+            return rows
+
+    def tasks_with_names(self) -> list[dict]:
+        """То же, что TaskRepositoryMySql.list_all_with_names."""
+        with self._lock:
+            rows = []
+            for i in self._by_due_then_id_desc(self._task_positions()):
+                e = self._t_employee[i]
+                rows.append(
+                    {
+                        "id": self._t_id[i],
+                        "project_name": self._proj_name[self._t_project[i]],
+                        "employee_name": (
+                            _full_name(self._emp_last[e], self._emp_first[e], self._emp_middle[e])
+                            if e != _NONE
+                            else UNASSIGNED
+                        ),
+                        "title": self._t_title[i],
+                        "due_date": _from_ordinal(self._t_due[i]),
+                        "status": _TASK_STATUSES[self._t_status[i]],
+                    }
+                )
+            return rows
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "as_of": self._as_of,
+                "tasks": len(self._task_pos),
+                "task_slots": len(self._t_id),
+                "projects": len(self._proj_id),
+                "employees": len(self._emp_id),
+                "members": len(self._mem_role),
+                "numpy": np is not None,
+            }
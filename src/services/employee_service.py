@@ -1,34 +1,116 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Iterable, Iterator
+
 from src.core.entities import Employee
 from src.core.validation import require_non_empty, validate_email_optional, validate_employee_fio
+from src.db.repositories.base import ChangeSet, Page, PageKey
 from src.db.repositories.mysql.employee_repo import EmployeeRepositoryMySql
+from src.db.tracking import ChangeTracker
+from src.services.bulk_import import ImportReport, import_in_batches
+from src.services.cache import LookupCache
+from src.services.columnar import ColumnarSnapshot
+from src.services.identity_map import IdentityMap
 
 
 class EmployeeService:
-    def __init__(self, repo: EmployeeRepositoryMySql):
+    CACHE_KEY = "employees"
+
+    def __init__(
+        self,
+        repo: EmployeeRepositoryMySql,
+        cache: LookupCache | None = None,
+        identity: IdentityMap | None = None,
+        tracker: ChangeTracker | None = None,
+        store: ColumnarSnapshot | None = None,
+    ):
         self._repo = repo
+        self._cache = cache or LookupCache(ttl=0)
+        # Общие объекты Employee для ленивых связей Task.employee
+        self._identity = identity or IdentityMap()
+        # Снимки прочитанных записей: update_employee пишет только изменённые поля
+        self._tracker = tracker or ChangeTracker()
+        # Снимок для отчётов (см. ReportService): ФИО исполнителей в нём устаревают после записи
+        self._store = store
 
-    def list_employees(self) -> list[Employee]:
-        return self._repo.list_all()
+    def list_employees(self, *, fresh: bool = False) -> list[Employee]:
+        if not fresh:
+            return self._cache.get_or_load(self.CACHE_KEY, self._load_all)
+        self._cache.invalidate(self.CACHE_KEY)
+        employees = self._cache.get_or_load(self.CACHE_KEY, self._load_all)
+        self._identity.put(*employees)
+        return employees
 
-    def create_employee(self, e: Employee) -> int:
+    def _load_all(self) -> list[Employee]:
+        return self._tracker.track_all(self._repo.list_all())
+
+    def get_employees(self, ids: Iterable[int]) -> list[Employee]:
+        """Сотрудники с данными id (в их порядке) — без загрузки всего списка."""
+        employees = self._tracker.track_all(self._repo.get_many(ids, ordered=True))
+        self._identity.put(*employees)
+        return employees
+
+    def iter_employees(self) -> Iterator[Employee]:
+        return self._repo.iter_all()
+
+    def list_employees_page(self, after_key: PageKey | None = None, limit: int = 100) -> Page[Employee]:
+        page = self._repo.list_page(after_key, limit)
+        self._tracker.track_all(page.items)
+        return page
+
+    def server_now(self) -> datetime:
+        return self._repo.server_now()
+
+    def list_employees_changed_since(self, since: datetime) -> ChangeSet[Employee]:
+        changes = self._repo.list_changed_since(since)
+        if not changes.is_empty:
+            self._cache.invalidate(self.CACHE_KEY)
+            self._identity.apply(Employee, changes)
+            self._tracker.track_all(changes.changed)
+            for entity_id in changes.deleted_ids:
+                self._tracker.forget(Employee, entity_id)
+        return changes
+
+    def _validate(self, e: Employee) -> None:
         e.position = require_non_empty(e.position, "Должность")
         e.last_name, e.first_name, e.middle_name = validate_employee_fio(
             e.last_name, e.first_name, e.middle_name
         )
         validate_email_optional(e.email)
-        return self._repo.create(e)
+
+    def _mark_stale(self) -> None:
+        # После записи: снимок отчётов (ColumnarSnapshot) перечитает изменения при следующем чтении
+        if self._store is not None:
+            self._store.mark_stale()
+
+    def create_employee(self, e: Employee) -> int:
+        self._validate(e)
+        new_id = self._repo.create(e)
+        self._cache.invalidate(self.CACHE_KEY)
+        self._mark_stale()
+        return new_id
+
+    def create_employees_many(self, employees: Iterable[Employee], batch_size: int = 500) -> ImportReport:
+        try:
+            return import_in_batches(employees, self._validate, self._repo.create_many, self._repo.create, batch_size)
+        finally:
+            self._cache.invalidate(self.CACHE_KEY)
+            self._mark_stale()
 
     def update_employee(self, e: Employee) -> None:
-        e.position = require_non_empty(e.position, "Должность")
-        e.last_name, e.first_name, e.middle_name = validate_employee_fio(
-            e.last_name, e.first_name, e.middle_name
-        )
-        validate_email_optional(e.email)
-        self._repo.update(e)
+        self._validate(e)
+        if not self._tracker.save(e, self._repo.update, self._repo.update_fields):
+            return
+        self._cache.invalidate(self.CACHE_KEY)
+        self._identity.evict(Employee, e.id)
+        self._mark_stale()
 
     def delete_employee(self, employee_id: int) -> None:
         self._repo.delete(employee_id)
+        self._tracker.forget(Employee, employee_id)
+        self._cache.invalidate(self.CACHE_KEY)
+        self._identity.evict(Employee, employee_id)
+        self._mark_stale()
 
 
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+import threading
+import time
+
+from src.core.entities import RELATIONS
+from src.db.repositories.base import ChangeSet, Page, PageKey
+
+
+T = TypeVar("T")
+
+# Загрузка сущностей по списку id (WHERE id IN (...)); отсутствующих в БД в ответе нет
+Loader = Callable[[list[int]], list[Any]]
+
+
+@dataclass(slots=True)
+class _Entry:
+    entity: Any  # None — строки в БД нет
+    loaded_at: float
+
+
+class IdentityMap:
+    """
+    Общие для всего приложения объекты Client/Employee/Project по (тип, id).
+
+    Через карту разрешаются ленивые связи сущностей (Project.client, Task.project,
+    Task.employee). Промахи не грузятся по одному: track()/prefetch() запоминают id,
+    на которые ссылается очередная порция строк, и первое же обращение (или prefetch)
+    забирает их все одним запросом WHERE id IN (...) на тип.
+
+    Сервисы держат карту в актуальном состоянии при своих изменениях и дельтах;
+    изменения других пользователей подхватывает prefetch() по истечении TTL.
+    """
+
+    # Сущностей на странице iter_pages
+    PAGE_SIZE = 500
+
+    def __init__(self, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self._ttl = ttl
+        self._clock = clock
+        self._loaders: dict[type, Loader] = {}
+        self._entries: dict[type, dict[int, _Entry]] = {}
+        self._pending: dict[type, set[int]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, cls: type, loader: Loader) -> None:
+        self._loaders[cls] = loader
+        self._entries.setdefault(cls, {})
+        self._pending.setdefault(cls, set())
+
+    # ---- чтение ----
+    def get(self, cls: type[T], entity_id: int) -> Optional[T]:
+        """Сущность по id; промах догружается вместе со всеми отложенными id этого типа."""
+        if cls not in self._loaders:
+            return None
+        with self._lock:
+            entry = self._entries[cls].get(entity_id)
+            if entry is not None:
+                return entry.entity
+            self._pending[cls].add(entity_id)
+        self._load_pending(cls)
+        with self._lock:
+            entry = self._entries[cls].get(entity_id)
+        return None if entry is None else entry.entity
+
+    def get_many(self, cls: type[T], ids: Iterable[int]) -> dict[int, T]:
+        if cls not in self._loaders:
+            return {}
+        ids = set(ids)
+        self._defer(cls, ids, expired=False)
+        self._load_pending(cls)
+        with self._lock:
+            entries = self._entries[cls]
+            return {i: entries[i].entity for i in ids if i in entries and entries[i].entity is not None}
+
+    # ---- отложенная загрузка связей ----
+    def track(self, entities: Iterable[Any]) -> None:
+        """Запомнить id связанных сущностей; загрузятся при первом обращении к любой из них."""
+        for cls, ids in self._referenced(entities).items():
+            self._defer(cls, ids, expired=False)
+
+    def prefetch(self, entities: Iterable[Any]) -> int:
+        """
+        Загрузить связанные сущности сразу (в фоновом потоке, чтобы отрисовка таблицы
+        не ходила в БД). Устаревшие по TTL перечитываются. Возвращает число загруженных строк.
+        """
+        loaded = 0
+        for cls, ids in self._referenced(entities).items():
+            self._defer(cls, ids, expired=True)
+            loaded += self._load_pending(cls)
+        return loaded
+
+    def iter_pages(
+        self, fetch_page: Callable[[Optional[PageKey], int], Page[T]], page_size: int = PAGE_SIZE
+    ) -> Iterator[T]:
+        """
+        Все сущности постранично (keyset, `fetch_page(after_key, limit)`), связи каждой
+        страницы загружены заранее (для выгрузки). Страница читается целиком до prefetch:
+        открытого потокового курсора нет, и запросы связей не ждут соединения.
+        """
+        after_key: Optional[PageKey] = None
+        while True:
+            page = fetch_page(after_key, page_size)
+            self.prefetch(page.items)
+            yield from page.items
+            if not page.has_more:
+                return
+            after_key = page.next_key
+
+    def _referenced(self, entities: Iterable[Any]) -> dict[type, set[int]]:
+        wanted: dict[type, set[int]] = {}
+        for e in entities:
+            for attr, cls in RELATIONS.get(type(e), ()):
+                ref = getattr(e, attr)
+                if ref is not None and cls in self._loaders:
+                    wanted.setdefault(cls, set()).add(ref)
+        return wanted
+
+    def _defer(self, cls: type, ids: Iterable[int], *, expired: bool) -> None:
+        now = self._clock()
+        with self._lock:
+            entries = self._entries[cls]
+            pending = self._pending[cls]
+            for i in ids:
+                entry = entries.get(i)
+                if entry is None or (expired and now - entry.loaded_at >= self._ttl):
+                    pending.add(i)
+
+    def _load_pending(self, cls: type) -> int:
+        with self._lock:
+            ids = sorted(self._pending[cls])
+            self._pending[cls].clear()
+        if not ids:
+            return 0
+
+        # Запросы к БД выполняем без блокировки; на порции IN (...) список делит репозиторий
+        found: dict[int, Any] = {e.id: e for e in self._loaders[cls](ids)}
+
+        now = self._clock()
+        with self._lock:
+            entries = self._entries[cls]
+            for i in ids:
+                entries[i] = _Entry(found.get(i), now)
+        return len(found)
+
+    # ---- обновление сервисами ----
+    def put(self, *entities: Any) -> None:
+        now = self._clock()
+        with self._lock:
+            for e in entities:
+                entries = self._entries.get(type(e))
+                if entries is not None and e.id is not None:
+                    entries[e.id] = _Entry(e, now)
+
+    def evict(self, cls: type, *ids: Optional[int]) -> None:
+        with self._lock:
+            entries = self._entries.get(cls)
+            if entries is None:
+                return
+            for i in ids:
+                entries.pop(i, None)
+
+    def apply(self, cls: type, changes: ChangeSet[Any]) -> None:
+        """Применить дельту list_changed_since: изменённые заменяются, удалённые забываются."""
+        self.put(*changes.changed)
+        self.evict(cls, *changes.deleted_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            for entries in self._entries.values():
+                entries.clear()
+            for pending in self._pending.values():
+                pending.clear()
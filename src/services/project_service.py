@@ -1,32 +1,94 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
+from typing import Iterable, Iterator
 
 from src.core.entities import Project, ProjectMember
 from src.core.errors import ValidationError
 from src.core.validation import require_non_empty
+from src.db.repositories.base import ChangeSet, Page, PageKey
 from src.db.repositories.mysql.project_member_repo import ProjectMemberRepositoryMySql
 from src.db.repositories.mysql.project_repo import ProjectRepositoryMySql
+from src.db.tracking import ChangeTracker
+from src.services.bulk_import import ImportReport, import_in_batches
+from src.services.cache import LookupCache
+from src.services.columnar import ColumnarSnapshot
+from src.services.identity_map import IdentityMap
 
 
 class ProjectService:
     PROJECT_STATUSES = ["Planned", "Active", "Completed", "OnHold", "Canceled"]
+    CACHE_KEY = "projects"
 
     def __init__(
         self,
         project_repo: ProjectRepositoryMySql,
         member_repo: ProjectMemberRepositoryMySql,
+        cache: LookupCache | None = None,
+        identity: IdentityMap | None = None,
+        tracker: ChangeTracker | None = None,
+        store: ColumnarSnapshot | None = None,
     ):
         self._projects = project_repo
         self._members = member_repo
+        self._cache = cache or LookupCache(ttl=0)
+        # Общие объекты Project (Task.project) и разрешение Project.client
+        self._identity = identity or IdentityMap()
+        # Снимки прочитанных записей: update_project пишет только изменённые поля
+        self._tracker = tracker or ChangeTracker()
+        # Снимок для отчётов (см. ReportService): проекты и участники в нём устаревают после записи
+        self._store = store
 
-    def list_projects(self) -> list[Project]:
-        return self._projects.list_all()
+    def list_projects(self, *, fresh: bool = False) -> list[Project]:
+        if not fresh:
+            return self._cache.get_or_load(self.CACHE_KEY, self._load_all)
+        self._cache.invalidate(self.CACHE_KEY)
+        projects = self._cache.get_or_load(self.CACHE_KEY, self._load_all)
+        # Только что прочитанные объекты становятся общими и для Task.project
+        self._identity.put(*projects)
+        return projects
+
+    def _load_all(self) -> list[Project]:
+        return self._tracker.track_all(self._projects.list_all())
+
+    def get_projects(self, ids: Iterable[int]) -> list[Project]:
+        """Проекты с данными id (в их порядке) — без загрузки всего списка."""
+        projects = self._tracker.track_all(self._projects.get_many(ids, ordered=True))
+        self._identity.put(*projects)
+        return projects
 
     def list_projects_view(self) -> list[dict]:
         return self._projects.list_all_with_client_name()
 
-    def create_project(self, p: Project) -> int:
+    def iter_projects(self) -> Iterator[Project]:
+        return self._identity.iter_pages(self._projects.list_page)
+
+    def load_relations(self, projects: Iterable[Project]) -> int:
+        """Загрузить клиентов проектов (одним запросом); число перечитанных из БД строк."""
+        return self._identity.prefetch(projects)
+
+    def list_projects_page(self, after_key: PageKey | None = None, limit: int = 100) -> Page[Project]:
+        page = self._projects.list_page(after_key, limit)
+        self._tracker.track_all(page.items)
+        return page
+
+    def list_projects_view_page(self, after_key: PageKey | None = None, limit: int = 100) -> Page[dict]:
+        return self._projects.list_page_with_client_name(after_key, limit)
+
+    def server_now(self) -> datetime:
+        return self._projects.server_now()
+
+    def list_projects_changed_since(self, since: datetime) -> ChangeSet[Project]:
+        changes = self._projects.list_changed_since(since)
+        if not changes.is_empty:
+            self._cache.invalidate(self.CACHE_KEY)
+            self._identity.apply(Project, changes)
+            self._tracker.track_all(changes.changed)
+            for project_id in changes.deleted_ids:
+                self._tracker.forget(Project, project_id)
+        return changes
+
+    def _validate(self, p: Project) -> None:
         p.name = require_non_empty(p.name, "Название проекта")
         if p.client_id <= 0:
             raise ValidationError("Не выбран клиент.")
@@ -34,20 +96,53 @@ class ProjectService:
             raise ValidationError("Не указана дата начала проекта.")
         if p.status not in self.PROJECT_STATUSES:
             p.status = "Active"
-        return self._projects.create(p)
+
+    def _mark_stale(self) -> None:
+        # После записи: снимок отчётов (ColumnarSnapshot) перечитает изменения при следующем чтении
+        if self._store is not None:
+            self._store.mark_stale()
+
+    def create_project(self, p: Project) -> int:
+        self._validate(p)
+        new_id = self._projects.create(p)
+        self._cache.invalidate(self.CACHE_KEY)
+        self._mark_stale()
+        return new_id
+
+    def create_project_with_members(self, p: Project, members: Iterable[tuple[int, str]]) -> int:
+        """Проект и его состав (employee_id, role) — одной транзакцией."""
+        self._validate(p)
+        members = [(employee_id, require_non_empty(role, "Роль")) for employee_id, role in members]
+        with self._projects.transaction():
+            new_id = self._projects.create(p)
+            self._members.set_members(new_id, members)
+        self._cache.invalidate(self.CACHE_KEY)
+        self._mark_stale()
+        return new_id
+
+    def create_projects_many(self, projects: Iterable[Project], batch_size: int = 500) -> ImportReport:
+        try:
+            return import_in_batches(
+                projects, self._validate, self._projects.create_many, self._projects.create, batch_size
+            )
+        finally:
+            self._cache.invalidate(self.CACHE_KEY)
+            self._mark_stale()
 
     def update_project(self, p: Project) -> None:
-        p.name = require_non_empty(p.name, "Название проекта")
-        if p.client_id <= 0:
-            raise ValidationError("Не выбран клиент.")
-        if p.start_date is None or not isinstance(p.start_date, date):
-            raise ValidationError("Не указана дата начала проекта.")
-        if p.status not in self.PROJECT_STATUSES:
-            p.status = "Active"
-        self._projects.update(p)
+        self._validate(p)
+        if not self._tracker.save(p, self._projects.update, self._projects.update_fields):
+            return
+        self._cache.invalidate(self.CACHE_KEY)
+        self._identity.evict(Project, p.id)
+        self._mark_stale()
 
     def delete_project(self, project_id: int) -> None:
         self._projects.delete(project_id)
+        self._tracker.forget(Project, project_id)
+        self._cache.invalidate(self.CACHE_KEY)
+        self._identity.evict(Project, project_id)
+        self._mark_stale()
 
     # ---- Members ----
     def list_project_members(self, project_id: int) -> list[dict]:
@@ -56,8 +151,25 @@ class ProjectService:
     def add_project_member(self, project_id: int, employee_id: int, role: str) -> None:
         role = require_non_empty(role, "Роль")
         self._members.add_member(project_id, employee_id, role)
+        self._mark_stale()
 
     def remove_project_member(self, project_id: int, employee_id: int) -> None:
         self._members.remove_member(project_id, employee_id)
+        self._mark_stale()
 
+    def set_project_members(self, project_id: int, members: Iterable[tuple[int, str]]) -> None:
+        """Заменить состав проекта парами (employee_id, role) — одной транзакцией."""
+        members = [(employee_id, require_non_empty(role, "Роль")) for employee_id, role in members]
+        self._members.set_members(project_id, members)
+        self._mark_stale()
 
+    def change_project_members(
+        self, project_id: int, upserts: Iterable[tuple[int, str]], removed: Iterable[int]
+    ) -> None:
+        """
+        Применить изменения состава (добавленные/сменившие роль и исключённые) одной
+        транзакцией; участников, которых изменения не касаются, не трогает.
+        """
+        upserts = [(employee_id, require_non_empty(role, "Роль")) for employee_id, role in upserts]
+        self._members.change_members(project_id, upserts, removed)
+        self._mark_stale()
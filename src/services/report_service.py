@@ -1,22 +1,109 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
+from typing import Any, Iterator
+
+from src.core.errors import ValidationError
 from src.db.repositories.mysql.report_repo import ReportRepositoryMySql
+from src.services.columnar import ColumnarSnapshot
+
+
+# Не больше стольких недель в отчёте загрузки по неделям (столбцов матрицы)
+MAX_HEATMAP_WEEKS = 106
+
+
+def _week_range(date_from: date, date_to: date) -> tuple[date, date]:
+    """Период [понедельник недели date_from, понедельник после недели date_to)."""
+    if date_from > date_to:
+        raise ValidationError("Начало периода позже его конца.")
+    start = date_from - timedelta(days=date_from.weekday())
+    end = date_to + timedelta(days=7 - date_to.weekday())
+    if (end - start).days // 7 > MAX_HEATMAP_WEEKS:
+        raise ValidationError(f"Период отчёта — не больше {MAX_HEATMAP_WEEKS} недель.")
+    return start, end
+
+
+def _week_label(monday: date) -> str:
+    year, week, _ = monday.isocalendar()
+    return f"{year}-W{week:02d}"
 
 
 class ReportService:
-    def __init__(self, repo: ReportRepositoryMySql):
+    def __init__(self, repo: ReportRepositoryMySql, store: ColumnarSnapshot | None = None):
         self._repo = repo
+        # Снимок в памяти ([reports] columnar = true): отчёты считаются без запросов к MySQL
+        self._store = store
+
+    def _snapshot(self) -> ColumnarSnapshot | None:
+        if self._store is not None:
+            self._store.ensure_fresh()
+        return self._store
 
     def projects_by_client(self, client_id: int) -> list[dict]:
+        store = self._snapshot()
+        if store is not None:
+            return store.projects_by_client(client_id)
         return self._repo.projects_by_client(client_id)
 
-    def overdue_projects(self) -> list[dict]:
+    def overdue_projects(self, *, live: bool = False) -> list[dict]:
+        """
+        По умолчанию — из снимка в памяти или сводной таблицы (быстро); live=True — прямой
+        запрос по всем задачам. Без сводной таблицы (не применена миграция 002) и без снимка
+        всегда выполняется прямой запрос.
+        """
+        if not live:
+            store = self._snapshot()
+            if store is not None:
+                return store.overdue_projects()
+            rows = self._repo.overdue_projects_summary()
+            if rows is not None:
+                return rows
         return self._repo.overdue_projects()
 
     def employees_by_project(self, project_id: int) -> list[dict]:
+        store = self._snapshot()
+        if store is not None:
+            return store.employees_by_project(project_id)
         return self._repo.employees_by_project(project_id)
 
     def employee_workload(self, employee_id: int) -> list[dict]:
+        store = self._snapshot()
+        if store is not None:
+            return store.employee_workload(employee_id)
         return self._repo.employee_workload(employee_id)
 
+    def workload_heatmap(self, date_from: date, date_to: date) -> list[dict]:
+        """
+        Активные задачи и из них просроченные по каждому сотруднику и ISO-неделе срока —
+        одной группировкой по всем сотрудникам. Строки: employee_id, employee_name,
+        week_start (понедельник), active_tasks, overdue_tasks; пустые ячейки не возвращаются.
+        """
+        start, end = _week_range(date_from, date_to)
+        store = self._snapshot()
+        if store is not None:
+            return store.workload_heatmap(start, end)
+        return self._repo.workload_heatmap(start, end)
+
+    def workload_matrix(self, date_from: date, date_to: date) -> tuple[list[str], list[dict]]:
+        """
+        workload_heatmap в виде матрицы: строка — сотрудник, столбец — неделя («2025-W03»),
+        ячейка — «активных (просроченных)». Возвращает заголовки и строки.
+        """
+        start, end = _week_range(date_from, date_to)
+        weeks = [start + timedelta(weeks=i) for i in range((end - start).days // 7)]
+        labels = {w: _week_label(w) for w in weeks}
+        rows: list[dict] = []
+        current: dict | None = None
+        for cell in self.workload_heatmap(date_from, date_to):
+            if current is None or current["employee_id"] != cell["employee_id"]:
+                current = {"employee_id": cell["employee_id"], "employee_name": cell["employee_name"]}
+                current.update((label, "") for label in labels.values())
+                rows.append(current)
+            active, overdue = cell["active_tasks"], cell["overdue_tasks"]
+            current[labels[cell["week_start"]]] = f"{active} ({overdue})" if overdue else str(active)
+        return ["employee_id", "employee_name", *labels.values()], rows
+
+    def iter_report(self, report: str, *params: Any) -> Iterator[dict]:
+        return self._repo.iter_report(report, params)
+
 
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+import re
+
+from src.core.errors import ValidationError
+from src.db.repositories.base import Page, PageKey
+from src.db.repositories.mysql.search_repo import SEARCH_KINDS, SearchRepositoryMySql
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Слова короче innodb_ft_min_token_size (по умолчанию 3) в индекс не попадают
+MIN_TOKEN = 3
+MAX_TERMS = 8
+
+# Частые окончания русских слов, от длинных к коротким. Вместо морфологии — поиск
+# по префиксу: «задачами» -> «задач*» найдёт и «задача», и «задачи».
+_ENDINGS = tuple(
+    sorted(
+        (
+            "иями", "ями", "ами", "ией", "иям", "иях", "ого", "ему", "ому", "ыми", "ими",
+            "ая", "яя", "ое", "ее", "ые", "ие", "ой", "ей", "ий", "ый", "ом", "ем", "ам",
+            "ям", "ах", "ях", "ов", "ев", "ую", "юю", "ия", "ью",
+            "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+        ),
+        key=len,
+        reverse=True,
+    )
+)
+_MIN_STEM = 4
+
+
+def _stem(word: str) -> str:
+    for ending in _ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+            return word[: -len(ending)]
+    return word
+
+
+def build_query(text: str) -> str:
+    """Текст пользователя -> запрос BOOLEAN MODE: каждое слово обязательно, по префиксу основы."""
+    terms: list[str] = []
+    for word in _WORD.findall(text.lower().replace("ё", "е")):
+        if len(word) < MIN_TOKEN:
+            continue
+        term = f"+{_stem(word)}*"
+        if term not in terms:
+            terms.append(term)
+    if not terms:
+        raise ValidationError(f"Введите слово для поиска (не короче {MIN_TOKEN} символов).")
+    return " ".join(terms[:MAX_TERMS])
+
+
+class SearchService:
+    """Поиск по задачам, проектам и клиентам (индексы FULLTEXT), результаты по релевантности."""
+
+    def __init__(self, repo: SearchRepositoryMySql):
+        self._repo = repo
+
+    def search(
+        self,
+        text: str,
+        after_key: Optional[PageKey] = None,
+        limit: int = 50,
+        kinds: Iterable[str] = SEARCH_KINDS,
+    ) -> Page[dict]:
+        """
+        Страница результатов: dict(kind, id, title, detail, score), kind — "task" / "project" /
+        "client". Следующая страница — search(text, page.next_key).
+        """
+        query = build_query(text)
+        offset = after_key[0] if after_key else 0
+        rows = self._repo.search(query, kinds, limit + 1, offset)
+        if len(rows) <= limit:
+            return Page(rows, None)
+        return Page(rows[:limit], (offset + limit,))
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+import threading
+
+from src.core.errors import DatabaseError
+from src.db.repositories.mysql.base_mysql_repo import is_missing_schema
+from src.db.repositories.mysql.sync_repo import (
+    APPLIED,
+    MISSING,
+    SYNC_TABLES,
+    SyncRepositoryMySql,
+    is_rejected,
+)
+from src.db.repositories.sqlite.replica_repo import ReplicaRepositorySqlite, is_local_id
+
+
+# Строк сервера на одну локальную транзакцию при загрузке
+_PULL_BATCH = 2000
+
+
+@dataclass(frozen=True, slots=True)
+class SyncResult:
+    pushed: int
+    pulled: int
+    conflicts: int
+
+
+@dataclass(frozen=True, slots=True)
+class SyncStatus:
+    pending: int
+    conflicts: int
+    last_sync: Optional[datetime]
+    last_error: Optional[str]
+
+
+class SyncService:
+    """
+    Двусторонняя синхронизация локальной копии (SQLite) с MySQL.
+
+    Изменения приложения копятся в очереди sync_outbox (триггеры sql/sqlite/replica.sql)
+    и отправляются по порядку; затем с сервера загружаются строки, изменённые с прошлой
+    загрузки (updated_at + deleted_rows; участники проектов — миграция 005). Версия строки — её updated_at на сервере:
+    если с момента загрузки строку изменил кто-то другой, побеждает сервер, а локальные
+    значения записываются в sync_conflicts.
+
+    Без связи цикл завершается ошибкой, очередь сохраняется и уходит при следующем.
+    """
+
+    def __init__(self, local: ReplicaRepositorySqlite, remote: SyncRepositoryMySql, interval: float = 10.0):
+        self._local = local
+        self._remote = remote
+        self._interval = interval
+        self._lock = threading.Lock()  # не больше одного цикла одновременно
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_sync: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+
+    # ---- фоновый поток ----
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def request_sync(self) -> None:
+        """Запустить цикл, не дожидаясь интервала (например, после сохранения)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sync_now()
+            except DatabaseError:
+                pass  # сохранено в last_error, повтор — через интервал
+            self._wake.wait(self._interval)
+            self._wake.clear()
+
+    def status(self) -> SyncStatus:
+        return SyncStatus(
+            pending=self._local.pending_count(),
+            conflicts=self._local.conflict_count(),
+            last_sync=self._last_sync,
+            last_error=self._last_error,
+        )
+
+    # ---- цикл ----
+    def sync_now(self) -> SyncResult:
+        with self._lock:
+            try:
+                pushed, conflicts = self._push()
+                pulled = self._pull()
+            except DatabaseError as e:
+                self._last_error = str(e)
+                raise
+            self._last_sync = datetime.now()
+            self._last_error = None
+            return SyncResult(pushed, pulled, conflicts)
+
+    def _push(self) -> tuple[int, int]:
+        pushed = conflicts = 0
+        while True:
+            batch = self._local.pending()
+            if not batch:
+                return pushed, conflicts
+            # Из нескольких изменений строки подряд отправляется последнее
+            last = {(e["table_name"], e["row_id"], e["key2"]): e["seq"] for e in batch}
+            for entry in batch:
+                key = (entry["table_name"], entry["row_id"], entry["key2"])
+                if entry["op"] == "update" and last[key] != entry["seq"]:
+                    self._local.done([entry["seq"]])
+                    continue
+                try:
+                    conflict = self._push_one(entry)
+                except DatabaseError as e:
+                    if not is_rejected(e):
+                        self._local.failed(entry["seq"], str(e))
+                        raise
+                    self._conflict(entry, f"Сервер отклонил изменение: {e}")
+                    conflict = True
+                self._local.done([entry["seq"]])
+                pushed += 1
+                conflicts += conflict
+                # После вставки id строки в очереди заменены: остаток пакета читается заново
+                if entry["op"] == "insert" and entry["table_name"] in SYNC_TABLES:
+                    break
+
+    def _push_one(self, entry: dict) -> bool:
+        """Отправить одно изменение; True — конфликт (побеждает сервер)."""
+        table, row_id, op = entry["table_name"], entry["row_id"], entry["op"]
+        if table == "project_members":
+            project_id, employee_id = row_id, entry["key2"]
+            if is_local_id(project_id) or is_local_id(employee_id):
+                return False  # проект или сотрудник не попал на сервер
+            if op == "delete":
+                self._remote.remove_member(project_id, employee_id)
+                return False
+            member = self._local.get_member(project_id, employee_id)
+            if member is not None:
+                self._remote.add_member(project_id, employee_id, member["role"], member["since_date"])
+            return False
+
+        values = self._local.get_row(table, row_id)
+        if op == "insert":
+            if values is not None:
+                server_id, version = self._remote.insert(table, values)
+                self._local.remap(table, row_id, server_id, version)
+            return False
+        if is_local_id(row_id):
+            return False  # вставка строки отклонена сервером — отправлять нечего
+        version = self._local.version(table, row_id)
+        if op == "delete":
+            if self._remote.delete(table, row_id, version) == APPLIED:
+                return False
+            self._conflict(entry, "Строка изменена на сервере после загрузки, удаление отменено.")
+            return True
+        if values is None:
+            return False  # удалена позже: уйдёт следующим изменением в очереди
+        outcome, current = self._remote.update(table, row_id, values, version)
+        if outcome == APPLIED:
+            assert current is not None
+            self._local.set_version(table, row_id, current)
+            return False
+        reason = "Строка удалена на сервере." if outcome == MISSING else "Строка изменена на сервере после загрузки."
+        self._conflict(entry, reason, values)
+        return True
+
+    def _conflict(self, entry: dict, reason: str, values: Optional[dict] = None) -> None:
+        table, row_id = entry["table_name"], entry["row_id"]
+        self._local.add_conflict(table, row_id, entry["op"], reason, values)
+        if table not in SYNC_TABLES or is_local_id(row_id):
+            return
+        # Локальная строка — как на сервере; пока изменение в очереди, apply её не тронет
+        self._local.done([entry["seq"]])
+        row = self._remote.get_row(table, row_id)
+        try:
+            if row is None:
+                self._local.apply(table, [], [row_id])
+            else:
+                self._local.apply(table, [row])
+        except DatabaseError:
+            # Например, родительская строка удалена локально и ещё не отправлена:
+            # строка догрузится при следующей загрузке после её отправки
+            pass
+
+    def _pull(self) -> int:
+        pulled = 0
+        for table in SYNC_TABLES:
+            since = self._local.sync_state(table)
+            as_of = self._remote.server_now()
+            batch: list[tuple] = []
+            # Строки с неотправленными изменениями пропускает apply — в своей транзакции
+            for row in self._remote.iter_changed(table, since):
+                batch.append(row)
+                if len(batch) >= _PULL_BATCH:
+                    self._local.apply(table, batch)
+                    pulled += len(batch)
+                    batch = []
+            deleted: list[int] = []
+            if since is not None:
+                deleted = self._remote.deleted_since(table, since)
+            self._local.apply(table, batch, deleted, as_of)
+            pulled += len(batch) + len(deleted)
+        return pulled + self._pull_members()
+
+    def _pull_members(self) -> int:
+        since = self._local.sync_state("project_members")
+        as_of = self._remote.server_now()
+        if since is not None:
+            try:
+                changed = self._remote.members_changed_since(since)
+            except DatabaseError as e:
+                if not is_missing_schema(e):
+                    raise
+                # На сервере нет миграции 005 — состав сверяется целиком
+            else:
+                # Проекты, из которых удаляли участников: их состав сверяется целиком
+                touched = self._remote.deleted_since("project_members", since)
+                rows = changed + self._remote.list_members(touched)
+                return self._local.replace_members(rows, touched, as_of)
+        return self._local.replace_members(self._remote.list_members(), None, as_of)
@@ -1,26 +1,106 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
+from typing import Iterable, Iterator
 
 from src.core.entities import Task
 from src.core.errors import ValidationError
 from src.core.validation import require_non_empty, validate_completed_at_not_future
+from src.db.repositories.base import ChangeSet, Page, PageKey, TaskFilter
+from src.db.repositories.mysql.report_repo import ReportRepositoryMySql
 from src.db.repositories.mysql.task_repo import TaskRepositoryMySql
+from src.db.tracking import ChangeTracker
+from src.services.bulk_import import ImportReport, import_in_batches
+from src.services.columnar import ColumnarSnapshot
+from src.services.identity_map import IdentityMap
 
 
 class TaskService:
     TASK_STATUSES = ["New", "InProgress", "Done", "Canceled"]
 
-    def __init__(self, repo: TaskRepositoryMySql):
+    def __init__(
+        self,
+        repo: TaskRepositoryMySql,
+        reports: ReportRepositoryMySql | None = None,
+        store: ColumnarSnapshot | None = None,
+        identity: IdentityMap | None = None,
+        tracker: ChangeTracker | None = None,
+    ):
         self._repo = repo
+        # Поддержка сводки просроченных задач (отчёт overdue_projects)
+        self._reports = reports
+        # Снимок задач в памяти (см. ReportService); после изменений помечается устаревшим
+        self._store = store
+        # Разрешение Task.project / Task.employee
+        self._identity = identity or IdentityMap()
+        # Снимки прочитанных задач: update_task пишет только изменённые поля
+        self._tracker = tracker or ChangeTracker()
 
     def get_task(self, task_id: int) -> Task | None:
-        return self._repo.get_by_id(task_id)
+        task = self._repo.get_by_id(task_id)
+        return None if task is None else self._tracker.track(task)
 
     def list_tasks_view(self) -> list[dict]:
+        if self._store is not None:
+            self._store.ensure_fresh()
+            return self._store.tasks_with_names()
         return self._repo.list_all_with_names()
 
-    def create_task(self, t: Task) -> int:
+    def iter_tasks_view(self) -> Iterator[dict]:
+        return self._repo.iter_all_with_names()
+
+    def iter_tasks(self, filters: TaskFilter | None = None, sort: str = "default") -> Iterator[Task]:
+        if filters is None:
+            return self._identity.iter_pages(lambda after_key, limit: self._repo.list_page(after_key, limit, sort))
+        self._check_filter(filters)
+        return self._identity.iter_pages(lambda after_key, limit: self._repo.query(filters, sort, after_key, limit))
+
+    def load_relations(self, tasks: Iterable[Task]) -> int:
+        """Загрузить проекты и исполнителей задач (по запросу на тип); число перечитанных строк."""
+        return self._identity.prefetch(tasks)
+
+    def list_tasks_page(self, after_key: PageKey | None = None, limit: int = 100) -> Page[Task]:
+        page = self._repo.list_page(after_key, limit)
+        self._tracker.track_all(page.items)
+        return page
+
+    def query_tasks(
+        self,
+        filters: TaskFilter,
+        sort: str = "default",
+        after_key: PageKey | None = None,
+        limit: int = 100,
+    ) -> Page[Task]:
+        """Страница задач с фильтрами и сортировкой на стороне сервера."""
+        self._check_filter(filters)
+        page = self._repo.query(filters, sort, after_key, limit)
+        self._tracker.track_all(page.items)
+        return page
+
+    def _check_filter(self, f: TaskFilter) -> None:
+        unknown = [s for s in f.statuses if s not in self.TASK_STATUSES]
+        if unknown:
+            raise ValidationError(f"Неизвестный статус задачи: {', '.join(unknown)}.")
+        if f.due_from is not None and f.due_to is not None and f.due_from > f.due_to:
+            raise ValidationError("Начало периода по сроку позже его конца.")
+
+    def list_tasks_view_page(self, after_key: PageKey | None = None, limit: int = 100) -> Page[dict]:
+        return self._repo.list_page_with_names(after_key, limit)
+
+    def server_now(self) -> datetime:
+        return self._repo.server_now()
+
+    def list_tasks_changed_since(self, since: datetime) -> ChangeSet[Task]:
+        changes = self._repo.list_changed_since(since)
+        self._tracker.track_all(changes.changed)
+        for task_id in changes.deleted_ids:
+            self._tracker.forget(Task, task_id)
+        return changes
+
+    def list_tasks_view_changed_since(self, since: datetime) -> ChangeSet[dict]:
+        return self._repo.list_changed_with_names_since(since)
+
+    def _validate(self, t: Task) -> None:
         t.title = require_non_empty(t.title, "Название задачи")
         if t.project_id <= 0:
             raise ValidationError("Не выбран проект.")
@@ -29,20 +109,78 @@ class TaskService:
         if t.status not in self.TASK_STATUSES:
             t.status = "New"
         validate_completed_at_not_future(t.completed_at)
-        return self._repo.create(t)
+
+    def _refresh_overdue(self, *project_ids: int | None) -> None:
+        if self._reports is not None:
+            self._reports.refresh_overdue_summary(pid for pid in project_ids if pid is not None)
+
+    def _mark_stale(self) -> None:
+        # После COMMIT: иначе снимок мог бы успеть перечитать задачи до фиксации изменения
+        if self._store is not None:
+            self._store.mark_stale()
+
+    def _project_of(self, task_id: int) -> int | None:
+        if self._reports is None:
+            return None
+        old = self._repo.get_by_id(task_id)
+        return old.project_id if old is not None else None
+
+    # Запись задачи и пересчёт сводки просроченных — одна транзакция: атомарно и с одним COMMIT
+    def create_task(self, t: Task) -> int:
+        self._validate(t)
+        with self._repo.transaction():
+            task_id = self._repo.create(t)
+            self._refresh_overdue(t.project_id)
+        self._mark_stale()
+        return task_id
+
+    def create_tasks(self, tasks: Iterable[Task]) -> list[int]:
+        """Несколько задач целиком или ни одной (в отличие от create_tasks_many) — их id по порядку."""
+        tasks = list(tasks)
+        for t in tasks:
+            self._validate(t)
+        with self._repo.transaction():
+            ids = [self._repo.create(t) for t in tasks]
+            self._refresh_overdue(*{t.project_id for t in tasks})
+        self._mark_stale()
+        return ids
+
+    def create_tasks_many(self, tasks: Iterable[Task], batch_size: int = 500) -> ImportReport:
+        touched: set[int] = set()
+
+        def validate(t: Task) -> None:
+            self._validate(t)
+            touched.add(t.project_id)
+
+        report = import_in_batches(tasks, validate, self._repo.create_many, self._repo.create, batch_size)
+        self._refresh_overdue(*touched)
+        self._mark_stale()
+        return report
 
     def update_task(self, t: Task) -> None:
-        t.title = require_non_empty(t.title, "Название задачи")
-        if t.project_id <= 0:
-            raise ValidationError("Не выбран проект.")
-        if t.due_date is None or not isinstance(t.due_date, date):
-            raise ValidationError("Не указан срок (due_date).")
-        if t.status not in self.TASK_STATUSES:
-            t.status = "New"
-        validate_completed_at_not_future(t.completed_at)
-        self._repo.update(t)
+        self._validate(t)
+        if self._tracker.diff(t) == {}:
+            return  # изменений нет — и транзакция не нужна
+        # Задачу могли перенести в другой проект — пересчитываем оба
+        before = self._tracker.snapshot(Task, t.id)
+        old_project_id = before["project_id"] if before is not None else self._project_of(t.id)
+        try:
+            with self._repo.transaction():
+                if not self._tracker.save(t, self._repo.update, self._repo.update_fields):
+                    return
+                self._refresh_overdue(old_project_id, t.project_id)
+        except BaseException:
+            # Снимок уже обновлён save(), а запись откатилась: следующее сохранение — целиком
+            self._tracker.forget(Task, t.id)
+            raise
+        self._mark_stale()
 
     def delete_task(self, task_id: int) -> None:
-        self._repo.delete(task_id)
+        with self._repo.transaction():
+            project_id = self._project_of(task_id)
+            self._repo.delete(task_id)
+            self._refresh_overdue(project_id)
+        self._tracker.forget(Task, task_id)
+        self._mark_stale()
 
 
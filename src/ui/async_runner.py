@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+import itertools
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.db.instrumentation import query_source
+
+
+ResultCallback = Callable[[Any], None]
+ErrorCallback = Callable[[Exception], None]
+
+
+class _Signals(QObject):
+    # Сигналы испускаются из рабочего потока, слоты выполняются в GUI-потоке.
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class _Job(QRunnable):
+    def __init__(
+        self, ticket: int, source: str, fn: Callable[..., Any], args: tuple[Any, ...], signals: _Signals
+    ):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.ticket = ticket
+        self.source = source
+        self.cancelled = False
+        self._fn = fn
+        self._args = args
+        self._signals = signals
+
+    def run(self) -> None:
+        if self.cancelled:
+            # Снята после выхода из очереди: сигнал всё равно нужен, чтобы _take освободил запись
+            self._signals.finished.emit(self.ticket, None)
+            return
+        try:
+            with query_source(self.source):
+                result = self._fn(*self._args)
+        except Exception as e:  # noqa: BLE001 - ошибку передаём в GUI-поток
+            self._signals.failed.emit(self.ticket, e)
+        else:
+            self._signals.finished.emit(self.ticket, result)
+
+
+@dataclass(slots=True)
+class _Pending:
+    key: str
+    job: _Job
+    on_result: ResultCallback
+    on_error: Optional[ErrorCallback]
+
+
+class QueryRunner(QObject):
+    """
+    Выполняет вызовы сервисов в фоновом QThreadPool, чтобы запросы к MySQL
+    не блокировали цикл событий Qt. Результат возвращается в GUI-поток через сигналы.
+
+    Задачи именуются ключом: новая задача с тем же ключом отменяет предыдущую
+    (ещё не начатая снимается с очереди, результат уже запущенной отбрасывается).
+
+    Запросы задачи помечаются в статистике источником "<имя>:<ключ>"
+    (по умолчанию имя — класс родителя, например "TaskTab:refresh").
+    """
+
+    _tickets = itertools.count(1)
+
+    def __init__(self, parent: QObject | None = None, pool: QThreadPool | None = None, name: str | None = None):
+        super().__init__(parent)
+        self._name = name or (type(parent).__name__ if parent is not None else "QueryRunner")
+        self._pool = pool or QThreadPool.globalInstance()
+        self._signals = _Signals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._pending: dict[int, _Pending] = {}
+        self._latest: dict[str, int] = {}
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_result: ResultCallback,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> int:
+        self.cancel(key)
+        ticket = next(self._tickets)
+        job = _Job(ticket, f"{self._name}:{key}", fn, args, self._signals)
+        self._pending[ticket] = _Pending(key, job, on_result, on_error)
+        self._latest[key] = ticket
+        self._pool.start(job)
+        return ticket
+
+    def cancel(self, key: str) -> None:
+        ticket = self._latest.pop(key, None)
+        if ticket is None:
+            return
+        pending = self._pending.get(ticket)
+        if pending is None:
+            return
+        pending.job.cancelled = True
+        if self._pool.tryTake(pending.job):
+            # Задача не успела начаться — сигнала о завершении не будет.
+            del self._pending[ticket]
+        # Иначе запись удалит _take по сигналу задачи (run() испускает его и для отменённой)
+
+    def is_running(self, key: str) -> bool:
+        return key in self._latest
+
+    def _take(self, ticket: int) -> Optional[_Pending]:
+        pending = self._pending.pop(ticket, None)
+        if pending is None or pending.job.cancelled:
+            return None
+        if self._latest.get(pending.key) == ticket:
+            del self._latest[pending.key]
+        return pending
+
+    def _on_finished(self, ticket: int, result: Any) -> None:
+        pending = self._take(ticket)
+        if pending is not None:
+            pending.on_result(result)
+
+    def _on_failed(self, ticket: int, error: Exception) -> None:
+        pending = self._take(ticket)
+        if pending is None:
+            return
+        if pending.on_error is None:
+            raise error
+        pending.on_error(error)
@@ -1,14 +1,13 @@
 from __future__ import annotations
 
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
-    QComboBox,
+    QAbstractItemView,
     QDialog,
     QDialogButtonBox,
-    QFormLayout,
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QMessageBox,
     QPushButton,
     QTableWidget,
     QTableWidgetItem,
@@ -18,10 +17,20 @@ from PyQt6.QtWidgets import (
 from src.core.entities import Employee
 from src.core.errors import AppError
 from src.services.project_service import ProjectService
-from src.ui.common import ask_yes_no, show_error
+from src.ui.common import show_error
+
+
+_DEFAULT_ROLE = "Member"
 
 
 class MembersDialog(QDialog):
+    """
+    Состав проекта: отметки у сотрудников и их роли. Изменения копятся в таблице и по «OK»
+    сохраняются одной транзакцией (change_project_members) как разница с составом,
+    прочитанным при открытии: участники, которых пользователь не трогал, не удаляются,
+    даже если их нет в (кэшированном) списке сотрудников.
+    """
+
     def __init__(
         self,
         project_service: ProjectService,
@@ -33,46 +42,49 @@ class MembersDialog(QDialog):
         self._service = project_service
         self._project_id = project_id
         self._employees = employees
+        # Состав проекта при чтении: employee_id -> роль
+        self._loaded: dict[int, str] = {}
 
         self.setWindowTitle("Участники проекта")
         self.setModal(True)
 
-        self.employee_combo = QComboBox()
-        for e in employees:
-            self.employee_combo.addItem(e.full_name(), e.id)
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Сотрудник", "Должность", "Роль"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        # Ctrl/Shift — выбор нескольких строк, отметка и роль ставятся всем выбранным сразу
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.setEditTriggers(
+            QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.EditKeyPressed
+        )
 
-        self.role = QLineEdit("Member")
-        self.btn_add = QPushButton("Добавить")
-        self.btn_remove = QPushButton("Удалить выбранного")
+        self.role = QLineEdit(_DEFAULT_ROLE)
+        self.btn_check = QPushButton("Включить выбранных")
+        self.btn_uncheck = QPushButton("Исключить выбранных")
+        self.btn_role = QPushButton("Назначить роль выбранным")
 
-        self.btn_add.clicked.connect(self._on_add)
-        self.btn_remove.clicked.connect(self._on_remove)
-
-        top = QFormLayout()
-        top.addRow("Сотрудник", self.employee_combo)
-        top.addRow("Роль", self.role)
+        self.btn_check.clicked.connect(lambda: self._set_checked(True))
+        self.btn_uncheck.clicked.connect(lambda: self._set_checked(False))
+        self.btn_role.clicked.connect(self._on_set_role)
 
         actions = QHBoxLayout()
-        actions.addWidget(self.btn_add)
-        actions.addWidget(self.btn_remove)
+        actions.addWidget(self.btn_check)
+        actions.addWidget(self.btn_uncheck)
         actions.addStretch(1)
+        actions.addWidget(QLabel("Роль"))
+        actions.addWidget(self.role)
+        actions.addWidget(self.btn_role)
 
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["employee_id", "ФИО", "Должность", "Роль"])
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-
-        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self._on_save)
         buttons.rejected.connect(self.reject)
-        buttons.accepted.connect(self.accept)
 
         layout = QVBoxLayout()
-        layout.addLayout(top)
-        layout.addLayout(actions)
-        layout.addWidget(QLabel("Текущие участники:"))
+        layout.addWidget(QLabel("Отмеченные сотрудники — участники проекта:"))
         layout.addWidget(self.table)
+        layout.addLayout(actions)
         layout.addWidget(buttons)
         self.setLayout(layout)
+        self.resize(640, 480)
 
         self.refresh()
 
@@ -82,52 +94,77 @@ class MembersDialog(QDialog):
         except AppError as e:
             show_error(self, str(e))
             rows = []
+        roles = {r["employee_id"]: str(r.get("role") or "") for r in rows}
+        self._loaded = roles
+
+        # Участники, которых нет в списке сотрудников (например, добавлены после его загрузки)
+        known = {e.id for e in self._employees}
+        employees = list(self._employees) + [
+            Employee(
+                id=r["employee_id"],
+                last_name=r.get("last_name") or "",
+                first_name=r.get("first_name") or "",
+                middle_name=r.get("middle_name"),
+                position=r.get("position") or "",
+            )
+            for r in rows
+            if r["employee_id"] not in known
+        ]
 
         self.table.setRowCount(0)
-        for r in rows:
-            row_idx = self.table.rowCount()
-            self.table.insertRow(row_idx)
-            emp_id = r["employee_id"]
-            fio = " ".join(x for x in [r["last_name"], r["first_name"], r.get("middle_name")] if x)
-            self.table.setItem(row_idx, 0, QTableWidgetItem(str(emp_id)))
-            self.table.setItem(row_idx, 1, QTableWidgetItem(fio))
-            self.table.setItem(row_idx, 2, QTableWidgetItem(str(r.get("position") or "")))
-            self.table.setItem(row_idx, 3, QTableWidgetItem(str(r.get("role") or "")))
+        self.table.setRowCount(len(employees))
+        for row_idx, e in enumerate(employees):
+            name = QTableWidgetItem(e.full_name())
+            name.setData(Qt.ItemDataRole.UserRole, e.id)
+            name.setFlags(
+                Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+            )
+            name.setCheckState(Qt.CheckState.Checked if e.id in roles else Qt.CheckState.Unchecked)
+            position = QTableWidgetItem(e.position or "")
+            position.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable)
+            self.table.setItem(row_idx, 0, name)
+            self.table.setItem(row_idx, 1, position)
+            self.table.setItem(row_idx, 2, QTableWidgetItem(roles.get(e.id, "")))
 
         self.table.resizeColumnsToContents()
 
-    def _selected_employee_id(self) -> int | None:
-        items = self.table.selectedItems()
-        if not items:
-            return None
-        # first column is employee_id
-        try:
-            return int(items[0].text())
-        except ValueError:
-            return None
-
-    def _on_add(self) -> None:
-        employee_id = int(self.employee_combo.currentData())
-        role = self.role.text()
-        try:
-            self._service.add_project_member(self._project_id, employee_id, role)
-        except AppError as e:
-            show_error(self, str(e))
-            return
-        self.refresh()
-
-    def _on_remove(self) -> None:
-        employee_id = self._selected_employee_id()
-        if employee_id is None:
-            QMessageBox.information(self, "Удаление", "Выберите строку участника для удаления.")
-            return
-        if not ask_yes_no(self, "Удалить выбранного участника из проекта?"):
+    def _selected_rows(self) -> list[int]:
+        return sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+
+    def _set_checked(self, checked: bool) -> None:
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for row_idx in self._selected_rows():
+            self.table.item(row_idx, 0).setCheckState(state)
+
+    def _on_set_role(self) -> None:
+        role = self.role.text().strip()
+        for row_idx in self._selected_rows():
+            self.table.item(row_idx, 2).setText(role)
+            self.table.item(row_idx, 0).setCheckState(Qt.CheckState.Checked)
+
+    def _changes(self) -> tuple[list[tuple[int, str]], list[int]]:
+        """Разница с прочитанным составом: (добавленные и сменившие роль, исключённые)."""
+        upserts: list[tuple[int, str]] = []
+        removed: list[int] = []
+        for row_idx in range(self.table.rowCount()):
+            name = self.table.item(row_idx, 0)
+            employee_id = int(name.data(Qt.ItemDataRole.UserRole))
+            if name.checkState() == Qt.CheckState.Checked:
+                role = self.table.item(row_idx, 2).text().strip() or _DEFAULT_ROLE
+                if self._loaded.get(employee_id) != role:
+                    upserts.append((employee_id, role))
+            elif employee_id in self._loaded:
+                removed.append(employee_id)
+        return upserts, removed
+
+    def _on_save(self) -> None:
+        upserts, removed = self._changes()
+        if not upserts and not removed:
+            self.accept()
             return
         try:
-            self._service.remove_project_member(self._project_id, employee_id)
+            self._service.change_project_members(self._project_id, upserts, removed)
         except AppError as e:
             show_error(self, str(e))
             return
-        self.refresh()
-
-
+        self.accept()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from src.db.instrumentation import QueryMonitor, QueryStats
+from src.services.cache import LookupCache
+from src.ui.common import show_error, show_info
+from src.ui.table_model import Column, RowTableModel, make_table_view
+
+
+def _top_sources(s: QueryStats) -> str:
+    return ", ".join(f"{name} ({n})" for name, n in s.sources.most_common(3))
+
+
+class QueryStatsDialog(QDialog):
+    """Статистика SQL-запросов (QueryMonitor) и кэша справочников."""
+
+    def __init__(self, monitor: QueryMonitor, cache: LookupCache | None = None, parent=None):
+        super().__init__(parent)
+        self._monitor = monitor
+        self._cache = cache
+
+        self.setWindowTitle("Статистика запросов")
+        self.resize(1000, 500)
+
+        self.summary = QLabel()
+        self.model = RowTableModel(
+            [
+                Column("Вызовов", lambda s: s.count),
+                Column("Всего, мс", lambda s: f"{s.total_ms:.1f}"),
+                Column("Средн., мс", lambda s: f"{s.avg_ms:.1f}"),
+                Column("p95, мс", lambda s: f"{s.percentile_ms(95):.0f}"),
+                Column("Макс., мс", lambda s: f"{s.max_ms:.1f}"),
+                Column("Строк", lambda s: s.rows),
+                Column("Ошибок", lambda s: s.errors),
+                Column("Источники", _top_sources),
+                Column("Запрос", lambda s: s.fingerprint),
+            ],
+            self,
+        )
+        self.table = make_table_view(self.model)
+
+        self.btn_refresh = QPushButton("Обновить")
+        self.btn_reset = QPushButton("Сбросить")
+        self.btn_dump = QPushButton("Сохранить в JSON…")
+        self.btn_refresh.clicked.connect(self.refresh)
+        self.btn_reset.clicked.connect(self._on_reset)
+        self.btn_dump.clicked.connect(self._on_dump)
+
+        actions = QHBoxLayout()
+        actions.addWidget(self.btn_refresh)
+        actions.addWidget(self.btn_reset)
+        actions.addWidget(self.btn_dump)
+        actions.addStretch(1)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(actions)
+        layout.addWidget(self.summary)
+        layout.addWidget(self.table)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        stats = self._monitor.snapshot()
+        self.model.set_rows(stats)
+        self.table.resizeColumnsToContents()
+
+        text = (
+            f"Запросов: {sum(s.count for s in stats)}, "
+            f"время: {sum(s.total_ms for s in stats):.0f} мс, "
+            f"ошибок: {sum(s.errors for s in stats)}"
+        )
+        if self._monitor.slow_log is not None and self._monitor.slow_ms > 0:
+            text += f". Медленные (≥ {self._monitor.slow_ms:g} мс) — в {self._monitor.slow_log}"
+        if self._cache is not None:
+            cs = self._cache.stats()
+            text += f"\nКэш справочников: попаданий {cs.hits}, промахов {cs.misses} ({cs.hit_ratio:.0%})"
+        self.summary.setText(text)
+
+    def _on_reset(self) -> None:
+        self._monitor.reset()
+        self.refresh()
+
+    def _on_dump(self) -> None:
+        suggested = Path.home() / f"query_stats_{datetime.now():%Y-%m-%d_%H-%M}.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Сохранить статистику", str(suggested), "JSON (*.json)")
+        if not path:
+            return
+        extra = {}
+        if self._cache is not None:
+            cs = self._cache.stats()
+            extra["cache"] = {**asdict(cs), "hit_ratio": round(cs.hit_ratio, 4)}
+        try:
+            self._monitor.dump_json(path, **extra)
+        except OSError as e:
+            show_error(self, f"Не удалось сохранить файл: {e}")
+            return
+        show_info(self, f"Статистика сохранена:\n{path}", "Статистика запросов")
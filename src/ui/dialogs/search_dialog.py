@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from PyQt6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QVBoxLayout,
+)
+
+from src.db.repositories.base import Page, PageKey
+from src.services.search_service import SearchService
+from src.ui.async_runner import QueryRunner
+from src.ui.common import show_error
+from src.ui.table_model import Column, RowTableModel, key_column, make_table_view
+
+
+_KIND_TITLES = {"task": "Задача", "project": "Проект", "client": "Клиент"}
+
+
+class SearchDialog(QDialog):
+    """Результаты полнотекстового поиска по задачам, проектам и клиентам."""
+
+    PAGE_SIZE = 50
+
+    def __init__(self, search_service: SearchService, text: str = "", parent=None):
+        super().__init__(parent)
+        self._search = search_service
+        self._runner = QueryRunner(self)
+        self._text = ""
+        self._next_key: PageKey | None = None
+
+        self.setWindowTitle("Поиск")
+        self.resize(900, 500)
+
+        self.edit = QLineEdit(text)
+        self.edit.setPlaceholderText("Слова из названия или описания…")
+        self.btn_search = QPushButton("Найти")
+        self.btn_more = QPushButton("Показать ещё")
+        self.btn_more.setEnabled(False)
+        self.summary = QLabel()
+        self.edit.returnPressed.connect(self.run_search)
+        self.btn_search.clicked.connect(self.run_search)
+        self.btn_more.clicked.connect(self._on_more)
+
+        self.model = RowTableModel(
+            [
+                Column("Тип", lambda r: _KIND_TITLES.get(r["kind"], r["kind"])),
+                key_column("Название", "title"),
+                key_column("Подробнее", "detail"),
+                Column("Релевантность", lambda r: f"{r['score']:.2f}"),
+            ],
+            self,
+        )
+        self.table = make_table_view(self.model)
+
+        top = QHBoxLayout()
+        top.addWidget(self.edit, 1)
+        top.addWidget(self.btn_search)
+
+        bottom = QHBoxLayout()
+        bottom.addWidget(self.summary, 1)
+        bottom.addWidget(self.btn_more)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(top)
+        layout.addWidget(self.table)
+        layout.addLayout(bottom)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        if text.strip():
+            self.run_search()
+
+    def run_search(self) -> None:
+        self._text = self.edit.text()
+        self._next_key = None
+        self.btn_more.setEnabled(False)
+        self.summary.setText("Поиск…")
+        self._runner.cancel("more")
+        self._runner.submit(
+            "search",
+            self._search.search,
+            self._text,
+            None,
+            self.PAGE_SIZE,
+            on_result=self._on_first_page,
+            on_error=self._on_failed,
+        )
+
+    def _on_more(self) -> None:
+        if self._next_key is None:
+            return
+        self.btn_more.setEnabled(False)
+        self._runner.submit(
+            "more",
+            self._search.search,
+            self._text,
+            self._next_key,
+            self.PAGE_SIZE,
+            on_result=self._on_next_page,
+            on_error=self._on_failed,
+        )
+
+    def _on_first_page(self, page: Page[dict]) -> None:
+        self.model.set_rows(page.items)
+        self.table.resizeColumnsToContents()
+        self._show_page(page)
+
+    def _on_next_page(self, page: Page[dict]) -> None:
+        self.model.set_rows(self.model.loaded_rows() + page.items)
+        self._show_page(page)
+
+    def _show_page(self, page: Page[dict]) -> None:
+        self._next_key = page.next_key
+        self.btn_more.setEnabled(page.has_more)
+        found = len(self.model.loaded_rows())
+        self.summary.setText(f"Найдено: {found}{' и ещё есть' if page.has_more else ''}")
+
+    def _on_failed(self, e: Exception) -> None:
+        self.summary.setText("")
+        self.btn_more.setEnabled(self._next_key is not None)
+        show_error(self, str(e))
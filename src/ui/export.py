@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtWidgets import QFileDialog, QProgressDialog, QWidget
+
+from src.db.instrumentation import query_source
+from src.export.pdf import PdfTableWriter
+from src.export.writers import CsvTableWriter, ExportCancelled, TableWriter, XlsxTableWriter, write_table
+from src.ui.common import show_error, show_info
+from src.ui.table_model import Column, RowTableModel
+
+
+# Фильтр диалога -> (расширение, писатель)
+_FORMATS: dict[str, tuple[str, type[TableWriter]]] = {
+    "PDF файлы (*.pdf)": (".pdf", PdfTableWriter),
+    "CSV файлы (*.csv)": (".csv", CsvTableWriter),
+    "Книга Excel (*.xlsx)": (".xlsx", XlsxTableWriter),
+}
+
+RowSource = Callable[[], Iterable[Any]]
+
+
+def _cell_text(value: Any) -> str:
+    # Так же, как RowTableModel.display_text
+    return "" if value is None else str(value)
+
+
+class _ExportSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(object)
+
+
+class _ExportJob(QRunnable):
+    def __init__(
+        self,
+        writer_cls: type[TableWriter],
+        path: str,
+        title: str,
+        columns: list[Column],
+        source: RowSource,
+    ):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = _ExportSignals()
+        self.cancelled = False
+        self._writer_cls = writer_cls
+        self._path = path
+        self._title = title
+        self._columns = columns
+        self._source = source
+
+    def run(self) -> None:
+        # Генератор строк выполняет запросы по мере чтения — метка нужна на всю выгрузку
+        with query_source(f"export:{self._title}"):
+            self._export()
+
+    def _export(self) -> None:
+        rows = None
+        try:
+            rows = self._source()
+            texts = ([_cell_text(c.value(r)) for c in self._columns] for r in rows)
+            with self._writer_cls(self._path, self._title, [c.title for c in self._columns]) as writer:
+                total = write_table(
+                    writer,
+                    texts,
+                    progress=self.signals.progress.emit,
+                    cancelled=lambda: self.cancelled,
+                )
+        except Exception as e:  # noqa: BLE001 - ошибку передаём в GUI-поток
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(total)
+        finally:
+            # Прерванный потоковый курсор нужно дочитать/закрыть в этом же потоке
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+
+
+def export_table(
+    parent: QWidget | None,
+    model: RowTableModel,
+    title: str,
+    source: Optional[RowSource] = None,
+) -> None:
+    """
+    Выгрузка таблицы в PDF, CSV или XLSX (формат выбирается в диалоге сохранения).
+
+    `source` возвращает итератор строк (dict или сущностей) и вызывается в фоновом потоке —
+    обычно это потоковое чтение из БД, так что в выгрузку попадают все строки,
+    а в памяти держится одна порция. Без `source` выгружаются строки, загруженные в модель.
+    Столбцы и их форматирование берутся из модели.
+    """
+    columns = model.columns()
+    if source is None:
+        rows = list(model.loaded_rows())
+        source = lambda: rows  # noqa: E731
+        if not rows:
+            show_info(parent, "Нет данных для выгрузки.", "Экспорт")
+            return
+    if not columns:
+        show_info(parent, "Нет данных для выгрузки.", "Экспорт")
+        return
+
+    safe_name = title.replace(" ", "_")
+    suggested = Path.home() / f"{safe_name}_{datetime.now():%Y-%m-%d_%H-%M}.pdf"
+    path, selected = QFileDialog.getSaveFileName(parent, "Выгрузить таблицу", str(suggested), ";;".join(_FORMATS))
+    if not path:
+        return
+
+    by_suffix = {ext: cls for ext, cls in _FORMATS.values()}
+    suffix = Path(path).suffix.lower()
+    if suffix not in by_suffix:
+        suffix = _FORMATS.get(selected, (".pdf", PdfTableWriter))[0]
+        path += suffix
+
+    job = _ExportJob(by_suffix[suffix], path, title, columns, source)
+
+    # Общее число строк заранее неизвестно — диалог в режиме "занят" со счётчиком строк.
+    dialog = QProgressDialog("Подготовка выгрузки…", "Отмена", 0, 0, parent)
+    dialog.setWindowTitle("Экспорт")
+    dialog.setWindowModality(Qt.WindowModality.WindowModal)
+    dialog.setMinimumDuration(500)
+    dialog.setAutoReset(False)
+    dialog.setAutoClose(False)
+    dialog._job = job  # держим задачу живой, пока диалог существует
+
+    def on_done() -> None:
+        dialog.reset()
+        dialog.deleteLater()
+
+    def on_finished(total: int) -> None:
+        on_done()
+        show_info(parent, f"Файл сохранён:\n{path}\nСтрок: {total}", "Экспорт")
+
+    def on_failed(e: Exception) -> None:
+        on_done()
+        if not isinstance(e, ExportCancelled):
+            show_error(parent, f"Не удалось выгрузить таблицу: {e}")
+
+    def on_cancel() -> None:
+        job.cancelled = True
+        dialog.setLabelText("Отмена…")
+
+    job.signals.progress.connect(lambda n: dialog.setLabelText(f"Выгружено строк: {n}"))
+    job.signals.finished.connect(on_finished)
+    job.signals.failed.connect(on_failed)
+    dialog.canceled.connect(on_cancel)
+    QThreadPool.globalInstance().start(job)
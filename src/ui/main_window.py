@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import (
     QLabel,
+    QLineEdit,
     QMainWindow,
     QPushButton,
     QTabWidget,
@@ -11,8 +13,10 @@ from PyQt6.QtWidgets import (
 )
 
 from src.app_context import AppContext
-from src.core.errors import AppError
+from src.core.errors import AppError, DatabaseError
 from src.ui.common import show_error
+from src.ui.dialogs.query_stats_dialog import QueryStatsDialog
+from src.ui.dialogs.search_dialog import SearchDialog
 from src.ui.tabs.client_tab import ClientTab
 from src.ui.tabs.employee_tab import EmployeeTab
 from src.ui.tabs.project_tab import ProjectTab
@@ -27,14 +31,23 @@ class MainWindow(QMainWindow):
 
         self._ctx = AppContext()
 
-        self.btn_connect = QPushButton("Подключиться к MySQL")
+        self.btn_connect = QPushButton("Подключиться к БД")
         self.status = QLabel("Статус: не подключено")
+        self.btn_stats = QPushButton("Статистика запросов")
+        self.btn_stats.setEnabled(False)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Поиск…")
+        self.search_box.setEnabled(False)
 
         self.btn_connect.clicked.connect(self.on_connect)
+        self.btn_stats.clicked.connect(self.on_stats)
+        self.search_box.returnPressed.connect(self.on_search)
 
         top = QHBoxLayout()
         top.addWidget(self.btn_connect)
         top.addWidget(self.status, 1)
+        top.addWidget(self.search_box)
+        top.addWidget(self.btn_stats)
 
         self.tabs = QTabWidget()
 
@@ -45,6 +58,11 @@ class MainWindow(QMainWindow):
         root.setLayout(layout)
         self.setCentralWidget(root)
 
+        # Состояние синхронизации локальной копии ([database] backend = replica)
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setInterval(2000)
+        self._sync_timer.timeout.connect(self._show_sync_status)
+
         # авто‑подключение (если config.ini уже создан)
         self.on_connect(auto=True)
 
@@ -64,12 +82,42 @@ class MainWindow(QMainWindow):
         assert self._ctx.projects is not None
         assert self._ctx.tasks is not None
         assert self._ctx.reports is not None
+        assert self._ctx.search is not None
 
         self.status.setText("Статус: подключено")
         self.btn_connect.setEnabled(False)
+        self.btn_stats.setEnabled(True)
+        self.search_box.setEnabled(True)
+        if self._ctx.sync is not None:
+            self._show_sync_status()
+            self._sync_timer.start()
 
         self._build_tabs()
 
+    def _show_sync_status(self) -> None:
+        assert self._ctx.sync is not None
+        try:
+            st = self._ctx.sync.status()
+        except DatabaseError:
+            return
+        text = f"Статус: локальная копия; к отправке: {st.pending}, конфликтов: {st.conflicts}"
+        if st.last_error is not None:
+            text += "; нет связи с сервером"
+        elif st.last_sync is not None:
+            text += f"; синхронизировано в {st.last_sync:%H:%M:%S}"
+        self.status.setText(text)
+        self.status.setToolTip(st.last_error or "")
+
+    def on_stats(self) -> None:
+        if self._ctx.db is None:
+            return
+        QueryStatsDialog(self._ctx.db.monitor, self._ctx.cache, self).exec()
+
+    def on_search(self) -> None:
+        if self._ctx.search is None or not self.search_box.text().strip():
+            return
+        SearchDialog(self._ctx.search, self.search_box.text(), self).exec()
+
     def _build_tabs(self) -> None:
         # Tabs
         employee_tab = EmployeeTab(self._ctx.employees, self)
@@ -84,7 +132,7 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(task_tab, "Задачи")
         self.tabs.addTab(reports_tab, "Отчёты")
 
-        # Initial refresh
+        # Initial refresh: загрузки выполняются параллельно в фоновом пуле потоков
         employee_tab.refresh()
         client_tab.refresh()
         project_tab.refresh()
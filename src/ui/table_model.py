@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+import bisect
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtWidgets import QAbstractItemView, QTableView
+
+
+@dataclass(frozen=True, slots=True)
+class Column:
+    title: str
+    value: Callable[[Any], Any]
+
+
+def key_column(title: str, key: str) -> Column:
+    """Столбец, берущий значение по ключу (dict) или по атрибуту (сущность)."""
+
+    def getter(row: Any) -> Any:
+        if isinstance(row, dict):
+            return row.get(key)
+        return getattr(row, key, None)
+
+    return Column(title, getter)
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    Модель таблицы поверх списка строк (dict или сущностей).
+
+    Ячейки не хранятся: текст строится в data() только для видимых строк.
+    Строки показываются порциями через canFetchMore/fetchMore; если задан
+    `fetch_more`, после исчерпания загруженных строк модель запрашивает следующую порцию.
+
+    `key` (идентификатор строки) нужен для merge() — применения дельты без перестроения;
+    `sort_key` задаёт порядок строк, в который вставляются новые/изменённые строки.
+    """
+
+    BATCH_SIZE = 200
+
+    def __init__(
+        self,
+        columns: list[Column],
+        parent=None,
+        *,
+        key: Optional[Callable[[Any], Any]] = None,
+        sort_key: Optional[Callable[[Any], Any]] = None,
+    ):
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._rows: list[Any] = []
+        self._visible = 0
+        self._fetch_more: Optional[Callable[[], list[Any]]] = None
+        self._key = key
+        self._sort_key = sort_key
+        self._by_key: dict[Any, Any] = {}
+
+    # ---- данные ----
+    def set_columns(self, columns: list[Column]) -> None:
+        self.beginResetModel()
+        self._columns = list(columns)
+        self.endResetModel()
+
+    def set_sort_key(self, sort_key: Optional[Callable[[Any], Any]]) -> None:
+        """Порядок для merge() (при смене сортировки выборки); загруженные строки не переставляются."""
+        self._sort_key = sort_key
+
+    def set_rows(self, rows: Iterable[Any], fetch_more: Optional[Callable[[], list[Any]]] = None) -> None:
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._visible = min(len(self._rows), self.BATCH_SIZE)
+        self._fetch_more = fetch_more
+        if self._key is not None:
+            self._by_key = {self._key(r): r for r in self._rows}
+        self.endResetModel()
+
+    def merge(self, changed: Iterable[Any], deleted_keys: Iterable[Any] = ()) -> None:
+        """
+        Применяет дельту: удалённые строки убираются, изменённые заменяются,
+        новые вставляются на своё место по `sort_key` (без sort_key — в конец).
+        Стоимость пропорциональна размеру дельты, а не таблицы.
+
+        `sort_key` может расходиться с порядком БД (сопоставление строк MySQL/SQLite),
+        поэтому строки не отбрасываются, даже если по нему они правее загруженных:
+        придя повторно со следующей страницей (fetch_more), строка не дублируется.
+        """
+        if self._key is None:
+            raise ValueError("Для merge() модели нужен key.")
+        for k in deleted_keys:
+            old = self._by_key.pop(k, None)
+            if old is not None:
+                self._remove_at(self._position(old))
+
+        for row in changed:
+            k = self._key(row)
+            old = self._by_key.pop(k, None)
+            if old is not None:
+                pos = self._position(old)
+                if self._sort_key is None or self._sort_key(old) == self._sort_key(row):
+                    self._rows[pos] = row
+                    self._by_key[k] = row
+                    if pos < self._visible:
+                        self.dataChanged.emit(self.index(pos, 0), self.index(pos, len(self._columns) - 1))
+                    continue
+                self._remove_at(pos)
+            self._insert_at(self._insert_position(row), row)
+            self._by_key[k] = row
+
+    def _dedupe(self, page: list[Any]) -> list[Any]:
+        """Строки страницы, которых ещё нет в модели; уже вставленные merge() — заменяются на месте."""
+        fresh = []
+        for row in page:
+            k = self._key(row)
+            old = self._by_key.get(k)
+            self._by_key[k] = row
+            if old is None:
+                fresh.append(row)
+                continue
+            pos = self._position(old)
+            self._rows[pos] = row
+            if pos < self._visible:
+                self.dataChanged.emit(self.index(pos, 0), self.index(pos, len(self._columns) - 1))
+        return fresh
+
+    def refresh_display(self) -> None:
+        """Перерисовать видимые строки (например, после смены подписей из справочников)."""
+        if self._visible:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._visible - 1, len(self._columns) - 1))
+
+    def _position(self, row: Any) -> int:
+        if self._sort_key is None:
+            return self._rows.index(row)
+        i = bisect.bisect_left(self._rows, self._sort_key(row), key=self._sort_key)
+        while i < len(self._rows) and self._rows[i] is not row:
+            i += 1
+        return i if i < len(self._rows) else self._rows.index(row)
+
+    def _insert_position(self, row: Any) -> int:
+        if self._sort_key is None:
+            return len(self._rows)
+        return bisect.bisect_right(self._rows, self._sort_key(row), key=self._sort_key)
+
+    def _remove_at(self, pos: int) -> None:
+        if pos < self._visible:
+            self.beginRemoveRows(QModelIndex(), pos, pos)
+            del self._rows[pos]
+            self._visible -= 1
+            self.endRemoveRows()
+        else:
+            del self._rows[pos]
+
+    def _insert_at(self, pos: int, row: Any) -> None:
+        if pos < self._visible or self._visible == len(self._rows):
+            self.beginInsertRows(QModelIndex(), pos, pos)
+            self._rows.insert(pos, row)
+            self._visible += 1
+            self.endInsertRows()
+        else:
+            self._rows.insert(pos, row)
+
+    def row(self, index: int) -> Any:
+        return self._rows[index]
+
+    def loaded_rows(self) -> list[Any]:
+        return self._rows
+
+    def columns(self) -> list[Column]:
+        return list(self._columns)
+
+    def column_titles(self) -> list[str]:
+        return [c.title for c in self._columns]
+
+    def display_text(self, row: Any, column: int) -> str:
+        value = self._columns[column].value(row)
+        return "" if value is None else str(value)
+
+    def fetch_all(self) -> None:
+        while self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    # ---- QAbstractTableModel ----
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._visible
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.display_text(self._rows[index.row()], index.column())
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._columns[section].title if section < len(self._columns) else None
+        return section + 1
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._visible < len(self._rows) or self._fetch_more is not None
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        if self._visible >= len(self._rows) and self._fetch_more is not None:
+            more = self._fetch_more()
+            if not more:
+                self._fetch_more = None
+                return
+            if self._key is not None:
+                more = self._dedupe(more)
+            self._rows.extend(more)
+
+        count = min(self.BATCH_SIZE, len(self._rows) - self._visible)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+
+def make_table_view(model: RowTableModel) -> QTableView:
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    return view
+
+
+def selected_row(view: QTableView) -> Any | None:
+    """Объект строки (dict или сущность), выбранной в таблице."""
+    model = view.model()
+    if not isinstance(model, RowTableModel):
+        return None
+    rows = view.selectionModel().selectedRows()
+    if not rows:
+        return None
+    return model.row(rows[0].row())
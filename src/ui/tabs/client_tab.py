@@ -1,19 +1,25 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from PyQt6.QtWidgets import (
     QHBoxLayout,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
-from src.core.errors import AppError
+from src.core.entities import Client
+from src.core.errors import AppError, DatabaseError
+from src.db.repositories.base import ChangeSet
+from src.db.repositories.mysql.base_mysql_repo import is_missing_schema
 from src.services.client_service import ClientService
-from src.ui.common import ask_yes_no, export_table_to_pdf, show_error
+from src.ui.async_runner import QueryRunner
+from src.ui.common import ask_yes_no, show_error
 from src.ui.dialogs.client_dialog import ClientDialog
+from src.ui.export import export_table
+from src.ui.table_model import Column, RowTableModel, key_column, make_table_view, selected_row
 
 
 class ClientTab(QWidget):
@@ -21,17 +27,31 @@ class ClientTab(QWidget):
         super().__init__(parent)
         self._service = service
         self._clients_by_id: dict[int, object] = {}
-
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["id", "Название", "Телефон", "Email", "Примечание"])
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._runner = QueryRunner(self)
+        # Отметка времени сервера последней загрузки: «Обновить» догружает только изменения
+        self._as_of: datetime | None = None
+        self._delta_supported = True
+
+        self.model = RowTableModel(
+            [
+                key_column("id", "id"),
+                key_column("Название", "name"),
+                key_column("Телефон", "phone"),
+                key_column("Email", "email"),
+                Column("Примечание", lambda c: (c.note or "")[:80]),
+            ],
+            self,
+            key=lambda c: c.id,
+            # Порядок list_all: name (id — при равных названиях)
+            sort_key=lambda c: (c.name, c.id),
+        )
+        self.table = make_table_view(self.model)
 
         self.btn_add = QPushButton("Добавить")
         self.btn_edit = QPushButton("Изменить")
         self.btn_delete = QPushButton("Удалить")
         self.btn_refresh = QPushButton("Обновить")
-        self.btn_export = QPushButton("Выгрузить в PDF")
+        self.btn_export = QPushButton("Выгрузить…")
 
         self.btn_add.clicked.connect(self.on_add)
         self.btn_edit.clicked.connect(self.on_edit)
@@ -53,34 +73,53 @@ class ClientTab(QWidget):
         self.setLayout(layout)
 
     def refresh(self) -> None:
+        if self._as_of is not None and self._delta_supported:
+            self._runner.submit(
+                "refresh", self._load_changes, self._as_of, on_result=self._on_changes, on_error=self._on_load_failed
+            )
+            return
+        self._runner.submit("refresh", self._load_all, on_result=self._on_loaded, on_error=self._on_load_failed)
+
+    def _load_all(self) -> tuple[datetime, list[Client]]:
+        # Выполняется в фоновом потоке. Отметку берём до чтения, чтобы не потерять изменения.
+        as_of = self._service.server_now()
+        return as_of, self._service.list_clients(fresh=True)
+
+    def _load_changes(self, since: datetime) -> ChangeSet[Client] | None:
         try:
-            clients = self._service.list_clients()
-        except AppError as e:
-            show_error(self, str(e))
-            clients = []
+            return self._service.list_clients_changed_since(since)
+        except DatabaseError as e:
+            if not is_missing_schema(e):
+                raise  # сбой запроса — в _on_load_failed, дельты не отключаются
+            # Нет столбца updated_at (миграция 001 не применена) — работаем полной перезагрузкой.
+            return None
 
-        self._clients_by_id = {int(c.id): c for c in clients if c.id is not None}
+    def _on_load_failed(self, e: Exception) -> None:
+        show_error(self, str(e))
+        self._on_loaded((None, []))
 
-        self.table.setRowCount(0)
-        for c in clients:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(str(c.id or "")))
-            self.table.setItem(row, 1, QTableWidgetItem(c.name))
-            self.table.setItem(row, 2, QTableWidgetItem(c.phone or ""))
-            self.table.setItem(row, 3, QTableWidgetItem(c.email or ""))
-            self.table.setItem(row, 4, QTableWidgetItem((c.note or "")[:80]))
+    def _on_loaded(self, result: tuple[datetime | None, list[Client]]) -> None:
+        self._as_of, clients = result
+        self._clients_by_id = {int(c.id): c for c in clients if c.id is not None}
 
+        self.model.set_rows(clients)
         self.table.resizeColumnsToContents()
 
+    def _on_changes(self, changes: ChangeSet[Client] | None) -> None:
+        if changes is None:
+            self._delta_supported = False
+            self.refresh()
+            return
+        self._as_of = changes.as_of
+        for c in changes.changed:
+            self._clients_by_id[int(c.id)] = c
+        for cid in changes.deleted_ids:
+            self._clients_by_id.pop(cid, None)
+        self.model.merge(changes.changed, changes.deleted_ids)
+
     def _selected_id(self) -> int | None:
-        items = self.table.selectedItems()
-        if not items:
-            return None
-        try:
-            return int(items[0].text())
-        except ValueError:
-            return None
+        row = selected_row(self.table)
+        return None if row is None or row.id is None else int(row.id)
 
     def on_add(self) -> None:
         dlg = ClientDialog(self._service, None, self)
@@ -115,6 +154,6 @@ class ClientTab(QWidget):
         self.refresh()
 
     def on_export(self) -> None:
-        export_table_to_pdf(self, self.table, "Клиенты")
+        export_table(self, self.model, "Клиенты", self._service.iter_clients)
 
 
@@ -1,19 +1,25 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from PyQt6.QtWidgets import (
     QHBoxLayout,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
-from src.core.errors import AppError
+from src.core.entities import Employee
+from src.core.errors import AppError, DatabaseError
+from src.db.repositories.base import ChangeSet
+from src.db.repositories.mysql.base_mysql_repo import is_missing_schema
 from src.services.employee_service import EmployeeService
-from src.ui.common import ask_yes_no, export_table_to_pdf, show_error
+from src.ui.async_runner import QueryRunner
+from src.ui.common import ask_yes_no, show_error
 from src.ui.dialogs.employee_dialog import EmployeeDialog
+from src.ui.export import export_table
+from src.ui.table_model import Column, RowTableModel, key_column, make_table_view, selected_row
 
 
 class EmployeeTab(QWidget):
@@ -21,19 +27,33 @@ class EmployeeTab(QWidget):
         super().__init__(parent)
         self._service = service
         self._employees_by_id: dict[int, object] = {}
-
-        self.table = QTableWidget(0, 8)
-        self.table.setHorizontalHeaderLabels(
-            ["id", "Фамилия", "Имя", "Отчество", "Должность", "Телефон", "Email", "Активен"]
+        self._runner = QueryRunner(self)
+        self._as_of: datetime | None = None
+        self._delta_supported = True
+
+        self.model = RowTableModel(
+            [
+                key_column("id", "id"),
+                key_column("Фамилия", "last_name"),
+                key_column("Имя", "first_name"),
+                key_column("Отчество", "middle_name"),
+                key_column("Должность", "position"),
+                key_column("Телефон", "phone"),
+                key_column("Email", "email"),
+                Column("Активен", lambda e: "Да" if e.is_active else "Нет"),
+            ],
+            self,
+            key=lambda e: e.id,
+            # Порядок list_all: last_name, first_name (id — при равных ФИ)
+            sort_key=lambda e: (e.last_name, e.first_name, e.id),
         )
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table = make_table_view(self.model)
 
         self.btn_add = QPushButton("Добавить")
         self.btn_edit = QPushButton("Изменить")
         self.btn_delete = QPushButton("Удалить")
         self.btn_refresh = QPushButton("Обновить")
-        self.btn_export = QPushButton("Выгрузить в PDF")
+        self.btn_export = QPushButton("Выгрузить…")
 
         self.btn_add.clicked.connect(self.on_add)
         self.btn_edit.clicked.connect(self.on_edit)
@@ -55,37 +75,51 @@ class EmployeeTab(QWidget):
         self.setLayout(layout)
 
     def refresh(self) -> None:
+        if self._as_of is not None and self._delta_supported:
+            self._runner.submit(
+                "refresh", self._load_changes, self._as_of, on_result=self._on_changes, on_error=self._on_load_failed
+            )
+            return
+        self._runner.submit("refresh", self._load_all, on_result=self._on_loaded, on_error=self._on_load_failed)
+
+    def _load_all(self) -> tuple[datetime, list[Employee]]:
+        as_of = self._service.server_now()
+        return as_of, self._service.list_employees(fresh=True)
+
+    def _load_changes(self, since: datetime) -> ChangeSet[Employee] | None:
         try:
-            employees = self._service.list_employees()
-        except AppError as e:
-            show_error(self, str(e))
-            employees = []
+            return self._service.list_employees_changed_since(since)
+        except DatabaseError as e:
+            if not is_missing_schema(e):
+                raise  # сбой запроса — в _on_load_failed, дельты не отключаются
+            return None
 
-        self._employees_by_id = {int(e.id): e for e in employees if e.id is not None}
+    def _on_load_failed(self, e: Exception) -> None:
+        show_error(self, str(e))
+        self._on_loaded((None, []))
 
-        self.table.setRowCount(0)
-        for e in employees:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(str(e.id or "")))
-            self.table.setItem(row, 1, QTableWidgetItem(e.last_name))
-            self.table.setItem(row, 2, QTableWidgetItem(e.first_name))
-            self.table.setItem(row, 3, QTableWidgetItem(e.middle_name or ""))
-            self.table.setItem(row, 4, QTableWidgetItem(e.position))
-            self.table.setItem(row, 5, QTableWidgetItem(e.phone or ""))
-            self.table.setItem(row, 6, QTableWidgetItem(e.email or ""))
-            self.table.setItem(row, 7, QTableWidgetItem("Да" if e.is_active else "Нет"))
+    def _on_loaded(self, result: tuple[datetime | None, list[Employee]]) -> None:
+        self._as_of, employees = result
+        self._employees_by_id = {int(e.id): e for e in employees if e.id is not None}
 
+        self.model.set_rows(employees)
         self.table.resizeColumnsToContents()
 
+    def _on_changes(self, changes: ChangeSet[Employee] | None) -> None:
+        if changes is None:
+            self._delta_supported = False
+            self.refresh()
+            return
+        self._as_of = changes.as_of
+        for e in changes.changed:
+            self._employees_by_id[int(e.id)] = e
+        for emp_id in changes.deleted_ids:
+            self._employees_by_id.pop(emp_id, None)
+        self.model.merge(changes.changed, changes.deleted_ids)
+
     def _selected_id(self) -> int | None:
-        items = self.table.selectedItems()
-        if not items:
-            return None
-        try:
-            return int(items[0].text())
-        except ValueError:
-            return None
+        row = selected_row(self.table)
+        return None if row is None or row.id is None else int(row.id)
 
     def on_add(self) -> None:
         dlg = EmployeeDialog(self._service, None, self)
@@ -120,6 +154,6 @@ class EmployeeTab(QWidget):
         self.refresh()
 
     def on_export(self) -> None:
-        export_table_to_pdf(self, self.table, "Сотрудники")
+        export_table(self, self.model, "Сотрудники", self._service.iter_employees)
 
 
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from PyQt6.QtWidgets import (
     QHBoxLayout,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
-from src.core.errors import AppError
+from src.core.entities import Project
+from src.core.errors import AppError, DatabaseError
+from src.db.repositories.base import ChangeSet
+from src.db.repositories.mysql.base_mysql_repo import is_missing_schema
 from src.services.client_service import ClientService
 from src.services.employee_service import EmployeeService
 from src.services.project_service import ProjectService
-from src.ui.common import ask_yes_no, export_table_to_pdf, show_error
+from src.ui.async_runner import QueryRunner
+from src.ui.common import ask_yes_no, show_error
 from src.ui.dialogs.members_dialog import MembersDialog
 from src.ui.dialogs.project_dialog import ProjectDialog
+from src.ui.export import export_table
+from src.ui.table_model import Column, RowTableModel, key_column, make_table_view, selected_row
+
+
+def _client_name(p: Project) -> object:
+    client = p.client
+    return client.name if client is not None else p.client_id
 
 
 class ProjectTab(QWidget):
@@ -31,19 +42,33 @@ class ProjectTab(QWidget):
         self._projects = project_service
         self._clients = client_service
         self._employees = employee_service
-        self._projects_by_id: dict[int, object] = {}
-
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels(["id", "Клиент", "Название", "Дата начала", "Дата окончания", "Статус"])
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self._projects_by_id: dict[int, Project] = {}
+        self._runner = QueryRunner(self)
+        self._as_of: datetime | None = None
+        self._delta_supported = True
+
+        self.model = RowTableModel(
+            [
+                key_column("id", "id"),
+                Column("Клиент", _client_name),
+                key_column("Название", "name"),
+                key_column("Дата начала", "start_date"),
+                key_column("Дата окончания", "end_date"),
+                key_column("Статус", "status"),
+            ],
+            self,
+            key=lambda p: p.id,
+            # Порядок list_all: start_date DESC, id DESC
+            sort_key=lambda p: (-p.start_date.toordinal(), -p.id),
+        )
+        self.table = make_table_view(self.model)
 
         self.btn_add = QPushButton("Добавить")
         self.btn_edit = QPushButton("Изменить")
         self.btn_delete = QPushButton("Удалить")
         self.btn_members = QPushButton("Участники проекта")
         self.btn_refresh = QPushButton("Обновить")
-        self.btn_export = QPushButton("Выгрузить в PDF")
+        self.btn_export = QPushButton("Выгрузить…")
 
         self.btn_add.clicked.connect(self.on_add)
         self.btn_edit.clicked.connect(self.on_edit)
@@ -67,38 +92,65 @@ class ProjectTab(QWidget):
         self.setLayout(layout)
 
     def refresh(self) -> None:
+        if self._as_of is not None and self._delta_supported:
+            self._runner.submit(
+                "refresh",
+                self._load_changes,
+                self._as_of,
+                list(self._projects_by_id.values()),
+                on_result=self._on_changes,
+                on_error=self._on_load_failed,
+            )
+            return
+        self._runner.submit("refresh", self._load_all, on_result=self._on_loaded, on_error=self._on_load_failed)
+
+    def _load_all(self) -> tuple[datetime, list[Project]]:
+        # Выполняется в фоновом потоке; клиенты грузятся здесь же, чтобы отрисовка не ходила в БД
+        as_of = self._projects.server_now()
+        projects = self._projects.list_projects(fresh=True)
+        self._projects.load_relations(projects)
+        return as_of, projects
+
+    def _load_changes(self, since: datetime, projects: list[Project]) -> tuple[ChangeSet[Project], bool] | None:
         try:
-            clients = self._clients.list_clients()
-            client_name_by_id = {int(c.id): c.name for c in clients if c.id is not None}
-            projects = self._projects.list_projects()
-        except AppError as e:
-            show_error(self, str(e))
-            projects = []
-            client_name_by_id = {}
+            changes = self._projects.list_projects_changed_since(since)
+        except DatabaseError as e:
+            if not is_missing_schema(e):
+                raise  # сбой запроса — в _on_load_failed, дельты не отключаются
+            return None
+        # Клиенты, устаревшие по TTL, перечитываются — тогда перерисовываем таблицу
+        reloaded = self._projects.load_relations([*projects, *changes.changed])
+        return changes, reloaded > 0
 
-        self._projects_by_id = {int(p.id): p for p in projects if p.id is not None}
+    def _on_load_failed(self, e: Exception) -> None:
+        show_error(self, str(e))
+        self._on_loaded((None, []))
 
-        self.table.setRowCount(0)
-        for p in projects:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(str(p.id or "")))
-            self.table.setItem(row, 1, QTableWidgetItem(client_name_by_id.get(int(p.client_id), str(p.client_id))))
-            self.table.setItem(row, 2, QTableWidgetItem(p.name))
-            self.table.setItem(row, 3, QTableWidgetItem(str(p.start_date or "")))
-            self.table.setItem(row, 4, QTableWidgetItem(str(p.end_date or "")))
-            self.table.setItem(row, 5, QTableWidgetItem(p.status))
+    def _on_loaded(self, result: tuple[datetime | None, list[Project]]) -> None:
+        self._as_of, projects = result
+        self._projects_by_id = {int(p.id): p for p in projects if p.id is not None}
 
+        self.model.set_rows(projects)
         self.table.resizeColumnsToContents()
 
+    def _on_changes(self, result: tuple[ChangeSet[Project], bool] | None) -> None:
+        if result is None:
+            self._delta_supported = False
+            self.refresh()
+            return
+        changes, relations_reloaded = result
+        self._as_of = changes.as_of
+        for p in changes.changed:
+            self._projects_by_id[int(p.id)] = p
+        for pid in changes.deleted_ids:
+            self._projects_by_id.pop(pid, None)
+        self.model.merge(changes.changed, changes.deleted_ids)
+        if relations_reloaded:
+            self.model.refresh_display()
+
     def _selected_id(self) -> int | None:
-        items = self.table.selectedItems()
-        if not items:
-            return None
-        try:
-            return int(items[0].text())
-        except ValueError:
-            return None
+        row = selected_row(self.table)
+        return None if row is None or row.id is None else int(row.id)
 
     def on_add(self) -> None:
         try:
@@ -162,6 +214,6 @@ class ProjectTab(QWidget):
         dlg.exec()
 
     def on_export(self) -> None:
-        export_table_to_pdf(self, self.table, "Проекты")
+        export_table(self, self.model, "Проекты", self._projects.iter_projects)
 
 
@@ -1,23 +1,26 @@
 from __future__ import annotations
 
+from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import (
+    QCheckBox,
     QComboBox,
+    QDateEdit,
     QHBoxLayout,
     QLabel,
     QPushButton,
     QStackedWidget,
-    QTableWidget,
-    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
-from src.core.errors import AppError
 from src.services.client_service import ClientService
 from src.services.employee_service import EmployeeService
 from src.services.project_service import ProjectService
 from src.services.report_service import ReportService
-from src.ui.common import export_table_to_pdf, show_error, show_info
+from src.ui.async_runner import QueryRunner
+from src.ui.common import show_error, show_info
+from src.ui.export import export_table
+from src.ui.table_model import RowTableModel, key_column, make_table_view
 
 
 class ReportsTab(QWidget):
@@ -34,12 +37,16 @@ class ReportsTab(QWidget):
         self._clients = client_service
         self._projects = project_service
         self._employees = employee_service
+        self._runner = QueryRunner(self)
+        # (заголовок, ключ отчёта, параметры) последнего сформированного отчёта — для выгрузки
+        self._last_report: tuple[str, str, tuple] | None = None
 
         self.report_type = QComboBox()
         self.report_type.addItem("Проекты выбранного клиента", "projects_by_client")
         self.report_type.addItem("Проекты с просроченными задачами", "overdue_projects")
         self.report_type.addItem("Сотрудники на проекте", "employees_by_project")
         self.report_type.addItem("Загрузка сотрудника", "employee_workload")
+        self.report_type.addItem("Загрузка сотрудников по неделям", "workload_heatmap")
 
         # Parameters widgets
         self.param_stack = QStackedWidget()
@@ -51,10 +58,16 @@ class ReportsTab(QWidget):
         self.param_stack.addWidget(self._wrap_param("Проект", self.project_combo))
         self.param_stack.addWidget(self._wrap_param("Сотрудник", self.employee_combo))
         self.param_stack.addWidget(QWidget())  # empty
+        self.weeks_from = self._date_edit(QDate.currentDate().addDays(-28))
+        self.weeks_to = self._date_edit(QDate.currentDate().addDays(56))
+        self.param_stack.addWidget(self._weeks_param())
+
+        self.chk_live = QCheckBox("Без сводки")
+        self.chk_live.setToolTip("Пересчитать по всем задачам, а не брать из сводной таблицы")
 
         self.btn_generate = QPushButton("Сформировать")
         self.btn_refresh = QPushButton("Обновить списки")
-        self.btn_export = QPushButton("Выгрузить в PDF")
+        self.btn_export = QPushButton("Выгрузить…")
         self.btn_generate.clicked.connect(self.generate)
         self.btn_refresh.clicked.connect(self.refresh_sources)
         self.btn_export.clicked.connect(self.on_export)
@@ -64,14 +77,14 @@ class ReportsTab(QWidget):
         top.addWidget(QLabel("Отчёт:"))
         top.addWidget(self.report_type, 2)
         top.addWidget(self.param_stack, 2)
+        top.addWidget(self.chk_live)
         top.addWidget(self.btn_generate)
         top.addWidget(self.btn_refresh)
         top.addWidget(self.btn_export)
         top.addStretch(1)
 
-        self.table = QTableWidget(0, 0)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.model = RowTableModel([], self)
+        self.table = make_table_view(self.model)
 
         layout = QVBoxLayout()
         layout.addLayout(top)
@@ -89,6 +102,24 @@ class ReportsTab(QWidget):
         w.setLayout(lay)
         return w
 
+    @staticmethod
+    def _date_edit(value: QDate) -> QDateEdit:
+        edit = QDateEdit(value)
+        edit.setCalendarPopup(True)
+        edit.setDisplayFormat("yyyy-MM-dd")
+        return edit
+
+    def _weeks_param(self) -> QWidget:
+        w = QWidget()
+        lay = QHBoxLayout()
+        lay.setContentsMargins(0, 0, 0, 0)
+        lay.addWidget(QLabel("Недели с:"))
+        lay.addWidget(self.weeks_from, 1)
+        lay.addWidget(QLabel("по:"))
+        lay.addWidget(self.weeks_to, 1)
+        w.setLayout(lay)
+        return w
+
     def _on_report_changed(self) -> None:
         key = str(self.report_type.currentData())
         if key == "projects_by_client":
@@ -97,17 +128,30 @@ class ReportsTab(QWidget):
             self.param_stack.setCurrentIndex(1)
         elif key == "employee_workload":
             self.param_stack.setCurrentIndex(2)
+        elif key == "workload_heatmap":
+            self.param_stack.setCurrentIndex(4)
         else:
             self.param_stack.setCurrentIndex(3)
+        self.chk_live.setVisible(key == "overdue_projects")
 
     def refresh_sources(self) -> None:
-        try:
-            clients = self._clients.list_clients()
-            projects = self._projects.list_projects()
-            employees = self._employees.list_employees()
-        except AppError as e:
-            show_error(self, str(e))
-            return
+        self._runner.submit(
+            "sources",
+            self._load_sources,
+            on_result=self._on_sources_loaded,
+            on_error=lambda e: show_error(self, str(e)),
+        )
+
+    def _load_sources(self) -> tuple[list, list, list]:
+        # Выполняется в фоновом потоке
+        return (
+            self._clients.list_clients(),
+            self._projects.list_projects(),
+            self._employees.list_employees(),
+        )
+
+    def _on_sources_loaded(self, sources: tuple[list, list, list]) -> None:
+        clients, projects, employees = sources
 
         self.client_combo.clear()
         for c in clients:
@@ -129,46 +173,64 @@ class ReportsTab(QWidget):
         try:
             if key == "projects_by_client":
                 client_id = int(self.client_combo.currentData())
-                rows = self._reports.projects_by_client(client_id)
+                job, args = self._reports.projects_by_client, (client_id,)
                 headers = ["id", "name", "start_date", "end_date", "status"]
             elif key == "overdue_projects":
-                rows = self._reports.overdue_projects()
+                live = self.chk_live.isChecked()
+                job, args = (lambda: self._reports.overdue_projects(live=live)), ()
                 headers = ["id", "name", "client_name", "first_overdue_due_date", "overdue_tasks"]
+            elif key == "workload_heatmap":
+                # Заголовки — недели периода, их возвращает сам отчёт вместе со строками
+                job, args = self._reports.workload_matrix, (
+                    self.weeks_from.date().toPyDate(),
+                    self.weeks_to.date().toPyDate(),
+                )
+                headers = []
             elif key == "employees_by_project":
                 project_id = int(self.project_combo.currentData())
-                rows = self._reports.employees_by_project(project_id)
+                job, args = self._reports.employees_by_project, (project_id,)
                 headers = ["employee_id", "employee_name", "position", "role", "since_date"]
             else:
                 employee_id = int(self.employee_combo.currentData())
-                rows = self._reports.employee_workload(employee_id)
+                job, args = self._reports.employee_workload, (employee_id,)
                 headers = ["project_id", "project_name", "task_id", "task_title", "due_date", "status"]
         except (TypeError, ValueError):
             show_error(self, "Не выбран параметр отчёта (клиент/проект/сотрудник).")
             return
-        except AppError as e:
-            show_error(self, str(e))
-            return
 
+        title = f"Отчёт — {self.report_type.currentText()}"
+        self._runner.submit(
+            "report",
+            job,
+            *args,
+            on_result=lambda result: self._on_report_ready(
+                *(result if key == "workload_heatmap" else (headers, result)), (title, key, args)
+            ),
+            on_error=lambda e: show_error(self, str(e)),
+        )
+
+    def _on_report_ready(self, headers: list[str], rows: list[dict], report: tuple[str, str, tuple]) -> None:
         self._fill_table(headers, rows)
+        self._last_report = report
 
         if not rows:
             show_info(self, "Нет данных для выбранного отчёта.", "Отчёт")
 
     def _fill_table(self, headers: list[str], rows: list[dict]) -> None:
-        self.table.setRowCount(0)
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-
-        for r in rows:
-            row_idx = self.table.rowCount()
-            self.table.insertRow(row_idx)
-            for col, h in enumerate(headers):
-                self.table.setItem(row_idx, col, QTableWidgetItem(str(r.get(h, ""))))
-
+        self.model.set_columns([key_column(h, h) for h in headers])
+        self.model.set_rows(rows)
         self.table.resizeColumnsToContents()
 
     def on_export(self) -> None:
-        title = f"Отчёт — {self.report_type.currentText()}"
-        export_table_to_pdf(self, self.table, title)
+        if self._last_report is None:
+            show_info(self, "Сначала сформируйте отчёт.", "Экспорт")
+            return
+        # Выгружается сформированный отчёт (повторным потоковым запросом), а не выбранный в списке
+        title, key, args = self._last_report
+        if key == "workload_heatmap":
+            # Матрица строится из сгруппированных ячеек — выгружаем то, что показано
+            export_table(self, self.model, title)
+            return
+        export_table(self, self.model, title, lambda: self._reports.iter_report(key, *args))
 
 
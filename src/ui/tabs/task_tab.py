@@ -1,24 +1,65 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Any, Callable
+
+from PyQt6.QtCore import QDate
 from PyQt6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDateEdit,
     QHBoxLayout,
+    QLabel,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
-from src.core.errors import AppError
+from src.core.entities import Employee, Project, Task
+from src.core.errors import AppError, DatabaseError
 from src.services.employee_service import EmployeeService
 from src.services.project_service import ProjectService
+from src.db.repositories.base import ChangeSet, Page, PageKey, TaskFilter
+from src.db.repositories.mysql.base_mysql_repo import is_missing_schema
+from src.db.repositories.mysql.task_repo import UNASSIGNED
 from src.services.task_service import TaskService
-from src.ui.common import ask_yes_no, export_table_to_pdf, show_error
+from src.ui.async_runner import QueryRunner
+from src.ui.common import ask_yes_no, show_error
 from src.ui.dialogs.task_dialog import TaskDialog
+from src.ui.export import export_table
+from src.ui.table_model import Column, RowTableModel, key_column, make_table_view, selected_row
+
+
+def _project_name(t: Task) -> object:
+    project = t.project
+    return project.name if project is not None else t.project_id
+
+
+def _employee_name(t: Task) -> object:
+    if t.employee_id is None:
+        return UNASSIGNED
+    employee = t.employee
+    return employee.full_name() if employee is not None else t.employee_id
+
+
+# Сортировки TaskRepositoryMySql.query: (подпись, ключ, порядок строк в модели для merge).
+# Порядок названий в БД задаёт сопоставление (MySQL — utf8mb4_unicode_ci, SQLite — BINARY):
+# ключ в Python ему только приближён, RowTableModel.merge на это рассчитан.
+_SORTS: list[tuple[str, str, Callable[[Task], Any]]] = [
+    ("Срок ↑", "default", lambda t: (t.due_date, -t.id)),
+    ("Срок ↓", "due_desc", lambda t: (-t.due_date.toordinal(), t.id)),
+    ("Название", "title", lambda t: (t.title.lower(), t.id)),
+    ("Новые", "id", lambda t: -t.id),
+]
+
+# Значение фильтра «без исполнителя» в списке исполнителей
+_UNASSIGNED = -1
 
 
 class TaskTab(QWidget):
+    PAGE_SIZE = 500
+
     def __init__(
         self,
         task_service: TaskService,
@@ -30,17 +71,72 @@ class TaskTab(QWidget):
         self._tasks = task_service
         self._projects = project_service
         self._employees = employee_service
+        self._runner = QueryRunner(self)
+        self._next_key = None
+        self._prefetched: Page[Task] | None = None
+        self._as_of: datetime | None = None
+        self._delta_supported = True
+        # Фильтры и сортировка текущей выборки; меняются только вместе с полной перезагрузкой
+        self._filter = TaskFilter()
+        self._sort = "default"
+
+        self.model = RowTableModel(
+            [
+                key_column("id", "id"),
+                Column("Проект", _project_name),
+                Column("Исполнитель", _employee_name),
+                key_column("Задача", "title"),
+                key_column("Срок", "due_date"),
+                key_column("Статус", "status"),
+            ],
+            self,
+            key=lambda t: t.id,
+            sort_key=_SORTS[0][2],
+        )
+        self.table = make_table_view(self.model)
 
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels(["id", "Проект", "Исполнитель", "Задача", "Срок", "Статус"])
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        # ---- фильтры (выполняются запросом к БД) ----
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("Все статусы", ())
+        self.status_filter.addItem("Открытые", ("New", "InProgress"))
+        for st in TaskService.TASK_STATUSES:
+            self.status_filter.addItem(st, (st,))
+        self.project_filter = QComboBox()
+        self.project_filter.addItem("Все проекты", None)
+        self.employee_filter = QComboBox()
+        self.employee_filter.addItem("Все исполнители", None)
+        self.employee_filter.addItem(UNASSIGNED, _UNASSIGNED)
+        self.chk_due_from = QCheckBox("Срок с")
+        self.due_from = self._date_edit()
+        self.chk_due_to = QCheckBox("по")
+        self.due_to = self._date_edit()
+        self.sort_combo = QComboBox()
+        for title, key, _ in _SORTS:
+            self.sort_combo.addItem(title, key)
+
+        for combo in (self.status_filter, self.project_filter, self.employee_filter, self.sort_combo):
+            combo.currentIndexChanged.connect(self.apply_filter)
+        for chk, edit in ((self.chk_due_from, self.due_from), (self.chk_due_to, self.due_to)):
+            chk.toggled.connect(edit.setEnabled)
+            chk.toggled.connect(self.apply_filter)
+            edit.dateChanged.connect(self._on_date_changed)
+
+        filters = QHBoxLayout()
+        filters.addWidget(self.status_filter)
+        filters.addWidget(self.project_filter, 1)
+        filters.addWidget(self.employee_filter, 1)
+        filters.addWidget(self.chk_due_from)
+        filters.addWidget(self.due_from)
+        filters.addWidget(self.chk_due_to)
+        filters.addWidget(self.due_to)
+        filters.addWidget(QLabel("Сортировка:"))
+        filters.addWidget(self.sort_combo)
 
         self.btn_add = QPushButton("Добавить")
         self.btn_edit = QPushButton("Изменить")
         self.btn_delete = QPushButton("Удалить")
         self.btn_refresh = QPushButton("Обновить")
-        self.btn_export = QPushButton("Выгрузить в PDF")
+        self.btn_export = QPushButton("Выгрузить…")
 
         self.btn_add.clicked.connect(self.on_add)
         self.btn_edit.clicked.connect(self.on_edit)
@@ -58,37 +154,184 @@ class TaskTab(QWidget):
 
         layout = QVBoxLayout()
         layout.addLayout(buttons)
+        layout.addLayout(filters)
         layout.addWidget(self.table)
         self.setLayout(layout)
 
+    @staticmethod
+    def _date_edit() -> QDateEdit:
+        edit = QDateEdit()
+        edit.setCalendarPopup(True)
+        edit.setDisplayFormat("yyyy-MM-dd")
+        edit.setDate(QDate.currentDate())
+        edit.setEnabled(False)
+        return edit
+
+    def _on_date_changed(self) -> None:
+        if self.chk_due_from.isChecked() or self.chk_due_to.isChecked():
+            self.apply_filter()
+
+    def _current_filter(self) -> TaskFilter:
+        employee = self.employee_filter.currentData()
+        return TaskFilter(
+            statuses=tuple(self.status_filter.currentData() or ()),
+            project_id=self.project_filter.currentData(),
+            employee_id=None if employee == _UNASSIGNED else employee,
+            unassigned=employee == _UNASSIGNED,
+            due_from=self.due_from.date().toPyDate() if self.chk_due_from.isChecked() else None,
+            due_to=self.due_to.date().toPyDate() if self.chk_due_to.isChecked() else None,
+        )
+
+    def apply_filter(self) -> None:
+        """Новая выборка с сервера по фильтрам и сортировке панели."""
+        f, sort = self._current_filter(), str(self.sort_combo.currentData())
+        if f == self._filter and sort == self._sort:
+            return
+        self._filter, self._sort = f, sort
+        self.model.set_sort_key(next(fn for _, key, fn in _SORTS if key == sort))
+        self._as_of = None
+        self._next_key = None
+        self.refresh()
+
     def refresh(self) -> None:
+        # Задач может быть очень много: грузим постранично, следующие страницы
+        # модель запрашивает сама при прокрутке (fetchMore). Повторное обновление
+        # забирает только изменения с прошлой загрузки.
+        self._runner.cancel("next_page")
+        self._prefetched = None
+        self._refresh_sources()
+        if self._as_of is not None and self._delta_supported:
+            self._runner.submit(
+                "refresh",
+                self._load_changes,
+                self._as_of,
+                list(self.model.loaded_rows()),
+                on_result=self._on_changes,
+                on_error=self._on_load_failed,
+            )
+            return
+        self._runner.submit(
+            "refresh",
+            self._load_first_page,
+            self._filter,
+            self._sort,
+            on_result=self._on_first_page,
+            on_error=self._on_load_failed,
+        )
+
+    def _refresh_sources(self) -> None:
+        self._runner.submit(
+            "sources",
+            lambda: (self._projects.list_projects(), self._employees.list_employees()),
+            on_result=self._on_sources_loaded,
+            on_error=lambda e: None,  # фильтры останутся со старыми списками
+        )
+
+    def _on_sources_loaded(self, sources: tuple[list[Project], list[Employee]]) -> None:
+        projects, employees = sources
+        self._fill_combo(self.project_filter, [(p.name, p.id) for p in projects], keep=1)
+        self._fill_combo(self.employee_filter, [(e.full_name(), e.id) for e in employees], keep=2)
+
+    @staticmethod
+    def _fill_combo(combo: QComboBox, items: list[tuple[str, int]], keep: int) -> None:
+        # Первые `keep` пунктов («Все …») постоянные; выбор сохраняется, выборка не перезапрашивается
+        current = combo.currentData()
+        combo.blockSignals(True)
         try:
-            rows = self._tasks.list_tasks_view()
-        except AppError as e:
-            show_error(self, str(e))
-            rows = []
-
-        self.table.setRowCount(0)
-        for r in rows:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.table.setItem(row, 0, QTableWidgetItem(str(r.get("id", ""))))
-            self.table.setItem(row, 1, QTableWidgetItem(str(r.get("project_name", ""))))
-            self.table.setItem(row, 2, QTableWidgetItem(str(r.get("employee_name", ""))))
-            self.table.setItem(row, 3, QTableWidgetItem(str(r.get("title", ""))))
-            self.table.setItem(row, 4, QTableWidgetItem(str(r.get("due_date", ""))))
-            self.table.setItem(row, 5, QTableWidgetItem(str(r.get("status", ""))))
+            while combo.count() > keep:
+                combo.removeItem(keep)
+            for text, data in items:
+                combo.addItem(text, data)
+            combo.setCurrentIndex(max(combo.findData(current), 0))
+        finally:
+            combo.blockSignals(False)
 
-        self.table.resizeColumnsToContents()
+    def _load_page(self, filters: TaskFilter, sort: str, after_key: PageKey | None) -> Page[Task]:
+        # Проекты и исполнители страницы — по одному запросу на тип, до отрисовки
+        page = self._tasks.query_tasks(filters, sort, after_key, self.PAGE_SIZE)
+        self._tasks.load_relations(page.items)
+        return page
 
-    def _selected_id(self) -> int | None:
-        items = self.table.selectedItems()
-        if not items:
-            return None
+    def _load_first_page(self, filters: TaskFilter, sort: str) -> tuple[datetime, Page[Task]]:
+        as_of = self._tasks.server_now()
+        return as_of, self._load_page(filters, sort, None)
+
+    def _load_changes(self, since: datetime, tasks: list[Task]) -> tuple[ChangeSet[Task], bool] | None:
         try:
-            return int(items[0].text())
-        except ValueError:
+            changes = self._tasks.list_tasks_changed_since(since)
+        except DatabaseError as e:
+            if not is_missing_schema(e):
+                raise  # сбой запроса — в _on_load_failed, дельты не отключаются
             return None
+        # Проекты/сотрудники, устаревшие по TTL, перечитываются — тогда перерисовываем таблицу
+        reloaded = self._tasks.load_relations([*tasks, *changes.changed])
+        return changes, reloaded > 0
+
+    def _on_load_failed(self, e: Exception) -> None:
+        show_error(self, str(e))
+        self._next_key = None
+        self._as_of = None
+        self.model.set_rows([])
+
+    def _on_changes(self, result: tuple[ChangeSet[Task], bool] | None) -> None:
+        if result is None:
+            self._delta_supported = False
+            self.refresh()
+            return
+        changes, relations_reloaded = result
+        self._as_of = changes.as_of
+        # Задачи, которые после изменения не проходят фильтр, убираются из таблицы
+        matched = [t for t in changes.changed if self._filter.matches(t)]
+        left = [t.id for t in changes.changed if not self._filter.matches(t)]
+        self.model.merge(matched, [*changes.deleted_ids, *left])
+        if relations_reloaded:
+            self.model.refresh_display()
+        self._prefetch()
+
+    def _on_first_page(self, result: tuple[datetime, Page[Task]]) -> None:
+        self._as_of, page = result
+        self._next_key = page.next_key
+        self.model.set_rows(page.items, self._fetch_more if page.has_more else None)
+        self.table.resizeColumnsToContents()
+        self._prefetch()
+
+    def _prefetch(self) -> None:
+        if self._next_key is None:
+            return
+        self._runner.submit(
+            "next_page",
+            self._load_page,
+            self._filter,
+            self._sort,
+            self._next_key,
+            on_result=self._on_prefetched,
+            # Ошибку покажет синхронная догрузка в _fetch_more
+            on_error=lambda e: None,
+        )
+
+    def _on_prefetched(self, page: Page[Task]) -> None:
+        self._prefetched = page
+
+    def _fetch_more(self) -> list[Task]:
+        # Обычно следующая страница уже загружена в фоне; если нет — догружаем сразу.
+        page = self._prefetched
+        self._prefetched = None
+        if page is None:
+            if self._next_key is None:
+                return []
+            self._runner.cancel("next_page")
+            try:
+                page = self._load_page(self._filter, self._sort, self._next_key)
+            except AppError as e:
+                show_error(self, str(e))
+                return []
+        self._next_key = page.next_key
+        self._prefetch()
+        return page.items
+
+    def _selected_id(self) -> int | None:
+        row = selected_row(self.table)
+        return None if row is None else int(row.id)
 
     def on_add(self) -> None:
         try:
@@ -113,6 +356,13 @@ class TaskTab(QWidget):
             task = self._tasks.get_task(tid)
             projects = self._projects.list_projects()
             employees = self._employees.list_employees()
+            if task is not None:
+                # Списки из кэша могут не знать о проекте/исполнителе, созданных недавно кем-то
+                # другим: дочитываем только их, иначе диалог молча выбрал бы первый пункт
+                if task.project_id not in {p.id for p in projects}:
+                    projects = [*projects, *self._projects.get_projects([task.project_id])]
+                if task.employee_id is not None and task.employee_id not in {e.id for e in employees}:
+                    employees = [*employees, *self._employees.get_employees([task.employee_id])]
         except AppError as e:
             show_error(self, str(e))
             return
@@ -138,6 +388,8 @@ class TaskTab(QWidget):
         self.refresh()
 
     def on_export(self) -> None:
-        export_table_to_pdf(self, self.table, "Задачи")
+        # Выгружается вся выборка по текущим фильтрам, а не только загруженные страницы
+        f, sort = self._filter, self._sort
+        export_table(self, self.model, "Задачи", lambda: self._tasks.iter_tasks(f, sort))
 
 